@@ -1,5 +1,10 @@
 import numpy as np
-import matplotlib.pyplot as plt
+
+from me273.convergence import converge
+from me273.events import EventMonitor
+from me273.instrumentation import count, counted
+from me273.plotting import kinematics_plots
+from me273.recording import Recorder
 
 ''' Assignment questions:
 
@@ -127,50 +132,140 @@ def position_exact(t, x0, area, mass, rho=1.225, g=9.80665, D=0.5):
   
   return x0 - ((2 * mass) / (D * rho * area)) * np.log(np.cosh(np.sqrt((D * rho * area * g) / (2 * mass)) * t))
 
-def euler_projectile(mass, area, x0=0, xf=0, v0=0, dt=0.01, **kwargs):
+def euler_projectile(mass, area, x0=0, xf=0, v0=0, dt=0.01, events=None, recorder=None, **kwargs):
     ''' Returns time, position, velocity and acceleration of a body in free-fall with drag.
 
     Uses a Euler approximation with a time-detla, dt, to numerically approximate the motion
     of a body in free-fall under the influence of gravity and drag.
 
+    The loop stops on the first step below xf, which overshoots the ground by up to
+    one step. Pass a terminal event (see me273.events) to end the run exactly where
+    the event function crosses zero instead, e.g. the impact at x = xf:
+
+        >>> ground = Event(lambda t, x, v: x - xf, direction=-1, terminal=True)
+        >>> t, x, v, a = euler_projectile(mass, area, x0=440, dt=0.1, events=[ground])
+
+    Steps are written into preallocated arrays by a Recorder (see me273.recording),
+    which can also thin out or stream the trajectory for very small dt:
+
+        >>> t, x, v, a = euler_projectile(mass, area, x0=440, dt=1e-6, recorder=Recorder(record_every=1000))
+
     Args:
-        mass (float):   the mass of the object in kg
-        area (float):   the cross-sectional area of the object in m**2
-        x0 (float):     the intial position of the object in m
-        v0 (float):     the initial velocity of the object in m/s
-        dt (float):     the time-step for the simulation in s
-        **kwargs:       keyword arguments for modifying accelertaion function.
+        mass (float):       the mass of the object in kg
+        area (float):       the cross-sectional area of the object in m**2
+        x0 (float):         the intial position of the object in m
+        v0 (float):         the initial velocity of the object in m/s
+        dt (float):         the time-step for the simulation in s
+        events (list):      Event objects or functions g(t, x, v) to locate
+        recorder (Recorder): records each step (default keeps every step)
+        **kwargs:           keyword arguments for modifying accelertaion function.
 
     Returns:
-        list (float): time stamps
-        list (float): positions
-        list (float): velocities
-        list (float): accelerations
+        np.array (float): time stamps
+        np.array (float): positions
+        np.array (float): velocities
+        np.array (float): accelerations
 
     '''
 
+    if recorder is None:
+        recorder = Recorder()
+
+    evaluate = counted(acceleration, 'acceleration')
+
     t = 0
     x = x0
     v = v0
-    a = acceleration(v0, area=area, mass=mass, **kwargs)
+    a = evaluate(v0, area=area, mass=mass, **kwargs)
 
-    t_num = [t]
-    x_num = [x]
-    v_num = [v]
-    a_num = [a]
+    recorder.record(t, x, v, a)
+    start = recorder.count
+
+    if events:
+        monitor = EventMonitor(events, t, x, v)
 
     while x >= xf:
+        t_old, x_old, v_old, a_old = t, x, v, a
+
         t += dt
         x += dt * v
         v += dt * a
-        a = acceleration(v, area=area, mass=mass, **kwargs)
+        a = evaluate(v, area=area, mass=mass, **kwargs)
+
+        if events:
+            terminal = monitor.step(t_old, x_old, v_old, a_old, t, x, v, a)
+
+            if terminal:
+                t, x, v = (float(value) for value in terminal)
+                a = evaluate(v, area=area, mass=mass, **kwargs)
+
+        recorder.record(t, x, v, a)
+
+        if events and terminal:
+            break
+
+    count('steps', recorder.count - start)
+
+    return recorder.arrays()
+
+def sufficient_dt(mass, area, x0=0, dt=1.0, times=None, rtol=1e-3, atol=1e-6, **kwargs):
+    ''' Returns the largest dt that meets a tolerance, and the run made with it.
+
+    Answers exercises 2 and 3 without the exact solution: euler_projectile is
+    run at dt, dt/2, dt/4, ... and the error in position and velocity at the
+    given times is estimated by Richardson extrapolation (see
+    me273.convergence) until it meets the tolerance.
+
+        >>> dt, (t, x, v, a), stats = sufficient_dt(mass, area, x0=440, rtol=1e-4)
+
+    Args:
+        mass (float):       the mass of the object in kg
+        area (float):       the cross-sectional area of the object in m**2
+        x0 (float):         the intial position of the object in m
+        dt (float):         the largest time-step to try in s
+        times (list):       times to compare runs at in s (default every whole
+                                second of the fall, or, for a fall too short
+                                to have one, the landing time and speed);
+                                for dt halved from 1 s these fall exactly on
+                                time steps
+        rtol (float):       relative tolerance
+        atol (float):       absolute tolerance
+        **kwargs:           keyword arguments for euler_projectile.
+
+    Returns:
+        float:              the selected time-step in s
+        tuple:              time, position, velocity and acceleration arrays
+        dict:               statistics of the convergence study
+    '''
+
+    # The run at the first dt, if made already to find the times.
+    first = {}
+
+    if times is None:
+        first[dt] = euler_projectile(mass, area, x0=x0, dt=dt, **kwargs)
+        t = first[dt][0]
+        times = np.arange(1, np.ceil(t[-1] - dt))
+
+    def run(dt):
+        if dt in first:
+            return first.pop(dt)
+
+        return euler_projectile(mass, area, x0=x0, dt=dt, **kwargs)
 
-        t_num.append(t)
-        x_num.append(x)
-        v_num.append(v)
-        a_num.append(a)
+    def sample(result):
+        t, x, v, a = result
 
-    return t_num, x_num, v_num, a_num
+        if len(times):
+            return np.concatenate([np.interp(times, t, x), np.interp(times, t, v)])
+
+        # A fall too short to have a whole second to compare at is compared
+        # by the time and speed it lands at, interpolated in its last step.
+        xf = kwargs.get('xf', 0)
+        return [np.interp(xf, x[-1:-3:-1], t[-1:-3:-1]), np.interp(xf, x[-1:-3:-1], v[-1:-3:-1])]
+
+    dt, _, stats = converge(run, dt, quantity=sample, rtol=rtol, atol=atol)
+
+    return dt, stats['result'], stats
 
 def exact_projectile(times, mass, area, x0=0, **kwargs):
     ''' Returns time, position, velocity and acceleration of a body in free-fall with drag for a given list of times.
@@ -249,54 +344,6 @@ def relative_error(approx, exact):
     '''
     return [abs(a - e) / e if e != 0 else 0 for a, e in zip(approx, exact)]
 
-def kinematics_plots(t, x, v, a, xe=None, ve=None, ae=None, title=None):
-    ''' Graph set of plots for kinematics lists.
-
-    Args:
-        t (list):   list of times
-        x (list):   list of positions (m)
-        v (list):   list of velocities (m/s)
-        a (list):   list of accelerations (m/s**2)
-
-        Optional:
-
-        xe (list):  list of exact solution positions (m)
-        ve (list):  list of exact solution velocities (m/s)
-        ve (list):  list of exact solution accelerations (m/s**2)
-
-    Returns:
-        Nothing
-    '''
-
-    f, (ax, av, aa) = plt.subplots(3, sharex=True)
-
-    if title: ax.set_title(title)
-  
-    ax.plot(t, x, color='black', linestyle='-')
-    av.plot(t, v, color='black', linestyle='-')
-    aa.plot(t, a, color='black', linestyle='-')
-
-    if xe is not None: ax.plot(t, xe, color='black', linestyle='--') 
-    if ve is not None: av.plot(t, ve, color='black', linestyle='--') 
-    if ae is not None: aa.plot(t, ae, color='black', linestyle='--') 
-
-    ax.grid(which='both', linestyle=':')
-    av.grid(which='both', linestyle=':')
-    aa.grid(which='both', linestyle=':')    
-
-    ax.tick_params(which='both', direction='in')
-    av.tick_params(which='both', direction='in')
-    aa.tick_params(which='both', direction='in')
-  
-    ax.set_ylabel('Position ($m$)')
-    av.set_ylabel('Velocity ($m/s$)')
-    aa.set_ylabel('Acceleration ($m/s^2$)')
-  
-    aa.set_xlabel('Time ($s$)')
-  
-    plt.show()
-
-
 if __name__ == '__main__':
 
     ''' Exercise 1: Compatational Model of a Falling Sphere w/Air Resistance
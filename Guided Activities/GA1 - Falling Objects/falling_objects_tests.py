@@ -1,12 +1,20 @@
 import numpy as np
 import pytest
 
-from implementation import (acceleration, velocity_exact, position_exact, 
-	euler_projectile, exact_projectile, absolute_error, relative_error)
+from falling_objects import (acceleration, velocity_exact, position_exact,
+	euler_projectile, exact_projectile, sufficient_dt, absolute_error, relative_error)
+from me273.adaptive_method import error_norm
+from me273.events import Event
+from me273.recording import Recorder
 
 ''' This is my first attempt into unit testing. I was hoping to get some coverage of my
 	euler projectile simulator; however, I did not have time to build multiple tests.
-''''
+'''
+
+# A 16 lb bowling ball, dropped from the Willis tower.
+mass = 7.26
+area = np.pi * 0.1085**2
+height = 440
 
 
 def test_acceleration():
@@ -18,5 +26,55 @@ def test_acceleration():
 	radius = 0.12
 	area = radius * np.pi**2
 
-	assert acceleration(vel=-1.174, D=D, rho=rho, mass=mass, g=g, area=area) == pytest.approx(9.767, 0.01)
+	# Falling (x up), so drag of 0.842 m/s**2 takes off some of the 9.8 m/s**2 of gravity.
+	assert acceleration(vel=-1.174, D=D, rho=rho, mass=mass, g=g, area=area) == pytest.approx(-8.958, 0.01)
+
+
+def test_sufficient_dt_meets_tolerance():
+	rtol = 1e-3
+
+	dt, (t, x, v, a), stats = sufficient_dt(mass, area, x0=height, rtol=rtol)
+
+	# Compared with the exact solution at the whole seconds of the fall, as
+	# sufficient_dt compares runs; the error estimate is good to a factor of 2.
+	times = np.arange(1, np.ceil(t[-1] - dt))
+	_, x_exact, v_exact, _ = exact_projectile(times, mass, area, x0=height)
+
+	approx = np.concatenate([np.interp(times, t, x), np.interp(times, t, v)])
+	exact = np.concatenate([x_exact, v_exact])
+
+	assert error_norm(approx - exact, approx, exact, 2 * rtol, 1e-6) <= 1
+
+	# A coarser dt would not have done.
+	coarse = euler_projectile(mass, area, x0=height, dt=2 * dt)
+	approx = np.concatenate([np.interp(times, coarse[0], coarse[1]), np.interp(times, coarse[0], coarse[2])])
+
+	assert error_norm(approx - exact, approx, exact, rtol, 1e-6) > 1
+
+
+def test_impact_event_lands_on_ground():
+	ground = Event(lambda t, x, v: x, direction=-1, terminal=True)
+
+	t, x, v, a = euler_projectile(mass, area, x0=height, dt=0.1, events=[ground])
+	t_plain, x_plain, v_plain, a_plain = euler_projectile(mass, area, x0=height, dt=0.1)
+
+	assert x[-1] == pytest.approx(0, abs=1e-9)
+	assert x[-2] > 0
+
+	# Same steps up to the impact, which ends the step the plain run overshoots in.
+	assert np.array_equal(x[:-1], x_plain[:-1])
+	assert t_plain[-2] < t[-1] < t_plain[-1]
+
+
+def test_recorder_matches_plain_return():
+	expected = euler_projectile(mass, area, x0=height, dt=0.1)
+	result = euler_projectile(mass, area, x0=height, dt=0.1, recorder=Recorder())
+
+	for values, arrays in zip(expected, result):
+		assert np.array_equal(arrays, values)
+
+	t, x, v, a = euler_projectile(mass, area, x0=height, dt=0.1, recorder=Recorder(record_every=10))
+	keep = list(range(0, expected[0].size, 10)) + [expected[0].size - 1]
 
+	assert np.array_equal(t, expected[0][keep])
+	assert np.array_equal(x, expected[1][keep])
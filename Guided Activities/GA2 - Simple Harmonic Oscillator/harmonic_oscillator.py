@@ -0,0 +1,305 @@
+import numpy as np
+
+from me273.instrumentation import count, counted
+from me273.linear_method import LinearOscillator
+from me273.recording import Recorder, step_count
+
+def acceleration(x, v, k, m):
+    ''' Returns acceleration of a simple harmonic oscillator based on position
+
+        Uses the equation:
+
+                a(t) = - (k/m) x**2
+
+        Args:
+            x (float):  displacement, downwards positive (m)
+            v (float):  velocity, ignored (m)
+            k (float):  spring constant (N/m)
+            m (float):  mass (kg)
+
+        Returns:
+            float:  acceleration, downwards positive (m/s**2)
+    '''
+
+    return -1 * (k/m) * x
+
+def oscillator_period(m, k):
+    ''' Return the period, T, of a simple harmonic oscillator.
+
+    Uses:
+
+        T = 2 * pi * sqrt(m / k)
+
+    Args:
+        m (float):  mass (kg)
+        k (float):  spring constant (N/m)
+
+    Returns:
+        float:  period (s)
+    '''
+
+    return 2 * np.pi * np.sqrt(m / k)
+
+def oscillator_angular_frequency(m, k):
+    ''' Return the period, T, of a simple harmonic oscillator.
+
+    Uses:
+
+        w = 2*pi / T
+
+    Args:
+        m (float):  mass (kg)
+        k (float):  spring constant (N/m)
+
+    Returns:
+        float:  angular frequency (rad/s)
+    '''
+
+    return 2 * np.pi / oscillator_period(m, k)
+
+def oscillator_energy(x, v, k, m, g=9.80665):
+    ''' Return the energy (J) in an oscillator at any instant of time.
+
+        Uses equation:
+
+            E = 0.5*mv**2 + 0.5*k * x**2 - mgx
+
+        Assuming the oscillators equilibrium position is 0 m.
+
+        Args:
+            x (float):   displacement (m)
+            v (float):   velocity (m/s)
+            k (float):   spring constant (N/m)
+            m (float):   mass (kg)
+
+        Returns:
+            float:    energy of system (J)
+
+    '''
+
+    y_eq = m * g / k
+
+    return 0.5 * m * np.power(v, 2) + 0.5 * k * np.power(x + y_eq, 2) - m * g * (x + y_eq)
+
+def euler_method(acceleration, t0, tf, dt, x0=0, v0=0, modified=False, verbose=False,
+                 recorder=None, **kwargs):
+    ''' Returns t, x, v, and a arrays for Modified Euler Method
+
+        Since tf is known, the number of steps is computed up front and the
+        trajectory is written into arrays sized to fit by a Recorder (see
+        me273.recording). Pass a Recorder to keep every k-th step, only the
+        final state, or to stream each step to a callback.
+
+        Args:
+            acceleration (func):  a function that accepts x, v, and **kwargs and
+                                      return acceleration.
+            t0 (float):           initial time (s)
+            tf (float):           final time (s)
+            dt (float):           time step (s)
+            x0 (float):           initial displacement, downwards positive (m)
+            v0 (float):           intiial velocity, downwards positive (m/s)
+            **kwargs:             any additional arguments required for the
+                                      accleration function
+
+            modified (bool):      turns on modified euler method.
+            verbose (bool):       turns on printing of each time-step.
+            recorder (Recorder):  records each step (default keeps every step)
+
+        Returns:
+            float (np.array): times (s)
+            float (np.array): positions, downwards positive (m)
+            float (np.array): velocities, downwards positive (m/s)
+            float (np.array): acceleration, downwards positive (m/s**2)
+    '''
+
+    # One extra state for the initial conditions, and one for the extra step
+    # that rounding in t += dt can add.
+    if recorder is None:
+        recorder = Recorder(steps=step_count(t0, tf, dt) + 2)
+
+    acceleration = counted(acceleration, 'acceleration')
+
+    t = t0
+    x = x0
+    v = v0
+    a = acceleration(x, v, **kwargs)
+
+    recorder.record(t, x, v, a)
+    start = recorder.count
+
+    while t < tf:
+        if verbose: print('{:.3f} {:.3f} {:.3f} {:.3f}'.format(t, x, v, a))
+
+        a = acceleration(x, v, **kwargs)
+        t += dt
+
+        if modified:
+            v += dt * a
+            x += dt * v
+        else:
+            x += dt * v
+            v += dt * a
+
+        recorder.record(t, x, v, a)
+
+    count('steps', recorder.count - start)
+
+    return recorder.arrays()
+
+def linear_method(t0, tf, dt, k, m, x0=0, v0=0, c=0.0, recorder=None):
+    ''' Returns t, x, v, and a arrays stepped with the exact propagator.
+
+        The oscillator is linear, so each step is one multiplication by the
+        state-transition matrix expm(A dt) (see me273.linear_method). There
+        is no truncation error, so dt only sets the output spacing.
+
+        Args:
+            t0 (float):           initial time (s)
+            tf (float):           final time (s)
+            dt (float):           time step (s)
+            k (float):            spring constant (N/m)
+            m (float):            mass (kg)
+            x0 (float):           initial displacement, downwards positive (m)
+            v0 (float):           intiial velocity, downwards positive (m/s)
+            c (float):            damping coefficient (N*s/m)
+            recorder (Recorder):  records each step (default keeps every step)
+
+        Returns:
+            float (np.array): times (s)
+            float (np.array): positions, downwards positive (m)
+            float (np.array): velocities, downwards positive (m/s)
+            float (np.array): acceleration, downwards positive (m/s**2)
+    '''
+
+    oscillator = LinearOscillator(k=k, m=m, c=c)
+
+    return oscillator.run(t0, tf, dt, x0=x0, v0=v0, recorder=recorder)
+
+def exact_position(t, x0, k, m):
+    ''' Returns position as determined by analytical SHO position.
+
+        Uses:
+
+            x(t) = x_0 * cos(sqrt(k/m)*t)
+
+        Args:
+            t (float):   time (s)
+            x0 (float):  initial displacement, downwards positive (m)
+            k (float):   spring constant (N/m)
+            m (float):   mass (kg)
+
+        Returns:
+            float: displacement (m)
+    '''
+
+    return x0 * np.cos(np.sqrt(k / m) * t)
+
+def exact_velocity(t, x0, k, m):
+    ''' Returns velocity as determined by analytical SHO position.
+
+        Uses:
+
+            x(t) = -x_0 * sqrt(k/m) * sin(sqrt(k/m)*t)
+
+        Args:
+            t (float):   time (s)
+            x0 (float):  initial displacement, downwards positive (m)
+            k (float):   spring constant (N/m)
+            m (float):   mass (kg)
+
+        Returns:
+            float: displacement (m)
+    '''
+
+    return -1 * x0 * np.sqrt(k / m) * np.sin(np.sqrt(k / m) * t)
+
+def exact_oscillator(times, x0, k, m):
+    ''' Returns t, x, v, and a lists based on analytical solution to SHO.
+
+        Args:
+            times (list):  list of times to calculate x, v, and a (s)
+            x0 (float):    initial displacement, downwards positive (m)
+            k (float):     spring constant (N/m)
+            m (float):     mass (kg)
+
+        Returns:
+            float (list): lisf times (s)
+            float (list): list of positions, downwards positive (m)
+            float (list): list of velocities, downwards positive (m/s)
+            float (list): list of acceleration, downwards positive (m/s**2)
+    '''
+
+    t_ext = np.asarray(times)
+    x_ext = exact_position(t_ext, x0=x0, k=k, m=m)
+    v_ext = exact_velocity(t_ext, x0=x0, k=k, m=m)
+    a_ext = acceleration(x_ext, v_ext, k=k, m=m)
+
+    return t_ext, x_ext, v_ext, a_ext
+
+def dominant_frequency(t, x):
+    ''' Return dominant frequency of signal in Hz.
+
+        Performs a FFT and returns the frequency of the strongest frequency
+        in the sample.
+
+        Args:
+            t (list):  times (s)
+            x (list):  response (unitless)
+
+        Returns:
+            float:  strongest frequency (Hz)
+
+    '''
+    # Find the sample rate
+    dt = t[1] - t[0]
+
+    # Perform FFT
+    amplitudes  = np.fft.fft(x)
+    frequencies = np.fft.fftfreq(len(x)) / dt
+
+    # Return the frequency with maximum amplitude.
+    return np.abs(frequencies[amplitudes.argmax()])
+
+def list_roots(ts, xs):
+    ''' Returns times, t, for which x crosses zero.
+
+        Naive implmentation that simply notes the time when,
+        x has changed sign and interpolates root linearly
+        beteween two closest points.
+
+        Args:
+            ts (list): 1-D array containing times (s)
+            xs (list): 1-D array containing positions (m)
+
+        Returns:
+            list (float): list of times where x crosses zero.
+    '''
+
+    roots = []
+    for i, _ in enumerate(ts):
+        try:
+            if np.sign(xs[i]) != np.sign(xs[i + 1]):
+                m, b = np.polyfit([ts[i], ts[i + 1]],
+                                  [xs[1], xs[i + 1]],
+                                   1)
+
+                roots.append(-b / m)
+
+        except IndexError:
+            pass
+
+    return roots
+
+def list_periods(ts, xs):
+    ''' Returns the period of a sin wave by counting zero crossings.
+
+        Args:
+            ts (list): 1-D array containing times (s)
+            xs (list): 1-D array containing positions (m)
+
+        Returns:
+            list (float): list of periods, T, for inputed sign wave.
+    '''
+
+    roots = np.asarray(list_roots(ts, xs))
+    return roots[2:] - roots[0:-2]
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from harmonic_oscillator import acceleration, euler_method, exact_position, linear_method
+
+
+def list_euler_method(acceleration, t0, tf, dt, x0=0, v0=0, modified=False, **kwargs):
+    # The list-based euler_method of the GA2 report, before it used a Recorder.
+    t = t0
+    x = x0
+    v = v0
+    a = acceleration(x, v, **kwargs)
+
+    t_num, x_num, v_num, a_num = [t], [x], [v], [a]
+
+    while t < tf:
+        a = acceleration(x, v, **kwargs)
+        t += dt
+
+        if modified:
+            v += dt * a
+            x += dt * v
+        else:
+            x += dt * v
+            v += dt * a
+
+        t_num.append(t)
+        x_num.append(x)
+        v_num.append(v)
+        a_num.append(a)
+
+    return t_num, x_num, v_num, a_num
+
+
+@pytest.mark.parametrize('modified', [False, True])
+@pytest.mark.parametrize('dt', [0.5, 0.1, 0.01])
+def test_euler_matches_list_version(modified, dt):
+    expected = list_euler_method(acceleration, 0, 15, dt, x0=0.1, modified=modified, k=2.5, m=0.250)
+    result = euler_method(acceleration, 0, 15, dt, x0=0.1, modified=modified, k=2.5, m=0.250)
+
+    for values, arrays in zip(expected, result):
+        assert np.array_equal(arrays, values)
+
+
+def test_linear_matches_exact_solution():
+    t, x, v, a = linear_method(0, 15, 0.5, k=2.5, m=0.250, x0=0.1)
+
+    assert t == pytest.approx(np.arange(t.size) * 0.5)
+    assert x == pytest.approx(exact_position(t, 0.1, 2.5, 0.250), abs=1e-12)
+    assert a == pytest.approx(acceleration(x, v, k=2.5, m=0.250), abs=1e-12)
+
+
+def test_linear_matches_damped_solution():
+    k, m, c, x0, v0 = 2.5, 0.250, 0.3, 0.1, -0.2
+
+    t, x, v, a = linear_method(0, 15, 0.25, k=k, m=m, x0=x0, v0=v0, c=c)
+
+    # Underdamped: x = exp(-z w t) (x0 cos(wd t) + B sin(wd t))
+    w = np.sqrt(k / m)
+    z = c / (2 * np.sqrt(k * m))
+    wd = w * np.sqrt(1 - z**2)
+    B = (v0 + z * w * x0) / wd
+
+    decay = np.exp(-z * w * t)
+    x_exact = decay * (x0 * np.cos(wd * t) + B * np.sin(wd * t))
+    v_exact = decay * (v0 * np.cos(wd * t) - (z * w * B + wd * x0) * np.sin(wd * t))
+
+    assert z < 1
+    assert x == pytest.approx(x_exact, abs=1e-12)
+    assert v == pytest.approx(v_exact, abs=1e-12)
+    assert a == pytest.approx(-(k * x + c * v) / m, abs=1e-12)
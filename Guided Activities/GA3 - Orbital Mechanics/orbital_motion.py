@@ -0,0 +1,201 @@
+import numpy as np
+
+from me273.instrumentation import count, counted
+from me273.recording import Recorder, step_count
+from me273.symplectic_method import get_step
+
+def dist(x):
+    ''' Return the distance of point x from the origin <0, 0, .., 0>.
+
+        Uses the linear algebra concept of a norm to calculate
+        Euclidean distance.
+
+        Examples:
+            Given two vectors A = <0,3,8> and B = <0,3,9>
+                >>> A = np.asarray([0,3,8])
+                >>> B = np.asarray([0,3,9])
+
+            Find the length of A.
+                >>> dist(A)
+
+            Find the distance between A and B.
+                >>> dist(A - B)
+
+            Given a list of vectors C = [<1,1,1>, <2,3,5>, <8,3,7>].
+                >>> C = np.asarray([[1,1,1], [2,3,5], [8,3,7]])
+
+            Find the distances from the origin, O.
+                >>> dist(C)
+
+            Find the distances from point B.
+                >>> dist(C - B)
+
+        Args:
+            x (np.array):   point or list of points.
+
+        Returns:
+            np.array: scalar distance or list of scalar distances.
+    '''
+
+    return np.linalg.norm(x, axis=(x.ndim - 1))
+
+def gravitational_acceleration(x, v, m, M=5.972e24, G=6.67408e-11):
+    ''' Return x and y components of acceleration due to gravitity.
+
+        Uses:
+                    G * m * M / r**2
+
+        Args:
+            G (float):   gravitational constant (m**3/(kg * s**2)))
+            M (float):   mass of larger object (kg; default is Earth)
+            m (float):   mass of smaller object (kg)
+            x (float):   x distance from larger object (m)
+            y (float):   y distance from larger object (m)
+
+        Return:
+            [float, float]: direction vector
+    '''
+
+    r = dist(x)
+    a = -(x * G * M) / (np.power(r, 3))
+
+    return a
+
+def orbital_energy(x, v, m, y=[0,0], M=5.972e24, G=6.67408e-11):
+    ''' Return energy of orbital body in joules.
+
+        Uses:
+
+                E = Ug + Uk
+
+                where,
+
+                    Ug = -GmM / r
+
+                    Uk = 0.5 mv^2
+
+        Args:
+            x (float):   x distance from larger object (m)
+            v (float):   velcoity of orbiting body (m/s)
+            G (float):   gravitational constant (m**3/(kg * s**2)))
+            M (float):   mass of larger object (kg; default is Earth)
+            m (float):   mass of smaller object (kg)
+            y (float):   location of larger object (m; default is (0,0))
+
+        Return:
+            (float): energy of orbit in joules.
+    '''
+
+    r = dist(x - y)
+    v_avg = dist(v)
+
+    return (0.5* m * v_avg * v_avg) - (G * m * M / r)
+
+def euler_method(acceleration, t0, tf, dt, x0=0, v0=0, modified=False, method=None, recorder=None, **kwargs):
+    ''' Returns t, x, v, and a arrays for Euler Method
+
+        Other steppers can be chosen by name with method (see
+        me273.symplectic_method). The Euler methods gain or lose orbital
+        energy every step; 'verlet', 'leapfrog' and 'yoshida4' keep it
+        bounded over any number of orbits.
+
+        Args:
+            acceleration (func):  a function that accepts x, v, and **kwargs and
+                                      return acceleration.
+            t0 (float):           initial time (s)
+            tf (float):           final time (s)
+            dt (float):           time step (s)
+            x0 (np.array):        initial displacement, downwards positive (m)
+            v0 (np.array):        intiial velocity, downwards positive (m/s)
+            **kwargs:             any additional arguments required for the
+                                      accleration function
+
+            modified (bool):	turns on modified euler method.
+            method (str):       'euler', 'modified', 'verlet', 'leapfrog' or
+                                    'yoshida4' (overrides modified)
+            recorder (Recorder):    records each step (default keeps every
+                                        step in memory; a TrajectoryWriter
+                                        streams long orbits to disk)
+
+        Returns:
+            np.float64 (np.array): lisf times (s)
+            np.float64 (np.array): list of positions, downwards positive (m)
+            np.float64 (np.array): list of velocities, downwards positive (m/s)
+            np.float64 (np.array): list of acceleration, downwards positive (m/s**2)
+    '''
+
+    if method is None:
+        method = 'modified' if modified else 'euler'
+
+    step = get_step(method)
+    acceleration = counted(acceleration, 'acceleration')
+
+    # The times of np.arange(t0, tf, dt), one state each.
+    points = step_count(t0, tf, dt)
+
+    if recorder is None:
+        recorder = Recorder(steps=points)
+
+    x, v = x0, v0
+    a = acceleration(x0, v0, **kwargs)
+    recorder.record(t0, x, v, a)
+
+    for i in range(1, points):
+        x, v, a = step(acceleration, x, v, a, dt, **kwargs)
+        recorder.record(t0 + i * dt, x, v, a)
+
+    count('steps', points - 1)
+
+    return recorder.arrays()
+
+def periapsis(xs, y=0):
+    ''' Returns nearest point of object (xs) to center (y).
+
+        Args:
+            xs (np.array):    list of positions (n-dimensions)
+             y (np.array):    single position (n-dimensions)
+
+        Returns:
+            np.array:  n-dimensional np.float64
+    '''
+
+    return dist(xs - y).min()
+
+def apoapsis(xs, y=0):
+    ''' Returns furthest point of object (xs) from center (y).
+
+        Args:
+            xs (np.array):    list of positions (n-dimensions)
+             y (np.array):    single position (n-dimensions)
+
+        Returns:
+            np.array:  n-dimensional np.float64
+    '''
+
+    return dist(xs - y).max()
+
+def orbital_period(t, x):
+    ''' Return period of signal, specifically an orbital period.
+
+        Performs a FFT and returns the frequency of the strongest frequency
+        in the sample.
+
+        NOTE: Due to the nature of an FFT, more orbits lead to more resolution.
+
+        Args:
+            t (list):  times (s)
+            x (list):  response (unitless)
+
+        Returns:
+            float:  strongest frequency (Hz)
+
+    '''
+    # Find the sample rate
+    dt = t[1] - t[0]
+
+    # Perform FFT
+    amplitudes  = np.fft.fft(x)
+    frequencies = np.fft.fftfreq(len(x)) / dt
+
+    # Return the period with maximum amplitude.
+    return 1 / np.abs(frequencies[amplitudes.argmax()])
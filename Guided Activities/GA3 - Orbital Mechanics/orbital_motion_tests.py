@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from me273.recording import Recorder
+from orbital_motion import euler_method, gravitational_acceleration, orbital_energy, orbital_period
+
+DAY = 86400
+
+# The Moon at perigee, about a fixed Earth.
+x0 = np.asarray([0.3633e9, 0.0])
+v0 = np.asarray([0.0, 1.082e3])
+m = 7.342e22
+
+
+def notebook_euler_method(acceleration, t0, tf, dt, x0=0, v0=0, modified=False, **kwargs):
+    # The euler_method of the GA3 notebook, before it used a Recorder.
+    t = np.arange(start=t0, stop=tf, step=dt, dtype=np.float64)
+
+    points = t.size
+    dimensions, = x0.shape
+
+    x = np.empty([points, dimensions])
+    v = np.empty([points, dimensions])
+    a = np.empty([points, dimensions])
+
+    x[0] = x0
+    v[0] = v0
+    a[0] = acceleration(x0, v0, **kwargs)
+
+    for i in range(1, points):
+        a[i] = acceleration(x[i-1], v[i-1], **kwargs)
+
+        if modified:
+            v[i] = v[i-1] + dt * a[i]
+            x[i] = x[i-1] + dt * v[i]
+        else:
+            x[i] = x[i-1] + dt * v[i-1]
+            v[i] = v[i-1] + dt * a[i]
+
+    return t, x, v, a
+
+
+@pytest.mark.parametrize('modified', [False, True])
+def test_euler_matches_notebook_version(modified):
+    expected = notebook_euler_method(gravitational_acceleration, 0, 28 * DAY, 3600, x0, v0,
+                                     modified=modified, m=m)
+    result = euler_method(gravitational_acceleration, 0, 28 * DAY, 3600, x0, v0,
+                          modified=modified, m=m)
+
+    for values, arrays in zip(expected, result):
+        assert np.array_equal(arrays, values)
+
+
+def test_recorder_keeps_every_kth_step():
+    t, x, v, a = euler_method(gravitational_acceleration, 0, 28 * DAY, 3600, x0, v0, m=m)
+
+    recorder = Recorder(record_every=24)
+    t24, x24, v24, a24 = euler_method(gravitational_acceleration, 0, 28 * DAY, 3600, x0, v0,
+                                      recorder=recorder, m=m)
+
+    # Every 24th hour, and the final state.
+    keep = list(range(0, t.size, 24)) + [t.size - 1]
+
+    assert np.array_equal(t24, t[keep])
+    assert np.array_equal(x24, x[keep])
+    assert np.array_equal(v24, v[keep])
+    assert np.array_equal(a24, a[keep])
+
+
+def test_symplectic_method_conserves_energy():
+    energy = {}
+
+    for method in ['euler', 'verlet']:
+        t, x, v, a = euler_method(gravitational_acceleration, 0, 28 * DAY, 3600, x0, v0,
+                                  method=method, m=m)
+        E = orbital_energy(x, v, m)
+        energy[method] = np.abs(E / E[0] - 1).max()
+
+    assert energy['verlet'] < 1e-4
+    assert energy['euler'] > 100 * energy['verlet']
+
+
+def test_orbital_period_of_moon():
+    t, x, v, a = euler_method(gravitational_acceleration, 0, 1000 * DAY, 3600, x0, v0,
+                              method='verlet', m=m)
+
+    # Kepler's third law for this orbit about a fixed Earth: 27.99 days. The
+    # FFT resolves it to the run length over a whole number of orbits.
+    GM = 6.67408e-11 * 5.972e24
+    semi_major = 1 / (2 / np.linalg.norm(x0) - v0[1]**2 / GM)
+    kepler = 2 * np.pi * np.sqrt(semi_major**3 / GM)
+
+    period = orbital_period(t, x[:, 0]) / DAY
+
+    assert period == pytest.approx(kepler / DAY, rel=0.02)
+    assert period == pytest.approx(27.3, rel=0.03)
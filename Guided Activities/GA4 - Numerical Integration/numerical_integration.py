@@ -0,0 +1,318 @@
+import heapq
+
+import numpy as np
+
+# Gauss-Kronrod 7-15 nodes on [-1, 1], from QUADPACK. The Kronrod rule uses
+# all 15 nodes; the Gauss rule uses every other one (odd indices below).
+KRONROD_NODES = np.asarray([
+    -0.991455371120812639206854697526329, -0.949107912342758524526189684047851,
+    -0.864864423359769072789712788640926, -0.741531185599394439863864773280788,
+    -0.586087235467691130294144845693013, -0.405845151377397166906606412076961,
+    -0.207784955007898467600689403773245,  0.000000000000000000000000000000000,
+     0.207784955007898467600689403773245,  0.405845151377397166906606412076961,
+     0.586087235467691130294144845693013,  0.741531185599394439863864773280788,
+     0.864864423359769072789712788640926,  0.949107912342758524526189684047851,
+     0.991455371120812639206854697526329])
+
+KRONROD_WEIGHTS = np.asarray([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714,
+    0.204432940075298892414161999234649, 0.190350578064785409913256402421014,
+    0.169004726639267902826583426598550, 0.140653259715525918745189590510238,
+    0.104790010322250183839876322541518, 0.063092092629978553290700663189204,
+    0.022935322010529224963732008058970])
+
+GAUSS_WEIGHTS = np.zeros(15)
+GAUSS_WEIGHTS[1::2] = [
+    0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975, 0.417959183673469387755102040816327,
+    0.381830050505118944950369775488975, 0.279705391489276667901467771423780,
+    0.129484966168869693270611432679082]
+
+def gauss_kronrod(func, starts, stops):
+    ''' Return G7-K15 integrals and error estimates over many panels at once.
+
+        All 15 * N nodes are evaluated in a single call to func. The error
+        estimate is QUADPACK's: |K - G|, scaled down for smooth integrands,
+        where the Kronrod result is far more accurate than the difference
+        suggests.
+
+        Args:
+            func (function):    vectorized function
+            starts (np.array):  (N,) lower bounds
+            stops (np.array):   (N,) upper bounds
+
+        Returns:
+            np.array:           (N,) integrals
+            np.array:           (N,) error estimates
+    '''
+
+    center = 0.5 * (starts + stops)
+    half = 0.5 * (stops - starts)
+
+    x = center[:, np.newaxis] + half[:, np.newaxis] * KRONROD_NODES
+    y = np.asarray(func(x.ravel()), dtype=np.float64).reshape(x.shape)
+
+    kronrod = (y @ KRONROD_WEIGHTS) * half
+    gauss = (y @ GAUSS_WEIGHTS) * half
+
+    # Integral of |f - mean(f)|, which measures how far f varies on the panel.
+    mean = kronrod / (2 * half)
+    spread = (np.abs(y - mean[:, np.newaxis]) @ KRONROD_WEIGHTS) * np.abs(half)
+
+    error = np.abs(kronrod - gauss)
+    scaled = spread * np.minimum(1, (200 * error / np.where(spread > 0, spread, 1))**1.5)
+    error = np.where((spread > 0) & (error > 0), scaled, error)
+
+    return kronrod, error
+
+def adaptive_integrate(func, start, stop, rtol=1e-10, atol=1e-12, max_evals=10000):
+    ''' Return the integral of func from start to stop and an error estimate.
+
+        Adaptive Gauss-Kronrod (G7-K15) quadrature. The panel with the largest
+        error estimate is taken from a priority queue and bisected, until the
+        total estimated error meets the tolerance,
+
+                error <= max(atol, rtol * |I|)
+
+        or the evaluation budget runs out (the error estimate then says how
+        far off the result may be).
+
+        Args:
+            func (function):    vectorized function
+            start (float):      a bound
+            stop (float):       b bound
+            rtol (float):       relative tolerance
+            atol (float):       absolute tolerance
+            max_evals (int):    function evaluation budget
+
+        Returns:
+            float:              I.
+            float:              estimated absolute error in I.
+            int:                number of function evaluations.
+    '''
+
+    integral, error = gauss_kronrod(func, np.asarray([start], dtype=np.float64),
+                                    np.asarray([stop], dtype=np.float64))
+    evals = 15
+
+    # Max-heap of panels by error: (-error, start, stop, integral).
+    panels = [(-error[0], start, stop, integral[0])]
+    total, total_error = integral[0], error[0]
+
+    while total_error > max(atol, rtol * abs(total)) and evals + 30 <= max_evals:
+        neg_error, a, b, panel = heapq.heappop(panels)
+        middle = 0.5 * (a + b)
+
+        # Stop when panels can no longer be split in floating point.
+        if not a < middle < b:
+            heapq.heappush(panels, (neg_error, a, b, panel))
+            break
+
+        halves, errors = gauss_kronrod(func, np.asarray([a, middle]), np.asarray([middle, b]))
+        evals += 30
+
+        total += halves.sum() - panel
+        total_error += errors.sum() + neg_error
+
+        heapq.heappush(panels, (-errors[0], a, middle, halves[0]))
+        heapq.heappush(panels, (-errors[1], middle, b, halves[1]))
+
+    # Re-add from the panels to shed the round-off of the running updates.
+    total = sum(p[3] for p in panels)
+    total_error = -sum(p[0] for p in panels)
+
+    return total, total_error, evals
+
+def integrate(func, start, stop, step=None, method='trap', rtol=1e-10, atol=1e-12, max_evals=10000,
+              full_output=False):
+    ''' Return the numerical integration of func from start to stop.
+
+        Performs:
+
+                      I = int^a_b func(x) dx
+
+        Args:
+
+            func (function):    function
+            start (float):      a bound
+            stop (float):       b bound
+            step (float):       dx (not used by 'adaptive')
+
+            method (string):
+
+                'right':        right-hand Riemann sum
+                'left':         left-hand Riemann sum
+                'trap':         trapezoidal sum
+                'simp':         Simpson's 1/3 rule
+                'adaptive':     adaptive Gauss-Kronrod (see adaptive_integrate)
+
+            rtol (float):       relative tolerance ('adaptive' only)
+            atol (float):       absolute tolerance ('adaptive' only)
+            max_evals (int):    evaluation budget ('adaptive' only)
+            full_output (bool): also return the estimated error in I
+                                    ('adaptive' only; None otherwise)
+
+        Returns:
+
+            float:              I.
+    '''
+
+    assert (stop > start), "Stop must be larger than start."
+    assert method in ['left', 'right', 'trap', 'simp', 'adaptive']
+
+    error = None
+
+    if method == 'adaptive':
+        integral, error, evals = adaptive_integrate(func, start, stop, rtol=rtol, atol=atol,
+                                                    max_evals=max_evals)
+
+    elif method == 'left':
+        x = np.arange(start, stop, step)
+        integral = (func(x)).sum() * step
+
+    elif method == 'right':
+        x = np.arange(start + step, stop + step, step)
+        integral = (func(x)).sum() * step
+
+    elif method == 'trap':
+        x = np.arange(start, stop + step, step)
+        y = func(x)
+
+        y_left  = y[:-1]
+        y_right = y[1:]
+
+        integral = (y[:-1] + y[1:]).sum() * 0.5 * step
+
+    elif method == 'simp':
+        x = np.arange(start, stop + step, step)
+        y = func(x)
+
+        y_left  = y[:-1]
+        y_right = y[1:]
+
+        x_mid = 0.5 * (x[:-1] + x[1:])
+        y_mid = func(x_mid)
+
+        integral = (y_left + 4.0 * y_mid + y_right).sum() * (step / 6.0)
+
+    return (integral, error) if full_output else integral
+
+def relative_error(numerical, exact):
+    ''' Return relative error given numerical and exact solutions. '''
+
+    return abs(numerical - exact) * 100 / exact
+
+def visualize(func=lambda x: np.sin(x), start=0, stop=10, step=1):
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+
+    import numpy as np
+
+    x = np.linspace(start, stop, 1000)
+
+    fig = plt.figure(figsize=(10,8))
+
+    ax_left  = fig.add_subplot(2, 2, 1)
+    ax_right = fig.add_subplot(2, 2, 2)
+    ax_trap  = fig.add_subplot(2, 2, 3)
+    ax_simp  = fig.add_subplot(2, 2, 4)
+
+    ax_left.plot(x, func(x), color='black', linewidth='1.5')
+    ax_left.set_ylabel('func(x)')
+    ax_left.set_title('Left-hand Riemann Sum')
+
+    ax_right.plot(x, func(x), color='black', linewidth='1.5')
+    ax_right.set_ylabel('func(x)')
+    ax_right.set_title('Right-hand Riemann Sum')
+
+    ax_trap.plot(x, func(x), color='black', linewidth='1.5')
+    ax_trap.set_ylabel('func(x)')
+    ax_trap.set_title('Trapezoidal Riemann Sum')
+
+    ax_simp.plot(x, func(x), color='black', linewidth='1.5')
+    ax_simp.set_xlabel('x')
+    ax_simp.set_ylabel('func(x)')
+    ax_simp.set_title('Simson\'s 1/3 Rule Sum')
+
+
+    for i in np.arange(start, stop, step):
+
+        # Left rectangular patches
+        ax_left.add_patch(
+            patches.Rectangle(
+                 xy=(i, 0),
+                 width=step,
+                 height=func(i),
+                 fill=True,
+                 edgecolor='black',
+                 facecolor='lightyellow'
+            )
+        )
+
+        ax_left.scatter(i, func(i), c='k', zorder=5, s=10)
+
+        # Right rectangular patches
+        ax_right.add_patch(
+            patches.Rectangle(
+                 xy=(i + step, 0),
+                 width=-step,
+                 height=func(i + step),
+                 fill=True,
+                 edgecolor='black',
+                 facecolor='lightyellow'
+            )
+        )
+
+        ax_right.scatter(i + step, func(i + step), c='k', zorder=5, s=10)
+
+        # Trapezoidal patches
+        ax_trap.add_patch(
+            patches.Polygon(
+                 xy = np.asarray([
+                     [i, 0.0],
+                     [i, func(i)],
+                     [i + step, func(i + step)],
+                     [i + step, 0.0]
+                 ]),
+                 fill=True,
+                 edgecolor='black',
+                 facecolor='lightyellow'
+            )
+        )
+
+        ax_trap.scatter(i, func(i), c='k', zorder=5, s=10)
+
+        # The Simpson's patches take a bit more work.
+        x1 = i
+        x2 = i + 0.5 * step
+        x3 = i + step
+
+        y1, y2, y3 = func(x1), func(x2), func(x3)
+
+        # Fit parabola to three points...yuck...
+        parab = (lambda x: ((y1*(x-x2)*(x-x3))/((x1-x2)*(x1-x3)) +
+                            (y2*(x-x1)*(x-x3))/((x2-x1)*(x2-x3)) +
+                            (y3*(x-x1)*(x-x2))/((x3-x1)*(x3-x2))))
+
+        # Create patches for parabolic curve.
+        px = np.linspace(x1, x3, 25)
+        py = np.asarray([px, parab(px)]).T
+
+        py = np.append(py, [[x3, 0.0]], axis=0)
+        py = np.append(py, [[x1, 0.0]], axis=0)
+
+        ax_simp.add_patch(
+            patches.Polygon(
+                 xy = py,
+                 fill=True,
+                 edgecolor='black',
+                 facecolor='lightyellow'
+            )
+        )
+
+        ax_simp.scatter(i, func(i), c='k', zorder=5, s=10)
+
+    plt.show()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from numerical_integration import adaptive_integrate, integrate
+
+
+@pytest.mark.parametrize('func, start, stop, exact', [
+    (np.sin, 0, 10, 1 - np.cos(10)),
+    (np.exp, 0, 1, np.e - 1),
+    (lambda x: 1 / (1 + 25 * x**2), -1, 1, 0.4 * np.arctan(5)),
+    (np.sqrt, 0, 1, 2 / 3),
+])
+def test_adaptive_reaches_tolerance_cheaply(func, start, stop, exact):
+    integral, error, evals = adaptive_integrate(func, start, stop, rtol=1e-12, atol=1e-12)
+
+    assert abs(integral - exact) <= max(1e-12, 1e-12 * abs(exact))
+    assert abs(integral - exact) <= 10 * error + 1e-15
+    assert evals < 1000
+
+
+def test_budget_is_respected():
+    integral, error, evals = adaptive_integrate(lambda x: np.abs(x - 1 / 3)**0.1, 0, 1,
+                                                rtol=1e-15, atol=0, max_evals=200)
+
+    assert evals <= 200
+    assert error > 1e-15
+
+
+def test_integrate_adaptive_method():
+    integral, error = integrate(np.sin, 0, 10, method='adaptive', rtol=1e-12, full_output=True)
+
+    assert integral == pytest.approx(1 - np.cos(10), rel=1e-12)
+    assert integrate(np.sin, 0, 10, 0.01, method='simp') == pytest.approx(integral, rel=1e-9)
+
+
+@pytest.mark.parametrize('method', ['left', 'right', 'trap', 'simp', 'adaptive'])
+def test_integrate_returns_float_for_every_method(method):
+    integral = integrate(np.sin, 0, 10, 0.001, method=method)
+
+    assert isinstance(integral, float)
+    assert integral == pytest.approx(1 - np.cos(10), rel=1e-2)
@@ -0,0 +1,95 @@
+import numpy as np
+
+from me273.instrumentation import count
+from me273.roots import bracket, bracket_result
+
+def approximate_error(new, old):
+    ''' Return approximate error given old and new values. '''
+
+    return np.abs(new - old) / new
+
+def newton_raphson(func, func_prime, xi, e_req=0.001, max_iterations=100):
+    ''' Return root of func closest to xi given func and func_prime.
+
+        Raises RuntimeError after max_iterations, e.g. for Exercise 4 from
+        xi = 6 or 8, where the iteration climbs away from the root.
+    '''
+
+    for i in range(max_iterations):
+        # Save past value for later e_a analysis
+        old_xi = xi
+
+        # Computer Newton-Raphson
+        xi = xi - func(xi) / func_prime(xi)
+
+        # Evaluate stopping condition.
+        if approximate_error(xi, old_xi) < e_req:
+            count('iterations', i + 1)
+            return xi
+
+    count('iterations', max_iterations)
+
+    raise RuntimeError('Newton-Raphson did not converge in %d iterations from xi=%s.'
+                       % (max_iterations, xi))
+
+def bisection(func, xl, xu, e_req=0.001, args=(), full_output=False):
+    ''' Find root of `func` within interval (xl, xu) using bisection.
+
+        Brackets may be arrays, to solve many problems at once; each
+        iteration is then one vectorized call to func (see me273.roots).
+
+        Args:
+
+            func (func):        function to find roots of, func(x, *args)
+            xl (float):         lower bound, or array of them
+            xu (float):         upper bound, or array of them
+            e_req (int):        required approximate error
+            args (tuple):       parameters, one value (or array) per problem
+            full_output (bool): also return per-problem 'iterations',
+                                    'converged' and 'evaluations'
+
+        Return:
+
+            float:              root of func within interval.
+
+        Examples:
+            Exercise 2 for every mass from 60 to 100 kg.
+                >>> func = lambda c, m: velocity(m=m, g=9.81, c=c, t=4) - 36
+                >>> c, stats = bisection(func, 1e-3, 10, args=(np.linspace(60, 100, 1000),), full_output=True)
+    '''
+
+    roots, stats = bracket(func, xl, xu, args=args, method='bisection', e_req=e_req)
+
+    return bracket_result(roots, stats, full_output)
+
+def false_position(func, xl, xu, e_req=0.001, args=(), full_output=False):
+    ''' Find root of `func` within interval (xl, xu) using false position.
+
+        Arguments and return are as for bisection.
+    '''
+
+    roots, stats = bracket(func, xl, xu, args=args, method='false_position', e_req=e_req)
+
+    return bracket_result(roots, stats, full_output)
+
+def velocity(m, g, c, t):
+    ''' Return velocity of parachutist at time, t. '''
+
+    return m*g/c * (1 - np.exp(-c*t/m))
+
+def drag_coefficient(m, v, t, g=9.81, xl=1e-3, xu=100, e_req=0.001, full_output=False):
+    ''' Return the drag coefficient (kg/s) giving a parachutist of mass m (kg)
+        velocity v (m/s) at time t (s). Any argument may be an array.
+
+        Examples:
+            Exercise 2.
+                >>> drag_coefficient(m=82, v=36, t=4)
+
+            Every combination of mass, velocity and time, in one solve.
+                >>> m, v, t = np.meshgrid(np.linspace(60, 100, 20), np.linspace(20, 35, 20), np.linspace(4, 10, 20))
+                >>> c = drag_coefficient(m, v, t)
+    '''
+
+    func = lambda c, m, v, t, g: velocity(m=m, g=g, c=c, t=t) - v
+
+    return bisection(func, xl, xu, e_req=e_req, args=(m, v, t, g), full_output=full_output)
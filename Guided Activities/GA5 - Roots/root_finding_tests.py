@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from root_finding import bisection, drag_coefficient, false_position, newton_raphson, velocity
+
+
+@pytest.mark.parametrize('method', [bisection, false_position])
+def test_exercises(method):
+    func = lambda m: velocity(m=m, g=9.81, c=15, t=10) - 36
+
+    assert method(func, xl=1e-3, xu=100) == pytest.approx(59.959, rel=2e-3)
+    assert method(np.cos, xl=0, xu=3) == pytest.approx(np.pi / 2, rel=1e-3)
+
+
+def test_many_problems_at_once():
+    m, v, t = np.meshgrid(np.linspace(60, 100, 20), np.linspace(20, 35, 20), np.linspace(4, 10, 20))
+
+    c, stats = drag_coefficient(m, v, t, e_req=1e-10, full_output=True)
+
+    assert c.shape == m.shape
+    assert np.all(stats['converged'])
+    assert velocity(m=m, g=9.81, c=c, t=t) == pytest.approx(v, rel=1e-8)
+
+    # One vectorized evaluation per iteration of the slowest problem.
+    assert stats['evaluations'] == stats['iterations'].max() + 1
+    assert drag_coefficient(82, 36, 4, e_req=1e-10) == pytest.approx(3.5857, rel=1e-4)
+
+
+def test_bracket_without_root():
+    with pytest.raises(ValueError):
+        bisection(np.cos, xl=[0, 1], xu=[3, 1.5])
+
+
+def test_newton_raphson_gives_up():
+    func = lambda x: np.exp(-0.5 * x) * (4 - x) - 2
+    func_prime = lambda x: (0.5 * x - 3.0) * np.exp(-0.5 * x)
+
+    assert newton_raphson(func, func_prime, 2) == pytest.approx(0.8857, rel=1e-3)
+
+    with np.errstate(all='ignore'), pytest.raises(RuntimeError):
+        newton_raphson(func, func_prime, 8)
@@ -0,0 +1,125 @@
+import collections.abc
+import time
+
+import numpy as np
+
+from me273.banded import BandedMatrix, bandwidth
+from me273.factorization import Factorization
+
+def cramer(A, b):
+    ''' Return x for sytem Ax = b using Cramer's rule. '''
+
+    # Grab the determinant of A.
+    det_A = np.linalg.det(A)
+
+    # Count columns in A.
+    columns = A.shape[1]
+
+    # Create result array of size `columns`.
+    x = np.empty((columns, 1))
+
+    # Perform Cramer rule on each element of solution array.
+    for i in range(columns):
+
+        # Deep copy (i.e. no referencing) A into A_i.
+        A_i = np.copy(A)
+
+        # Replace column i of A_i with vector b.
+        A_i[:, i] = b.reshape(columns)
+
+        # Get the deteminant of A_i.
+        det_A_i = np.linalg.det(A_i)
+
+        # Calculate the result element x_i and put it in x.
+        x_i = det_A_i / det_A
+        x[i] = x_i
+
+    return x
+
+def inverse_solve(A, b):
+    ''' Return x for system Ax = b using inverse and dot method. '''
+
+    return np.dot(np.linalg.inv(A), b)
+
+def factor_solve(A, b):
+    ''' Return x for system Ax = b using a factorization, computed once.
+
+        A and b may be arrays or nested lists. b may be (n,), (n, 1), a
+        block (n, k) of right-hand sides, or an iterator (e.g. a generator)
+        of (n,) right-hand sides, which returns a generator of solutions.
+        If A is narrowly banded (e.g. tridiagonal), its bandwidth is found
+        and it is factored in banded storage, in O(n * bw**2) rather than
+        O(n**3). To keep solving against the same A, keep a Factorization
+        (or BandedFactorization) instead. For grids too large to factor at
+        all, store A as a me273.sparse.CSRMatrix and solve it iteratively.
+
+        Examples:
+            >>> factor_solve(A, b)
+
+            >>> solve = Factorization(A)
+            >>> x1, x2 = solve(b1), solve(b2)
+    '''
+
+    A = np.asarray(A, dtype=np.float64)
+
+    lower, upper = bandwidth(A)
+
+    if lower + upper + 1 <= 0.1 * A.shape[0]:
+        solve = BandedMatrix.from_dense(A, lower, upper).factor()
+    else:
+        solve = Factorization(A)
+
+    if isinstance(b, collections.abc.Iterator):
+        return (solve(np.asarray(x, dtype=np.float64)) for x in b)
+
+    return solve(np.asarray(b, dtype=np.float64))
+
+def benchmark(n=100, k=100, repeat=3, seed=273):
+    ''' Return the best time (s) of each method to solve n x n A against k
+        right-hand sides, one after the other, as in a simulation.
+
+        Cramer's rule and the inverse are timed on the first right-hand
+        side only and scaled by k, as each would redo all its work for every
+        right-hand side. Cramer's rule is skipped (nan) above n = 100, where
+        its determinants overflow and it takes hours.
+
+        Returns:
+            dict:   method -> time (s)
+
+        Examples:
+            >>> benchmark(n=500, k=1000)
+            {'cramer': ..., 'inverse_solve': ..., 'np.linalg.solve': ..., 'Factorization': ...}
+    '''
+
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(-100, 100, (n, n))
+    B = rng.uniform(-100, 100, (n, k))
+
+    def best(func, scale=1):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times) * scale
+
+    def factored():
+        solve = Factorization(A)
+        for b in B.T:
+            solve(b)
+
+    return {'cramer': best(lambda: cramer(A, B[:, :1]), k) if n <= 100 else np.nan,
+            'inverse_solve': best(lambda: inverse_solve(A, B[:, :1]), k),
+            'np.linalg.solve': best(lambda: [np.linalg.solve(A, b) for b in B.T]),
+            'Factorization': best(factored)}
+
+if __name__ == '__main__':
+
+    print('{:>6} {:>6} {:>12} {:>14} {:>16} {:>14}'.format(
+        'n', 'k', 'cramer', 'inverse_solve', 'np.linalg.solve', 'Factorization'))
+
+    for n, k in [(3, 1000), (100, 1000), (500, 1000), (1000, 1000)]:
+        times = benchmark(n, k, repeat=1 if n > 100 else 3)
+
+        print('{:>6} {:>6} {:>12.4f} {:>14.4f} {:>16.4f} {:>14.4f}'.format(
+            n, k, times['cramer'], times['inverse_solve'], times['np.linalg.solve'], times['Factorization']))
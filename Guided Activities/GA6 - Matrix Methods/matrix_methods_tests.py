@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from matrix_methods import benchmark, cramer, factor_solve, inverse_solve
+
+A = np.asarray([[27.6, -123.5, -97.8],
+                [45.5,  100.3,   2.1],
+                [ 1.2,   67.3,  99.4]])
+
+b = np.asarray([[-11.0],
+                [744.3],
+                [  7.7]])
+
+
+@pytest.mark.parametrize('method', [cramer, inverse_solve, factor_solve])
+def test_exercise_solution(method):
+    assert method(A, b) == pytest.approx(np.asarray([[7.758], [3.958], [-2.696]]), abs=1e-3)
+
+
+def test_factor_solve_stream():
+    bs = [b[:, 0], 2 * b[:, 0]]
+    x1, x2 = factor_solve(A, iter(bs))
+
+    assert x2 == pytest.approx(2 * x1)
+
+
+def test_factor_solve_lists():
+    x = factor_solve(A.tolist(), [-11.0, 744.3, 7.7])
+
+    assert x == pytest.approx(np.asarray([7.758, 3.958, -2.696]), abs=1e-3)
+
+
+def test_benchmark_runs():
+    assert set(benchmark(n=10, k=5, repeat=1)) == {'cramer', 'inverse_solve', 'np.linalg.solve', 'Factorization'}
+
+
+def test_factor_solve_finds_band():
+    n = 200
+    T = 2 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1)
+    f = np.ones((n, 1))
+
+    assert factor_solve(T, f) == pytest.approx(np.linalg.solve(T, f), rel=1e-10)
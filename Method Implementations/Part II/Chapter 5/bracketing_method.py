@@ -15,10 +15,11 @@ f
 '''
 
 import numpy as np
-from matplotlib import pyplot as plt
 
 import unittest
 
+from me273.roots import bracket, bracket_result
+
 def g(x):
 	return np.cos(x)
 
@@ -26,51 +27,31 @@ def ea(old, new):
 	return abs((new - old) / old)
 
 def bisect(func, xl, xu, et=0.001, 
-	max_iterations=int(1e6), verbose=False):
-
-	for i in range(max_iterations):
-		xr = (xl + xu) / 2
-
-		if verbose:
-			print(('xl: {xl:<5.4f}\txu: {xu:<5.4f}\t'
-				   'xr: {xr:<5.4f}\tea: {ea:<5.4f}\t'
-				   'func(xl): {fxl:<5.4f}\t'
-				   'func(xu): {fxu:<5.4f}').format(
-					xu=xu, xl=xl, xr=xr, 
-					ea=ea(old=xr, new=(xl+xu)/2), 
-					fxl=func(xl), fxu=func(xu)))
-
-		if func(xl) * func(xr) < 0:
-			xu = xr
-		elif func(xl) * func(xr) > 0:
-			xl = xr
-		else:
-			return xr
-
-		if ea(old=xr, new=(xl + xu) / 2) < et:
-			return (xl + xu) / 2
-
-	else:
-		print('Failed to find root in {} iterations.'.format(max_iterations))
-
-def false_position(func, xl, xu, et=0.001):
-	while True:
-		fl = func(xl)
-		fu = func(xu)
-
-		xr = xu - fu * (xl - xu) / (fl - fu)
-		fr = func(xr)
-
-		if fl * fr > 0:
-			xl = xr
-		elif fu * fr > 0:
-			xu = xr
-		else:
-			print('Error! Sign mismatch.')
-			return 0
-
-		if ea(old=xr, new=xu - fu * (xl - xu) / (fl - fu)) < et:
-			return (xl + xu) / 2	
+	max_iterations=100, verbose=False, args=(), full_output=False):
+	''' Return the root of func within (xl, xu) by bisection.
+
+		xl and xu may be arrays of brackets, to solve many problems in one
+		vectorized evaluation per iteration; args then holds per-problem
+		parameters, func(x, *args). With full_output, also return a dict of
+		per-problem 'iterations', 'converged' and 'evaluations'.
+	'''
+
+	roots, stats = bracket(func, xl, xu, args=args, method='bisection', 
+		e_req=et, max_iterations=max_iterations, verbose=verbose)
+
+	return bracket_result(roots, stats, full_output, warn=True)
+
+def false_position(func, xl, xu, et=0.001, 
+	max_iterations=100, verbose=False, args=(), full_output=False):
+	''' Return the root of func within (xl, xu) by false position.
+
+		Arguments are as for bisect.
+	'''
+
+	roots, stats = bracket(func, xl, xu, args=args, method='false_position', 
+		e_req=et, max_iterations=max_iterations, verbose=verbose)
+
+	return bracket_result(roots, stats, full_output, warn=True)
 
 class TestBracketingMethods(unittest.TestCase):
 	def test_bisect(self):
@@ -83,6 +64,18 @@ class TestBracketingMethods(unittest.TestCase):
 		self.assertAlmostEqual(false_position(np.sin, xl=1, xu=5), np.pi, places=2)
 		self.assertAlmostEqual(false_position(lambda x: 2 ** x - 5, xl=0, xu=3), 2.322, places=2)
 
+	def test_many_brackets(self):
+		m = np.linspace(60, 100, 50)
+		func = lambda c, m: m * 9.81 / c * (1 - np.exp(-c * 4 / m)) - 36
+
+		for method in [bisect, false_position]:
+			c, stats = method(func, xl=1e-3, xu=20, et=1e-10, args=(m,), full_output=True)
+
+			self.assertEqual(c.shape, m.shape)
+			self.assertTrue(stats['converged'].all())
+			self.assertEqual(stats['evaluations'], stats['iterations'].max() + 1)
+			np.testing.assert_allclose(func(c, m), 0, atol=1e-6)
+
 if __name__ == '__main__':
 	unittest.main()
 
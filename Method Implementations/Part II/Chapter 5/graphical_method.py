@@ -15,7 +15,8 @@
 '''
 
 import numpy as np
-from matplotlib import pyplot as plt
+
+from me273.roots import find_roots
 
 res = 500
 
@@ -25,25 +26,40 @@ def f(g, m , v, c, t):
 def g(x):
 	return np.sin(10 * x) + np.cos(3 * x)
 
-f, axarr = plt.subplots(3, facecolor='#cceefb')
+def roots(func=g, xl=0, xu=5, res=res):
+	''' Return every root of func in [xl, xu], found without plotting.
+
+		The scan zooms in automatically where func oscillates, in place of
+		zooming in by hand (see me273.roots.find_roots).
+	'''
+
+	return find_roots(func, xl, xu, samples=res)[0]
+
+def plot(func=g, windows=((0, 5), (3, 5), (4.2, 4.3)), res=res):
+	''' Plot func over successively zoomed windows, marking its roots. '''
+
+	from matplotlib import pyplot as plt
+
+	fig, axarr = plt.subplots(len(windows), facecolor='#cceefb')
+
+	for ax, (xl, xu) in zip(axarr, windows):
+		x = np.linspace(xl, xu, res)
+		ax.plot(x, func(x), c='black')
+		r = roots(func, xl, xu, res)
+		ax.scatter(r, np.zeros_like(r), c='black', zorder=10)
+		ax.axhline(y=0, c='black', linewidth='0.5')
+		ax.set_facecolor('white')
+		ax.tick_params(direction='in')
 
-x = np.linspace(0, 5, res)
-axarr[0].plot(x, g(x), c='black')
-axarr[0].axhline(y=0, c='black', linewidth='0.5')
-axarr[0].set_axis_bgcolor('white')
-axarr[0].tick_params(direction='in')
+	plt.xlabel('x')
+	plt.ylabel('g(x)')
 
-x = np.linspace(3, 5, res)
-axarr[1].plot(x, g(x), c='black')
-axarr[1].axhline(y=0, c='black', linewidth='0.5')
-axarr[1].tick_params(direction='in')
+	return fig
 
-x = np.linspace(4.2, 4.3, res)
-axarr[2].plot(x, g(x), c='black')
-axarr[2].axhline(y=0, c='black', linewidth='0.5')
-axarr[2].tick_params(direction='in')
+if __name__ == '__main__':
+	print(roots())
 
+	plot()
 
-f = plt.xlabel('x')
-f = plt.ylabel('g(x)')
-plt.show()
\ No newline at end of file
+	from matplotlib import pyplot as plt
+	plt.show()
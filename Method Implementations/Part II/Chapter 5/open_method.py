@@ -15,7 +15,8 @@
 '''
 
 import numpy as np
-from matplotlib import pyplot as plt
+
+from me273.instrumentation import count
 
 def g(x):
 	return np.exp(-1 * x) - x
@@ -23,28 +24,44 @@ def g(x):
 def ea(old, new):
 	return abs((new - old) / old)
 
-def simple_fixed_point(func, xo, et=0.001):
+def simple_fixed_point(func, xo, et=0.001, max_iterations=1000):
 	x = func(xo) + xo
-	while True:
+	for i in range(max_iterations):
 		xi = func(x) + x
 
 		if ea(old=x, new=xi) < et:
+			count('iterations', i + 1)
 			return xi
 		else:
 			x = xi
 
-def secant(func, xo, et=0.001, s=0.0001):
-	x = xo - (s * func(xo)) / (func(xo + s) - func(xo))
-	while True:
-		print(x)
-		xi = x - (s * func(x)) / (func(x + s) - func(x))
+	else:
+		count('iterations', max_iterations)
+		print('Failed to find root in {} iterations.'.format(max_iterations))
+		return x
+
+def secant(func, xo, et=0.001, s=0.0001, max_iterations=1000, verbose=False):
+	fx = func(xo)
+	x = xo - (s * fx) / (func(xo + s) - fx)
+	for i in range(max_iterations):
+		if verbose:
+			print(x)
+
+		# Two evaluations per step: func(x), reused, and func(x + s).
+		fx = func(x)
+		xi = x - (s * fx) / (func(x + s) - fx)
 
 		if ea(old=x, new=xi) < et:
+			count('iterations', i + 1)
 			return xi
 		else:
 			x = xi
 
-
-print(secant(g, 0))
+	else:
+		count('iterations', max_iterations)
+		print('Failed to find root in {} iterations.'.format(max_iterations))
+		return x
 
 
+if __name__ == '__main__':
+	print(secant(g, 0))
@@ -1,8 +1,10 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
+from me273.instrumentation import count, counted
+
 def runga_kutta(func, yl, xl, xu, h):
 	''' For a function dy/dx = func(x, y), returns a list of x + h, y values. '''
+	func = counted(func, 'acceleration')
 	y = yl
 	x = xl
 
@@ -20,4 +22,6 @@ def runga_kutta(func, yl, xl, xu, h):
 		xs.append(x)
 		ys.append(y)
 
+	count('steps', len(xs) - 1)
+
 	return xs, ys
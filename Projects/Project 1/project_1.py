@@ -1,6 +1,7 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
+from me273.instrumentation import count, counted
+
 def drag_force(v, D, rho, A):
     ''' Return drag force on a projectile subject to air resistance.
         
@@ -23,7 +24,7 @@ def drag_force(v, D, rho, A):
 
     F_d = ((D * rho * A) / 2) * magnitude(v)**2
     
-    return F_d * (-1) * unit_vector(v)
+    return np.expand_dims(F_d, -1) * (-1) * unit_vector(v)
 
 def gravitational_force(m, g=9.80665, dimensions=2, vertical_axis=1):
     ''' Return gravitational force on a projectile subject to gravity.
@@ -34,18 +35,19 @@ def gravitational_force(m, g=9.80665, dimensions=2, vertical_axis=1):
 
         Args:
             
-            m (np.array):           mass of the object (kg) 
+            m (np.array):           mass of the object, or (N,) masses (kg) 
             g (np.float64):         gravitational acceleration (m/s**2)
             dimensions (int):       number of dimensions in return vector
             vertical_axis (int):    axis which gravitional force acts on
 
         Returns:
 
-            (np.array):             gravitational force vector (N)
+            (np.array):             gravitational force vector, or (N, dimensions)
+                                        force vectors (N)
     '''
 
-    force = np.zeros(dimensions)
-    force[vertical_axis] = -g * m
+    force = np.zeros(np.shape(m) + (dimensions,))
+    force[..., vertical_axis] = -g * np.asarray(m)
     
     return force
 
@@ -64,43 +66,46 @@ def acceleration(x, v, D, rho, A, m=1):
             A (np.float64):     cross-sectional area (m**2)
             m (np.float64):     mass of the projectile (kg)
 
+            v may also be an (N, dims) array of velocities, in which case
+            D, rho, A and m may each be a scalar or an (N,) array.
+
         Returns:
 
-            (np.array):         acceleration vector 
+            (np.array):         acceleration vector, or (N, dims) vectors
     '''
 
     F_d = drag_force(v, D, rho, A)
-    F_g = gravitational_force(m)
+    F_g = gravitational_force(m, dimensions=np.shape(v)[-1])
 
-    return (F_d + F_g) / m
+    return (F_d + F_g) / np.expand_dims(m, -1)
         
 def unit_vector(x):
     ''' Return unit vector for vector x. 
 
         Args:
 
-            x (np.array):   input vector
+            x (np.array):   input vector, or (N, dims) array of vectors
 
         Returns
             
             (np.array):     unit vector for x
     '''
 
-    return x / magnitude(x)
+    return x / np.expand_dims(magnitude(x), -1)
 
 def magnitude(x):
     ''' Return mangitude of vector x. 
 
         Args:
 
-            x (np.array):   input vector
+            x (np.array):   input vector, or (N, dims) array of vectors
 
         Returns
             
-            (np.float64):   magnitude of x 
+            (np.float64):   magnitude of x, or (N,) magnitudes
     '''
 
-    return np.sqrt(np.sum(x * x))
+    return np.sqrt(np.sum(x * x, axis=-1))
 
 def air_density(y, rho0=1.2, c=6.5e-3, T0=300, alpha=2.5):
     ''' Return altitude dependent air density, rho.
@@ -174,6 +179,154 @@ def euler_method(acceleration, t0, tf, dt, x0=0, v0=0, modified=False, **kwargs)
 
     return t, x, v, a
 
+def batch_euler_method(acceleration, x0, v0, t0=0, tf=None, dt=0.01, modified=True,
+                       stop_mode='projectile', vertical_axis=1, **kwargs):
+    ''' Returns t, x, v, and a arrays for N trajectories stepped together.
+
+    Every step makes a single call to the acceleration function with the
+    (M, dims) states of the M trajectories that are still in flight, so the
+    acceleration function (and any per-trajectory kwargs) must broadcast
+    over a leading trajectory axis, as acceleration() above does.
+
+    Trajectories that have stopped are dropped from the update; their
+    remaining samples are masked in the returned arrays.
+
+    Args:
+        acceleration (func):    vectorized acceleration function **
+
+        x0 (np.array):          (N, dims) initial displacements (m)
+        v0 (np.array):          (N, dims) initial velocities (m/s)
+
+        t0 (float):             initial time (s)
+        tf (float):             final time (s; required by 'normal')
+        dt (float):             time step (s)
+
+        modified (bool):        turns on modified euler method.
+
+        stop_mode:              'normal'     run from t0 to tf
+                                'projectile' run each trajectory until y=0
+
+        vertical_axis           vertical axis for 'projectile' stop mode.
+
+        **kwargs:               any additional parameters required for
+                                    acceleration function. Arrays with a
+                                    leading axis of length N are taken to be
+                                    per-trajectory parameters.
+
+    Returns:
+        np.float64 (np.array):          (steps,) list of times (s)
+        np.float64 (np.ma.MaskedArray): (N, steps, dims) positions (m)
+        np.float64 (np.ma.MaskedArray): (N, steps, dims) velocities (m/s)
+        np.float64 (np.ma.MaskedArray): (N, steps, dims) accelerations (m/s**2)
+
+    Raises:
+        ValueError: for an unknown stop_mode, or 'normal' without tf
+
+    Examples:
+        Sweep 1,000 launch speeds at a 45 degree incline.
+            >>> v0 = launch_vector(mag=np.linspace(100, 750, 1000), incline=45)
+            >>> x0 = np.zeros_like(v0)
+            >>> t, x, v, a = batch_euler_method(acceleration, x0, v0, D=0.3, rho=1.2, A=0.1, m=1225)
+
+        Find the range of every shell.
+            >>> x[:, :, 0].max(axis=1)
+    '''
+
+    if stop_mode not in ('normal', 'projectile'):
+        raise ValueError("Unknown stop_mode %r, expected 'normal' or 'projectile'." % (stop_mode,))
+
+    if stop_mode == 'normal' and tf is None:
+        raise ValueError("stop_mode 'normal' requires a final time, tf.")
+
+    x0 = np.atleast_2d(np.asarray(x0, dtype=np.float64))
+    v0 = np.atleast_2d(np.asarray(v0, dtype=np.float64))
+    x0, v0 = np.broadcast_arrays(x0, v0)
+
+    trajectories, dimensions = x0.shape
+    acceleration = counted(acceleration, 'acceleration')
+
+    # Allocate initial array size.
+    n = 1024
+    t = np.empty(n)
+    x = np.empty([trajectories, n, dimensions])
+    v = np.empty([trajectories, n, dimensions])
+    a = np.empty([trajectories, n, dimensions])
+
+    # Set initial conditions.
+    t[0] = t0
+    x[:, 0] = x0
+    v[:, 0] = v0
+    a[:, 0] = acceleration(x0, v0, **kwargs)
+
+    # Index of the last sample written for each trajectory.
+    last = np.zeros(trajectories, dtype=np.intp)
+    active = np.arange(trajectories)
+
+    i = 0
+    while active.size:
+        # If array is too small, reallocate
+        i += 1
+        if i >= n:
+            t = np.append(t, np.empty(n))
+            x = np.append(x, np.empty([trajectories, n, dimensions]), axis=1)
+            v = np.append(v, np.empty([trajectories, n, dimensions]), axis=1)
+            a = np.append(a, np.empty([trajectories, n, dimensions]), axis=1)
+
+            n *= 2
+
+        # Run Euler Method on the trajectories still in flight.
+        xi = x[active, i-1]
+        vi = v[active, i-1]
+        ai = acceleration(xi, vi, **_select_trajectories(kwargs, active, trajectories))
+
+        if modified:
+            vi = vi + dt * ai
+            xi = xi + dt * vi
+        else:
+            xi = xi + dt * vi
+            vi = vi + dt * ai
+
+        x[active, i] = xi
+        v[active, i] = vi
+        a[active, i] = ai
+
+        t[i] = t[i-1] + dt
+        last[active] = i
+
+        # Evaluate stopping conditions.
+        if stop_mode == 'normal':
+            if t[i] > tf:
+                break
+        elif stop_mode == 'projectile':
+            if t[i] > t0:
+                active = active[xi[:, vertical_axis] > 0]
+
+    count('steps', i)
+
+    # Truncate unused portion of arrays and mask samples after each stop.
+    steps = i + 1
+    mask = np.arange(steps) > last[:, np.newaxis]
+    mask = np.repeat(mask[:, :, np.newaxis], dimensions, axis=2)
+
+    t = t[0:steps]
+    x = np.ma.masked_array(x[:, 0:steps], mask=mask)
+    v = np.ma.masked_array(v[:, 0:steps], mask=mask)
+    a = np.ma.masked_array(a[:, 0:steps], mask=mask)
+
+    return t, x, v, a
+
+def _select_trajectories(kwargs, index, trajectories):
+    ''' Return kwargs with per-trajectory arrays reduced to rows in index. '''
+
+    selected = {}
+    for key, value in kwargs.items():
+        if isinstance(value, np.ndarray) and value.ndim and value.shape[0] == trajectories:
+            value = value[index]
+
+        selected[key] = value
+
+    return selected
+
 def launch_vector(mag, incline, azimuth=False, radians=False):
     ''' Return v0 vector for given scalar magnitude and incline above the horizon. 
 
@@ -183,8 +336,12 @@ def launch_vector(mag, incline, azimuth=False, radians=False):
             azimuth (float):        angle in plane of horizon (degrees)
             radians (bool):         option for using radian incline
 
+            mag and incline may also be (N,) arrays, e.g. for a sweep of
+            launch conditions fed to batch_euler_method.
+
         Returns:
-            np.array (np.float64):  vector with launch velocity components
+            np.array (np.float64):  vector with launch velocity components,
+                                        or (N, 2) array of vectors
     '''
     
     if not radians:
@@ -206,6 +363,6 @@ def launch_vector(mag, incline, azimuth=False, radians=False):
         x = mag * np.cos(incline)
         y = mag * np.sin(incline)
 
-        return np.asarray([x, y])
+        return np.stack([x, y], axis=-1)
 
 
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from project_1 import acceleration, batch_euler_method, launch_vector
+
+
+def single_trajectory(x0, v0, dt, **kwargs):
+    ''' Reference modified Euler loop for one projectile. '''
+
+    x, v = np.asarray(x0, dtype=np.float64), np.asarray(v0, dtype=np.float64)
+    xs = [x]
+    while True:
+        a = acceleration(x, v, **kwargs)
+        v = v + dt * a
+        x = x + dt * v
+        xs.append(x)
+
+        if x[1] <= 0:
+            return np.asarray(xs)
+
+
+def test_batch_matches_single_trajectories():
+    mags = np.asarray([100.0, 250.0, 400.0])
+    masses = np.asarray([5.0, 50.0, 500.0])
+    v0 = launch_vector(mag=mags, incline=30)
+    x0 = np.zeros_like(v0)
+
+    t, x, v, a = batch_euler_method(acceleration, x0, v0, dt=0.05, D=0.3, rho=1.2, A=0.1, m=masses)
+
+    assert x.shape == (3, t.size, 2)
+
+    for i in range(3):
+        expected = single_trajectory(x0[i], v0[i], dt=0.05, D=0.3, rho=1.2, A=0.1, m=masses[i])
+        steps = x[i].count(axis=0)[0]
+
+        assert steps == len(expected)
+        assert x[i, :steps].data == pytest.approx(expected)
+
+
+def test_batch_masks_landed_trajectories():
+    v0 = launch_vector(mag=np.asarray([50.0, 500.0]), incline=45)
+
+    t, x, v, a = batch_euler_method(acceleration, np.zeros_like(v0), v0, dt=0.1, D=0.3, rho=1.2, A=0.1, m=100)
+
+    short, long = x[:, :, 1].count(axis=1)
+    assert short < long == t.size
+    assert x[0, short:].mask.all()
+    assert (x[:, :, 1].min(axis=1) <= 0).all()
+
+
+def test_batch_rejects_bad_stop_mode():
+    v0 = launch_vector(mag=np.asarray([50.0]), incline=45)
+
+    with pytest.raises(ValueError):
+        batch_euler_method(acceleration, np.zeros_like(v0), v0, stop_mode='ground', D=0.3, rho=1.2, A=0.1, m=100)
+
+    with pytest.raises(ValueError):
+        batch_euler_method(acceleration, np.zeros_like(v0), v0, stop_mode='normal', D=0.3, rho=1.2, A=0.1, m=100)
+
+    t, x, v, a = batch_euler_method(acceleration, np.zeros_like(v0), v0, tf=1.0, dt=0.1,
+                                    stop_mode='normal', D=0.3, rho=1.2, A=0.1, m=100)
+    assert t[-1] > 1.0
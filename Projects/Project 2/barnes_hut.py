@@ -0,0 +1,214 @@
+''' Barnes-Hut Gravity
+
+    Direct summation costs O(N**2) per step. Barnes and Hut (1986) group
+    distant bodies into the cells of a quadtree (2D) or octree (3D) and
+    treat each far-enough cell as a single body at its center of mass. A
+    cell of width s at distance r is "far enough" when
+
+                        s / r < theta
+
+    which brings the cost down to O(N log N).
+
+    The tree is stored level by level rather than as linked nodes. Bodies
+    are sorted along a Morton (Z-order) curve, so every cell at every level
+    is a contiguous run of the sorted bodies, and cell masses and centers
+    of mass come from np.add.reduceat. The walk is also done level by level:
+    all (body, cell) pairs at one level are tested at once, accepted pairs
+    are summed with np.bincount, and the rest are replaced by the pairs of
+    the body with each child cell.
+'''
+
+import numpy as np
+
+def morton_codes(q, bits):
+    ''' Return Morton codes for (N, d) integer grid coordinates.
+
+        Interleaves the bits of each coordinate, most significant first,
+        so that sorting by code orders the bodies along a Z-order curve.
+
+        Args:
+            q (np.array):   (N, d) non-negative integer coordinates
+            bits (int):     bits per coordinate
+
+        Returns:
+            np.array:       (N,) np.uint64 codes
+    '''
+
+    n, d = q.shape
+    q = q.astype(np.uint64)
+    codes = np.zeros(n, dtype=np.uint64)
+
+    for b in range(bits):
+        for k in range(d):
+            bit = (q[:, k] >> np.uint64(b)) & np.uint64(1)
+            codes |= bit << np.uint64(b * d + k)
+
+    return codes
+
+def expand(rows, start, stop):
+    ''' Return (row, index) pairs for every index in [start, stop) of each row. '''
+
+    counts = stop - start
+    offsets = np.repeat(start - np.cumsum(counts) + counts, counts)
+
+    return np.repeat(rows, counts), offsets + np.arange(counts.sum())
+
+class Level:
+    ''' The cells of one level of the tree. '''
+
+    def __init__(self, codes, xs, ms, shift, width):
+
+        prefix = codes >> np.uint64(shift)
+        n = codes.size
+
+        self.start = np.concatenate([[0], np.flatnonzero(prefix[1:] != prefix[:-1]) + 1])
+        self.count = np.diff(np.append(self.start, n))
+        self.width = width
+
+        self.mass = np.add.reduceat(ms, self.start)
+
+        # Center of mass, or the centroid for cells of massless bodies.
+        moment = np.add.reduceat(ms[:, np.newaxis] * xs, self.start, axis=0)
+        centroid = np.add.reduceat(xs, self.start, axis=0) / self.count[:, np.newaxis]
+
+        massive = self.mass > 0
+        self.com = centroid
+        self.com[massive] = moment[massive] / self.mass[massive, np.newaxis]
+
+        self.child_start = None
+        self.child_stop = None
+
+class BarnesHut:
+    ''' Barnes-Hut gravitational acceleration solver.
+
+        Called like gravitational_accelerations, so it can be passed as the
+        solver of a Universe. The tree is rebuilt on every call, starting
+        from the previous call's body ordering: bodies move little between
+        steps, so the sort is over nearly-sorted keys.
+
+        Args:
+            theta (float):  opening angle; 0 reproduces the direct sum, 0.5
+                                is a common trade-off of speed and accuracy
+            batch (int):    bodies walked at a time, which bounds memory
+
+        Examples:
+            Simulate 100,000 bodies.
+                >>> universe = Universe(x0, v0, m, solver=BarnesHut(theta=0.5))
+                >>> t, x, v, a = universe.run(dt=0.01, steps=100)
+    '''
+
+    def __init__(self, theta=0.5, batch=4096):
+
+        self.theta = theta
+        self.batch = batch
+
+        self.order = None
+
+    def build(self, x, m):
+        ''' Return the levels of the tree for positions x and masses m. '''
+
+        n, d = x.shape
+        bits = 63 // d
+
+        # Bounding cube of all bodies, quantized to a 2**bits grid.
+        lower = x.min(axis=0)
+        width = (x.max(axis=0) - lower).max() or 1.0
+        width *= 1 + 1e-12
+
+        q = np.minimum((x - lower) / width * 2**bits, 2**bits - 1)
+        codes = morton_codes(q, bits)
+
+        if self.order is not None and self.order.size == n:
+            order = self.order[np.argsort(codes[self.order], kind='stable')]
+        else:
+            order = np.argsort(codes, kind='stable')
+
+        self.order = order
+
+        codes = codes[order]
+        xs = x[order]
+        ms = m[order]
+
+        # Add levels until every cell holds a single body.
+        levels = []
+        for depth in range(bits + 1):
+            level = Level(codes, xs, ms, shift=d * (bits - depth), width=width / 2**depth)
+            levels.append(level)
+
+            if level.count.max() == 1:
+                break
+
+        for parent, child in zip(levels[:-1], levels[1:]):
+            parent.child_start = np.searchsorted(child.start, parent.start)
+            parent.child_stop = np.searchsorted(child.start, parent.start + parent.count)
+
+        return levels, order, xs, ms
+
+    def __call__(self, x, m, G=6.67408e-11, softening=0.0):
+        ''' Return the (N, d) accelerations of bodies at x with masses m. '''
+
+        x = np.asarray(x, dtype=np.float64)
+        m = np.asarray(m, dtype=np.float64)
+
+        levels, order, xs, ms = self.build(x, m)
+
+        n, d = x.shape
+        a = np.empty_like(x)
+
+        for start in range(0, n, self.batch):
+            stop = min(start + self.batch, n)
+            a[order[start:stop]] = self.walk(levels, xs, ms, start, stop, G, softening**2)
+
+        return a
+
+    def walk(self, levels, xs, ms, start, stop, G, eps2):
+        ''' Return accelerations of the sorted bodies start to stop. '''
+
+        size = stop - start
+        a = np.zeros((size, xs.shape[1]))
+
+        def add(body, dx, mass, r2):
+            w = G * mass * (r2 + eps2) ** -1.5
+
+            for k in range(xs.shape[1]):
+                a[:, k] += np.bincount(body - start, weights=w * dx[:, k], minlength=size)
+
+        # Every body starts paired with the root cell.
+        body = np.arange(start, stop)
+        cell = np.zeros(size, dtype=np.intp)
+
+        for depth, level in enumerate(levels):
+            if body.size == 0:
+                break
+
+            first = level.start[cell]
+            count = level.count[cell]
+
+            dx = level.com[cell] - xs[body]
+            r2 = np.einsum('ij,ij->i', dx, dx)
+
+            contains = (first <= body) & (body < first + count)
+            deepest = depth == len(levels) - 1
+            leaf = (count == 1) | deepest
+            far = level.width**2 < self.theta**2 * r2
+
+            accept = ~contains & (far | leaf)
+            add(body[accept], dx[accept], level.mass[cell[accept]], r2[accept])
+
+            if deepest:
+                # Bodies at the same grid point as others: sum them directly.
+                shared = contains & (count > 1)
+                pair, other = expand(body[shared], first[shared], first[shared] + count[shared])
+                pair, other = pair[pair != other], other[pair != other]
+
+                dx = xs[other] - xs[pair]
+                add(pair, dx, ms[other], np.einsum('ij,ij->i', dx, dx))
+                break
+
+            # Open the near cells; a leaf containing the body is itself.
+            near = ~accept & (count > 1)
+            body, cell = expand(body[near],
+                                level.child_start[cell[near]],
+                                level.child_stop[cell[near]])
+
+        return a
@@ -0,0 +1,841 @@
+import numpy as np
+
+from me273 import instrumentation
+from me273.events import Event, EventMonitor
+from me273.recording import Recorder
+from me273.statistics import RunningStats
+from me273.symplectic_method import FSAL, get_step
+
+def acceleration(m, *forces):
+    ''' Return acceleration given a list of forces and mass. '''
+
+    F_net = sum(forces)
+    return F_net / m
+
+def F_g(m, y, R=6.371e6, M=5.972e24, G=6.67408e-11):
+    ''' Return gaviational force given mass and elevation '''
+
+    return -(m * M * G) / (y + R)**2
+
+def rocket_step(x, v, dt, mass, thrust=0.0, exhaust_velocity=0.0):
+    ''' Return x and v after dt seconds of constant thrust, in closed form.
+
+        The thrust is integrated exactly with the rocket equation,
+
+            dv = v_e * ln(m0 / m1)
+            dx = v_e * (dt - (m1 / mdot) * ln(m0 / m1))
+
+        and gravity, which varies with altitude, is fitted by a quadratic in
+        time through its values at the start, middle and end of the step
+        (found by predictor-corrector iteration). A step may then span many
+        seconds of a burn or coast. Every argument may be an array, to step
+        many rockets at once.
+
+        Args:
+            x (float):                  altitude (m)
+            v (float):                  velocity (m/s)
+            dt (float):                 time step (s)
+            mass (float):               mass at the start of the step (kg)
+            thrust (float):             thrust, 0 to coast (N)
+            exhaust_velocity (float):   exhaust velocity (m/s)
+
+        Returns:
+            float:  altitude (m)
+            float:  velocity (m/s)
+    '''
+
+    burning = np.asarray(thrust) > 0
+    rate = np.where(burning, thrust / np.where(burning, exhaust_velocity, 1.0), 1.0)
+
+    def boost(s):
+        ''' Return the displacement and velocity thrust adds in s. '''
+
+        m1 = np.where(burning, mass - rate * s, mass)
+        ratio = np.log(mass / m1)
+
+        return (np.where(burning, exhaust_velocity * (s - (m1 / rate) * ratio), 0.0),
+                exhaust_velocity * ratio)
+
+    boost_half, _ = boost(0.5 * dt)
+    boost_x, boost_v = boost(dt)
+
+    # Gravity at the start, middle and end of the step, starting from a
+    # constant-gravity guess.
+    g0 = gm = g1 = F_g(m=1.0, y=x)
+    for _ in range(3):
+        x_mid = x + 0.5 * v * dt + boost_half + dt**2 * (7 * g0 + 6 * gm - g1) / 96
+        x_end = x + v * dt + boost_x + dt**2 * (g0 + 2 * gm) / 6
+
+        gm = F_g(m=1.0, y=x_mid)
+        g1 = F_g(m=1.0, y=x_end)
+
+    return x_end, v + boost_v + dt * (g0 + 4 * gm + g1) / 6
+
+class Stage:
+    ''' Class for handling stage calculations. '''
+
+    def __init__(self, name=None, empty_mass=0, fuel_mass=0, thrust=0, exhaust_velocity=0):
+
+        self.name = name
+
+        self.thrust = thrust
+        self.exhaust_velocity = exhaust_velocity
+
+        self.fuel_mass = fuel_mass
+        self.empty_mass = empty_mass
+
+    def burn(self, dt):
+        ''' Burn stage for dt seconds, return impulse. '''
+
+        if not self.fuel_empty:
+            self.fuel_mass -= self.mass_flow * dt
+
+    @property
+    def fuel_empty(self):
+        ''' Return true if out of fuel. '''
+
+        return not self.fuel_mass > 0
+
+    @property
+    def mass(self):
+        ''' Return combined fuel/empty mass. '''
+
+        return self.fuel_mass + self.empty_mass
+
+    @property
+    def mass_flow(self):
+        ''' Return the rate fuel is burned (kg/s). '''
+
+        return self.thrust / self.exhaust_velocity
+
+    @property
+    def burn_time(self):
+        ''' Return the time until the fuel is depleted (s). '''
+
+        if self.fuel_empty:
+            return 0.0
+
+        return self.fuel_mass / self.mass_flow
+
+class Rocket:
+
+    def __init__(self, stages, stage_delay=3.5):
+
+        self.stages = stages
+        self.stage_delay = stage_delay
+
+    @property
+    def mass(self):
+        ''' Return sum of remaining mass from all stages. '''
+
+        return sum(s.mass for s in self.stages)
+
+    def add_stage(self, stage):
+        self.stages.append(stage)
+
+    def advance(self, x, v, dt, stage=None, analytic=False):
+        ''' Return x, v, and a after dt seconds, burning stage if given.
+
+            The returned a is the acceleration at the start of the step. By
+            default this is one Euler step. With analytic, the step is taken
+            in closed form by rocket_step, accurate over many seconds.
+
+            Args:
+                x (float):          altitude (m)
+                v (float):          velocity (m/s)
+                dt (float):         time step (s)
+                stage (Stage):      stage to burn, or None to coast
+                analytic (bool):    use the closed-form step
+
+            Returns:
+                float:  altitude (m)
+                float:  velocity (m/s)
+                float:  acceleration (m/s**2)
+        '''
+
+        thrust = stage.thrust if stage is not None else 0.0
+        m0 = self.mass
+
+        a = acceleration(m0, thrust, F_g(m=m0, y=x))
+        instrumentation.count('acceleration')
+
+        if not analytic:
+            x, v = x + v * dt, v + a * dt
+
+        else:
+            exhaust_velocity = stage.exhaust_velocity if stage is not None else 0.0
+            x, v = (float(z) for z in rocket_step(x, v, dt, m0, thrust, exhaust_velocity))
+
+        if stage is not None:
+            stage.burn(dt)
+
+        return x, v, a
+
+    def launch(self, dt, verbose=False, analytic=False):
+        ''' Return t, x, v, a, and m lists for a vertical launch.
+
+            Burns each stage in order until its fuel is depleted, coasting
+            for 3 seconds between stages. Once the payload is reached the
+            rocket coasts to apogee. Burnout, the end of each coast and
+            apogee are all located exactly: the step that would cross one is
+            shortened to end on it, so results do not depend on how dt
+            divides the burn times.
+
+            Args:
+                dt (float):         time step (s)
+                verbose (bool):     print staging messages
+                analytic (bool):    integrate each step in closed form (see
+                                        advance), accurate at large dt
+
+            Returns:
+                float (list): times (s)
+                float (list): altitudes (m)
+                float (list): velocities (m/s)
+                float (list): accelerations (m/s**2)
+                float (list): rocket masses (kg)
+        '''
+
+        t = 0
+        x = 0
+        v = 0
+        a = 0
+        m = self.mass
+
+        t_list = [t]
+        x_list = [x]
+        v_list = [v]
+        a_list = [a]
+        m_list = [m]
+
+        evaluate = instrumentation.counted(acceleration, 'acceleration')
+
+        def record(t, x, v, a):
+            t_list.append(t)
+            x_list.append(x)
+            v_list.append(v)
+            a_list.append(a)
+            m_list.append(self.mass)
+
+        def phase(t, x, v, end, stage=None):
+            ''' Step from t to exactly end, return the final t, x, and v. '''
+
+            while t < end:
+                last = dt >= end - t
+                h = end - t if last else dt
+
+                x, v, a = self.advance(x, v, h, stage=stage, analytic=analytic)
+                t = end if last else t + h
+
+                if last and stage is not None:
+                    stage.fuel_mass = 0.0
+
+                record(t, x, v, a)
+
+            return t, x, v
+
+        for stage in self.stages:
+
+            if verbose: print('Firing %s. t=%.0f, x=%.0f' % (stage.name, t, x))
+
+            # Burn the stage until the stages fuel is depleted.
+            with instrumentation.phase('burn'):
+                t, x, v = phase(t, x, v, t + stage.burn_time, stage=stage)
+
+            if verbose: print('%s burn complete. t=%.0f, x=%.0f' % (stage.name, t, x))
+
+            # If the stage is not the payload, coast for 3 seconds.
+            if stage.name != 'Payload':
+                with instrumentation.phase('coast'):
+                    t, x, v = phase(t, x, v, t + 3)
+
+            # If the stage is the payload, coast until v==0
+            elif stage.name == 'Payload':
+                if verbose: print('Payload in free-fall.')
+
+                apogee = Event(lambda t, x, v: v, direction=-1, terminal=True)
+                monitor = EventMonitor([apogee], t, x, v)
+
+                with instrumentation.phase('coast'):
+                    while v > 0:
+                        t_old, x_old, v_old = t, x, v
+
+                        x, v, a = self.advance(x, v, dt, analytic=analytic)
+                        t += dt
+
+                        # Place the final sample at the apogee itself.
+                        a_new = evaluate(self.mass, F_g(m=self.mass, y=x))
+                        terminal = monitor.step(t_old, x_old, v_old, a, t, x, v, a_new)
+                        if terminal:
+                            t, x, v = (float(value) for value in terminal)
+                            a = evaluate(self.mass, F_g(m=self.mass, y=x))
+
+                        record(t, x, v, a)
+
+                        if terminal:
+                            break
+
+                if verbose: print('Payload stopped. x=%.0f' % x)
+
+        instrumentation.count('steps', len(t_list) - 1)
+
+        return t_list, x_list, v_list, a_list, m_list
+
+def coast_apogee(x, v, R=6.371e6, M=5.972e24, G=6.67408e-11):
+    ''' Return the apogee and time to reach it for a rising, unpowered body.
+
+        Coasting straight up under inverse-square gravity is a degenerate
+        (radial) Kepler orbit. With r = R + x, the specific energy gives the
+        semi-major axis and the apogee,
+
+            a = -GM / (2 * (v**2 / 2 - GM / r)),        r_apogee = 2a
+
+        and the time follows from r = a(1 - cos(n)), t = sqrt(a**3/GM)(n - sin(n)),
+        with the apogee at n = pi. Bodies at or above escape velocity never
+        reach an apogee and return inf.
+
+        Args:
+            x (float):  altitude (m)
+            v (float):  upwards velocity (m/s)
+
+        Returns:
+            float:  apogee altitude (m)
+            float:  time from now to apogee (s)
+    '''
+
+    mu = G * M
+    r = R + np.asarray(x, dtype=np.float64)
+
+    energy = 0.5 * np.square(v) - mu / r
+    bound = energy < 0
+
+    a = np.where(bound, -mu / (2 * np.where(bound, energy, -1.0)), np.inf)
+    n = np.arccos(np.clip(1 - r / a, -1, 1))
+
+    apogee = np.where(bound, 2 * a - R, np.inf)
+    time = np.where(bound, np.sqrt(a**3 / mu) * (np.pi - n + np.sin(n)), np.inf)
+
+    return apogee, time
+
+def launch_ensemble(thrust, exhaust_velocity, fuel_mass, empty_mass, payload_mass,
+                    stage_delay=3.0, dt=1.0, batch=4096, keep=True):
+    ''' Return apogees, apogee times, burnout times, and summary statistics
+        for an ensemble of vertical launches.
+
+        Every rocket flies the sequence of Rocket.launch: each stage burns
+        until its fuel is depleted and then coasts for stage_delay seconds;
+        the payload then coasts to apogee. All rockets in a batch are stepped
+        together with rocket_step, each on its own clock, with every step
+        that would cross burnout or the end of a coast shortened to land on
+        it. The final coast is solved exactly by coast_apogee.
+
+        No trajectories are stored. Results are summarized a batch at a time
+        into RunningStats (see me273.statistics), so with keep=False memory
+        does not grow with the size of the ensemble.
+
+        Args:
+            thrust (np.array):            (N, S) or (S,) stage thrusts (N)
+            exhaust_velocity (np.array):  (N, S) or (S,) exhaust velocities (m/s)
+            fuel_mass (np.array):         (N, S) or (S,) fuel masses (kg)
+            empty_mass (np.array):        (N, S) or (S,) empty stage masses (kg)
+            payload_mass (np.array):      (N,) or scalar payload mass (kg)
+            stage_delay (np.array):       (N,) or scalar coast after each stage (s)
+            dt (float):                   time step (s)
+            batch (int):                  rockets stepped together
+            keep (bool):                  return the per-rocket results (else
+                                              only the statistics)
+
+        Returns:
+            np.array:   (N,) apogees (m), or None if not keep
+            np.array:   (N,) apogee times (s), or None if not keep
+            np.array:   (N, S) burnout time of each stage (s), or None if not keep
+            dict:       RunningStats for 'apogee', 'apogee_time' and 'burnout'
+
+        Examples:
+            Saturn V with 1% dispersion in thrust.
+                >>> rng = np.random.default_rng(273)
+                >>> thrust = [34e6, 5e6, 1e6] * rng.normal(1, 0.01, (10000, 3))
+                >>> apogee, apogee_time, burnout, stats = launch_ensemble(
+                ...     thrust, [2580, 4130, 4130], [2169e3, 444e3, 108e3],
+                ...     [131e3, 36e3, 11e3], payload_mass=52e3)
+                >>> stats['apogee'].mean, stats['apogee'].std
+    '''
+
+    stage_params = [np.asarray(p, dtype=np.float64) for p in
+                    (thrust, exhaust_velocity, fuel_mass, empty_mass)]
+    payload_mass = np.asarray(payload_mass, dtype=np.float64)
+    stage_delay = np.asarray(stage_delay, dtype=np.float64)
+
+    rockets = np.broadcast_shapes(*(p.shape[:-1] for p in stage_params),
+                                  payload_mass.shape, stage_delay.shape)
+    count = rockets[0] if rockets else 1
+    stages = np.broadcast_shapes(*(p.shape[-1:] for p in stage_params))[0]
+
+    stage_params = [np.broadcast_to(p, (count, stages)) for p in stage_params]
+    payload_mass = np.broadcast_to(payload_mass, (count,))
+    stage_delay = np.broadcast_to(stage_delay, (count,))
+
+    stats = {'apogee': RunningStats(),
+             'apogee_time': RunningStats(),
+             'burnout': RunningStats()}
+    results = []
+
+    for start in range(0, count, batch):
+        rows = slice(start, start + batch)
+        result = _launch_batch(*(p[rows] for p in stage_params),
+                               payload_mass[rows], stage_delay[rows], dt)
+
+        for key, value in zip(['apogee', 'apogee_time', 'burnout'], result):
+            stats[key].update(value)
+
+        if keep:
+            results.append(result)
+
+    if not keep:
+        return None, None, None, stats
+
+    apogee, apogee_time, burnout = (np.concatenate(r) for r in zip(*results))
+
+    return apogee, apogee_time, burnout, stats
+
+def _launch_batch(thrust, exhaust_velocity, fuel_mass, empty_mass, payload_mass, stage_delay, dt):
+    ''' Return apogees, apogee times, and burnout times for one batch. '''
+
+    n, stages = thrust.shape
+
+    t = np.zeros(n)
+    x = np.zeros(n)
+    v = np.zeros(n)
+    x_max = np.zeros(n)
+    t_max = np.zeros(n)
+
+    firing = thrust > 0
+    mass_flow = np.divide(thrust, exhaust_velocity, out=np.zeros_like(thrust), where=firing)
+    burn_time = np.divide(fuel_mass, mass_flow, out=np.zeros_like(thrust), where=firing)
+
+    fuel = np.array(fuel_mass)
+    dry = empty_mass.sum(axis=1) + payload_mass
+    burnout = np.empty((n, stages))
+
+    # Phase 2k burns stage k, phase 2k + 1 is the coast after it.
+    phase = np.zeros(n, dtype=np.intp)
+    end = burn_time[:, 0].copy()
+
+    while True:
+        active = np.flatnonzero(phase < 2 * stages)
+        if active.size == 0:
+            break
+
+        k = phase[active] // 2
+        burning = phase[active] % 2 == 0
+
+        remaining = end[active] - t[active]
+        last = dt >= remaining
+        h = np.where(last, remaining, dt)
+
+        F = np.where(burning, thrust[active, k], 0.0)
+        mass = dry[active] + fuel[active].sum(axis=1)
+
+        x[active], v[active] = rocket_step(x[active], v[active], h, mass,
+                                           F, exhaust_velocity[active, k])
+        fuel[active, k] -= np.where(burning, mass_flow[active, k], 0.0) * h
+        t[active] = np.where(last, end[active], t[active] + h)
+
+        higher = active[x[active] > x_max[active]]
+        x_max[higher] = x[higher]
+        t_max[higher] = t[higher]
+
+        # Move the rockets whose phase just ended on to the next one.
+        done, k, burning = active[last], k[last], burning[last]
+
+        fuel[done[burning], k[burning]] = 0.0
+        burnout[done[burning], k[burning]] = t[done[burning]]
+
+        phase[done] += 1
+        coast = phase[done] % 2 == 1
+        following = np.minimum(phase[done] // 2, stages - 1)
+
+        end[done] = t[done] + np.where(coast, stage_delay[done], burn_time[done, following])
+
+    apogee, time = coast_apogee(x, np.maximum(v, 0.0))
+    rising = v > 0
+
+    return (np.where(rising, apogee, x_max),
+            np.where(rising, t + time, t_max),
+            burnout)
+
+def dist(x):
+    ''' Return the distance of point x from the origin <0, 0, .., 0>.
+
+        Uses the linear algebra concept of a norm to calculate
+        Euclidean distance.
+
+        Examples:
+            Given two vectors A = <0,3,8> and B = <0,3,9>
+                >>> A = np.asarray([0,3,8])
+                >>> B = np.asarray([0,3,9])
+
+            Find the length of A.
+                >>> dist(A)
+
+            Find the distance between A and B.
+                >>> dist(A - B)
+
+            Given a list of vectors C = [<1,1,1>, <2,3,5>, <8,3,7>].
+                >>> C = np.asarray([[1,1,1], [2,3,5], [8,3,7]])
+
+            Find the distances from the origin, O.
+                >>> dist(C)
+
+            Find the distances from point B.
+                >>> dist(C - B)
+
+        Args:
+            x (np.array):   point or list of points.
+
+        Returns:
+            np.array: scalar distance or list of scalar distances.
+    '''
+
+    return np.linalg.norm(x, axis=(x.ndim - 1))
+
+def unit_vector(A, B):
+    ''' Return unit vector form position A to position B.
+
+        Uses:
+
+                        (A - B) / ||A - B||
+
+        Args:
+
+            A (np.array):    origin vector
+            B (np.array):    destination vector
+
+        Returns:
+
+            np.array:        unit vector from origin to destination.
+
+        Examples:
+
+            Given two vectors A and B.
+                >>> A = np.asarray([0, 0])
+                >>> B = np.asarray([1, 1])
+
+            Find the unit vector from A to B.
+                >>> unit_vector(A, B)
+                array([0.70710678, 0.70710678])
+    '''
+
+    return (B - A) / dist(B - A)
+
+class Body:
+    ''' A class to hold the represetation of and orbital body.
+
+        Each step is kept in t_list, x_list, v_list and a_list, or, given a
+        recorder (a Recorder, or a TrajectoryWriter for long runs), sent to
+        it instead and not kept.
+
+        Bodies step one at a time, each seeing the others where they are
+        now, so acceleration() sums over the other bodies directly: a
+        Barnes-Hut tree would be out of date after every body's step, and
+        rebuilding it per body costs more than the direct sum. For large N
+        use a Universe, which steps all bodies together and accepts a
+        solver such as barnes_hut.BarnesHut.
+    '''
+
+    # A class atribute to store all bodies in the universe.
+    all_bodies = []
+
+    def __init__(self, x0, v0, m, recorder=None):
+        ''' Initialize an orbital body. '''
+
+        self.t = 0.0
+        self.x = x0
+        self.v = v0
+        self.m = m
+        self.a = 0.0
+
+        self.recorder = recorder
+
+        if recorder is None:
+            self.t_list = [self.t]
+            self.x_list = [self.x]
+            self.v_list = [self.v]
+            self.a_list = [self.a]
+        else:
+            recorder.record(self.t, self.x, self.v, np.zeros_like(self.x))
+
+        # Add body to universe.
+        Body.all_bodies.append(self)
+
+    def step(self, dt, modified=True, method=None):
+        ''' Step the simulation forward one time-step, dt.
+
+            Args:
+                dt (float):         time step (s)
+                modified (bool):    turns on modified euler method.
+                method (str):       'euler', 'modified', 'verlet', 'leapfrog'
+                                        or 'yoshida4' (overrides modified, see
+                                        me273.symplectic_method)
+        '''
+
+        if method is None:
+            method = 'modified' if modified else 'euler'
+
+        step = get_step(method)
+        evaluate = instrumentation.counted(self.acceleration, 'acceleration')
+
+        # The other bodies have moved since this body's last step, so methods
+        # that start from a(x) need it afresh; the others evaluate their own.
+        a = evaluate() if method in FSAL else None
+
+        self.x, self.v, self.a = step(lambda x, v: evaluate(x=x),
+                                      self.x, self.v, a, dt)
+        instrumentation.count('steps')
+
+        self.t += dt
+
+        if self.recorder is None:
+            self.t_list.append(self.t)
+            self.x_list.append(self.x)
+            self.v_list.append(self.v)
+            self.a_list.append(self.a)
+        else:
+            self.recorder.record(self.t, self.x, self.v, self.a)
+
+    def acceleration(self, G=6.67408e-11, x=None):
+        ''' Return acceleartion vector given x, v, and other bodies.
+
+            Args:
+                bodies (list):  list of other interacting body objects.
+                G (float):      gravitational constant (N*m*m/(kg *kg))
+                x (ndarray):    position to evaluate at (default is self.x)
+
+            Returns:
+                ndarray:        acceleration vector
+        '''
+
+        if x is None:
+            x = self.x
+
+        F_net = np.zeros_like(x)
+        for body in [b for b in Body.all_bodies if b != self]:
+            # Determine Euclidian distance between two bodies.
+            r = dist(x - body.x)
+
+            # Determine the magnitude of the gravitational force.
+            F = G * (self.m * body.m / np.power(r, 2)) * unit_vector(x, body.x)
+
+            # Sum the forces
+            F_net = F_net + F
+
+        return F_net / self.m
+
+    @classmethod
+    def big_bang(cls):
+        ''' Clear all the bodies from the universe. '''
+
+        Body.all_bodies = []
+
+def gravitational_accelerations(x, m, G=6.67408e-11, softening=0.0, block=256):
+    ''' Return the acceleration of every body due to all the others.
+
+        Each pair is visited once and its force applied to both bodies
+        (Newton's third law), so the work is N(N-1)/2 interactions. Rows
+        are processed block bodies at a time so that the temporaries are
+        (block, N, d) rather than (N, N, d).
+
+        Uses:
+
+                a_i = sum_j G * m_j * (x_j - x_i) / (|x_j - x_i|**2 + eps**2)**1.5
+
+        Args:
+            x (np.array):       (N, d) positions (m)
+            m (np.array):       (N,) masses (kg)
+            G (float):          gravitational constant (N*m*m/(kg *kg))
+            softening (float):  softening length, eps, to tame close
+                                    encounters (m)
+            block (int):        bodies per block (None for all at once)
+
+        Returns:
+            np.array:           (N, d) accelerations (m/s**2)
+    '''
+
+    x = np.asarray(x, dtype=np.float64)
+    m = np.asarray(m, dtype=np.float64)
+
+    n = m.size
+    a = np.zeros_like(x)
+
+    block = n if block is None else block
+
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+
+        # Vectors from each body i in the block to every body j >= start.
+        dx = x[np.newaxis, start:] - x[start:stop, np.newaxis]
+        r2 = np.einsum('ijd,ijd->ij', dx, dx) + softening**2
+
+        # Keep only the pairs j > i; the rest were counted by earlier blocks.
+        upper = np.arange(start, n)[np.newaxis, :] > np.arange(start, stop)[:, np.newaxis]
+
+        s = np.zeros_like(r2)
+        np.power(r2, -1.5, out=s, where=upper)
+        s *= G
+
+        # Pull i towards j, and j towards i.
+        a[start:stop] += np.einsum('ij,ijd->id', s * m[np.newaxis, start:], dx, optimize=True)
+        a[start:] -= np.einsum('ij,ijd->jd', s * m[start:stop, np.newaxis], dx, optimize=True)
+
+    return a
+
+class Universe:
+    ''' A gravitating system stored as arrays rather than Body objects.
+
+        Positions and velocities are (N, d) arrays and masses an (N,) array,
+        so a step is a single call to gravitational_accelerations, or to
+        solver if one is given (e.g. barnes_hut.BarnesHut for large N). Each
+        Universe is independent; unlike Body.all_bodies, any number may be
+        simulated side by side.
+
+        Examples:
+            Build the Earth-Moon-rocket system and run it for one day.
+                >>> universe = Universe()
+                >>> earth = universe.add(x0=[0.0, 0.0], v0=[0.0, 0.0], m=5.9e24)
+                >>> moon = universe.add(x0=[0, 384.4e6], v0=[-1000.0, 0], m=7.3e22)
+                >>> t, x, v, a = universe.run(dt=7, steps=60*60*24)
+
+            Plot the moon's path.
+                >>> plt.plot(x[:, moon, 0], x[:, moon, 1])
+    '''
+
+    def __init__(self, x0=None, v0=None, m=None, G=6.67408e-11, softening=0.0, block=256,
+                 solver=None):
+
+        self.t = 0.0
+        self.G = G
+        self.softening = softening
+        self.block = block
+        self.solver = solver
+
+        # Acceleration at the positions it was computed for, so that methods
+        # ending on a(x) (see me273.symplectic_method.FSAL) reuse it.
+        self._a = (None, None)
+
+        if m is None:
+            self.x = np.empty((0, 0))
+            self.v = np.empty((0, 0))
+            self.m = np.empty(0)
+        else:
+            self.m = np.atleast_1d(np.asarray(m, dtype=np.float64))
+            self.x = np.asarray(x0, dtype=np.float64).reshape(self.m.size, -1)
+            self.v = np.asarray(v0, dtype=np.float64).reshape(self.x.shape)
+
+    @classmethod
+    def from_bodies(cls, bodies, **kwargs):
+        ''' Return a Universe holding the state of a list of Body objects. '''
+
+        return cls(x0=[b.x for b in bodies],
+                   v0=[b.v for b in bodies],
+                   m=[b.m for b in bodies], **kwargs)
+
+    def add(self, x0, v0, m):
+        ''' Add a body to the universe, return its index. '''
+
+        x0 = np.asarray(x0, dtype=np.float64)
+        v0 = np.asarray(v0, dtype=np.float64)
+
+        if self.m.size == 0:
+            self.x = x0.reshape(1, -1)
+            self.v = v0.reshape(1, -1)
+        else:
+            self.x = np.vstack([self.x, x0])
+            self.v = np.vstack([self.v, v0])
+
+        self.m = np.append(self.m, m)
+
+        return self.m.size - 1
+
+    def acceleration(self, x=None):
+        ''' Return the (N, d) accelerations of all bodies (at x if given). '''
+
+        if x is None:
+            x = self.x
+
+        if self.solver is not None:
+            return self.solver(x, self.m, G=self.G, softening=self.softening)
+
+        return gravitational_accelerations(x, self.m, G=self.G,
+                                           softening=self.softening, block=self.block)
+
+    def current_acceleration(self):
+        ''' Return the accelerations at the current positions, reusing the
+            last step's if the positions have not changed since.
+        '''
+
+        x, a = self._a
+
+        if x is not self.x:
+            a = self.acceleration()
+            instrumentation.count('acceleration')
+            self._a = (self.x, a)
+
+        return a
+
+    def step(self, dt, modified=True, method=None):
+        ''' Step every body forward one time-step, dt. Return the accelerations.
+
+            Args:
+                dt (float):         time step (s)
+                modified (bool):    turns on modified euler method.
+                method (str):       'euler', 'modified', 'verlet', 'leapfrog'
+                                        or 'yoshida4' (overrides modified, see
+                                        me273.symplectic_method)
+        '''
+
+        if method is None:
+            method = 'modified' if modified else 'euler'
+
+        step = get_step(method)
+        evaluate = instrumentation.counted(self.acceleration, 'acceleration')
+
+        a = self.current_acceleration() if method in FSAL else None
+
+        self.x, self.v, a = step(lambda x, v: evaluate(x),
+                                 self.x, self.v, a, dt)
+        instrumentation.count('steps')
+
+        if method in FSAL:
+            self._a = (self.x, a)
+
+        self.t += dt
+
+        return a
+
+    def run(self, dt, steps, modified=True, recorder=None, method=None):
+        ''' Returns t, x, v, and a arrays for a number of steps.
+
+            Args:
+                dt (float):             time step (s)
+                steps (int):            number of steps
+                modified (bool):        turns on modified euler method.
+                method (str):           stepper by name (see step)
+                recorder (Recorder):    records each step (default keeps
+                                            every step, see me273.recording)
+
+            Returns:
+                np.array:   (steps + 1,) times (s)
+                np.array:   (steps + 1, N, d) positions (m)
+                np.array:   (steps + 1, N, d) velocities (m/s)
+                np.array:   (steps + 1, N, d) accelerations (m/s**2)
+        '''
+
+        if recorder is None:
+            recorder = Recorder(steps=steps + 1)
+
+        recorder.record(self.t, self.x, self.v, self.current_acceleration())
+
+        for _ in range(steps):
+            a = self.step(dt, modified=modified, method=method)
+            recorder.record(self.t, self.x, self.v, a)
+
+        return recorder.arrays()
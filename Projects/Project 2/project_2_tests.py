@@ -0,0 +1,235 @@
+import numpy as np
+import pytest
+
+from project_2 import Body, Rocket, Stage, Universe, gravitational_accelerations
+
+
+def random_system(n, d=2, seed=273):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-1e3, 1e3, (n, d)), rng.uniform(-1, 1, (n, d)), rng.uniform(1e8, 1e10, n)
+
+
+def test_kernel_matches_body_acceleration():
+    x, v, m = random_system(12)
+
+    Body.big_bang()
+    bodies = [Body(x0=xi, v0=vi, m=mi) for xi, vi, mi in zip(x, v, m)]
+    expected = np.asarray([b.acceleration() for b in bodies])
+
+    assert gravitational_accelerations(x, m) == pytest.approx(expected, rel=1e-10)
+
+
+def test_blocked_kernel_matches_unblocked():
+    x, v, m = random_system(101, d=3)
+
+    full = gravitational_accelerations(x, m)
+
+    for block in (1, 7, 64):
+        assert gravitational_accelerations(x, m, block=block) == pytest.approx(full, rel=1e-12)
+
+
+def test_momentum_is_conserved():
+    x, v, m = random_system(30)
+    universe = Universe(x, v, m)
+
+    t, xs, vs, a = universe.run(dt=0.5, steps=200)
+
+    momentum = np.einsum('i,tid->td', m, vs)
+    assert xs.shape == (201, 30, 2)
+    assert momentum == pytest.approx(np.tile(momentum[0], (201, 1)), abs=1e-6 * np.abs(m @ v).max())
+
+
+def test_universes_are_independent():
+    one = Universe()
+    one.add(x0=[0.0, 0.0], v0=[0.0, 0.0], m=6e11)
+    one.add(x0=[10.0, 10.0], v0=[-2.0, 0.0], m=1e10)
+
+    two = Universe()
+    two.add(x0=[0.0, 0.0], v0=[0.0, 0.0], m=6e11)
+
+    one.step(0.01)
+    two.step(0.01)
+
+    assert one.m.size == 2 and two.m.size == 1
+    assert two.x == pytest.approx(np.zeros((1, 2)))
+
+
+@pytest.mark.parametrize('d', [2, 3])
+def test_barnes_hut_matches_direct_sum(d):
+    from barnes_hut import BarnesHut
+
+    x, v, m = random_system(2000, d=d)
+    direct = gravitational_accelerations(x, m)
+
+    exact = BarnesHut(theta=0.0)(x, m)
+    approx = BarnesHut(theta=0.5)(x, m)
+
+    # Error relative to the typical acceleration, as net forces near zero
+    # make a per-body relative error meaningless.
+    scale = np.median(np.linalg.norm(direct, axis=1))
+    error = np.linalg.norm(approx - direct, axis=1) / scale
+
+    assert exact == pytest.approx(direct, rel=1e-9)
+    assert np.median(error) < 2e-2
+    assert error.max() < 0.1
+
+
+def test_barnes_hut_universe_reuses_ordering():
+    from barnes_hut import BarnesHut
+
+    x, v, m = random_system(500)
+    solver = BarnesHut(theta=0.3)
+
+    tree = Universe(x, v, m, solver=solver)
+    direct = Universe(x, v, m)
+
+    tree.run(dt=1.0, steps=5)
+    direct.run(dt=1.0, steps=5)
+
+    assert solver.order is not None
+    assert tree.x == pytest.approx(direct.x, rel=1e-4)
+
+
+@pytest.mark.parametrize('method', ['verlet', 'leapfrog', 'yoshida4'])
+def test_symplectic_universe_conserves_energy(method):
+    G = 6.67408e-11
+    universe = Universe(G=G)
+    universe.add(x0=[0.0, 0.0], v0=[0.0, 0.0], m=5.972e24)
+    universe.add(x0=[0.3633e9, 0.0], v0=[0.0, 1.2 * 1.047e3], m=7.342e22)
+
+    def energy(x, v):
+        kinetic = 0.5 * np.einsum('i,tij,tij->t', universe.m, v, v)
+        potential = -G * universe.m[0] * universe.m[1] / np.linalg.norm(x[:, 1] - x[:, 0], axis=-1)
+        return kinetic + potential
+
+    t, x, v, a = universe.run(dt=3600, steps=24 * 100, method=method)
+    E = energy(x, v)
+
+    assert np.abs((E - E[0]) / E[0]).max() < 1e-4
+
+    # Leapfrog records the acceleration at the midpoint of each step.
+    if method != 'leapfrog':
+        assert a[-1] == pytest.approx(universe.acceleration(), rel=1e-12)
+
+
+def test_body_step_by_name():
+    from me273.symplectic_method import symplectic_method
+
+    G, M = 6.67408e-11, 5.972e24
+    x0, v0 = np.asarray([0.3633e9, 0.0]), np.asarray([0.0, 1.082e3])
+
+    Body.big_bang()
+    Body(np.asarray([0.0, 0.0]), np.asarray([0.0, 0.0]), M)
+    moon = Body(x0, v0, 7.342e22)
+
+    # Only the Moon steps, so the Earth stays fixed at the origin.
+    for _ in range(24):
+        moon.step(3600, method='yoshida4')
+
+    Body.big_bang()
+
+    gravity = lambda x, v: -(x * G * M) / np.power(np.linalg.norm(x), 3)
+    t, x, v, a = symplectic_method(gravity, 0, 24 * 3600, 3600, x0, v0, method='yoshida4')
+
+    assert moon.x == pytest.approx(x[-1], rel=1e-12)
+    assert moon.v == pytest.approx(v[-1], rel=1e-12)
+
+
+def test_body_streams_to_recorder(tmp_path):
+    from me273.trajectory import TrajectoryWriter, read_trajectory
+
+    x0, v0 = np.asarray([0.3633e9, 0.0]), np.asarray([0.0, 1.082e3])
+
+    Body.big_bang()
+    Body(np.asarray([0.0, 0.0]), np.asarray([0.0, 0.0]), 5.972e24)
+
+    with TrajectoryWriter(tmp_path / 'moon.npy', chunk=8) as writer:
+        moon = Body(x0, v0, 7.342e22, recorder=writer)
+        for _ in range(24):
+            moon.step(3600, method='verlet')
+
+    Body.big_bang()
+
+    trajectory = read_trajectory(tmp_path / 'moon.npy')
+
+    assert not hasattr(moon, 'x_list')
+    assert trajectory['t'] == pytest.approx(3600 * np.arange(25))
+    assert trajectory['x'][-1] == pytest.approx(moon.x, rel=1e-12)
+
+
+def saturn_v():
+    return Rocket([Stage(name='Stage I', empty_mass=131e3, fuel_mass=2300e3 - 131e3,
+                         thrust=34e6, exhaust_velocity=2580),
+                   Stage(name='Stage II', empty_mass=36e3, fuel_mass=480e3 - 36e3,
+                         thrust=5e6, exhaust_velocity=4130),
+                   Stage(name='Stage III', empty_mass=11e3, fuel_mass=119e3 - 11e3,
+                         thrust=1e6, exhaust_velocity=4130),
+                   Stage(name='Payload', empty_mass=52e3)])
+
+
+def test_staging_lands_on_burnout():
+    rocket = saturn_v()
+    burnout = rocket.stages[0].burn_time
+    fuel = rocket.stages[0].fuel_mass
+
+    t, x, v, a, m = rocket.launch(dt=7.0)
+
+    assert burnout in t
+    assert burnout + 3 in t
+    assert m[t.index(burnout)] == pytest.approx(m[0] - fuel)
+
+
+def test_launch_probe():
+    from me273.instrumentation import Probe
+
+    with Probe() as probe:
+        t, x, v, a, m = saturn_v().launch(dt=1.0)
+
+    # One evaluation per step, and another per step of the coast to apogee.
+    assert probe.counters['steps'] == len(t) - 1
+    assert probe.counters['steps'] < probe.counters['acceleration'] < 2 * probe.counters['steps']
+    assert set(probe.timers) == {'burn', 'coast'}
+
+
+def test_analytic_burn_is_independent_of_step():
+    fine = max(saturn_v().launch(dt=0.01, analytic=True)[1])
+    coarse = max(saturn_v().launch(dt=10.0, analytic=True)[1])
+
+    assert coarse == pytest.approx(fine, abs=10.0)
+    assert max(saturn_v().launch(dt=0.01)[1]) == pytest.approx(fine, rel=1e-3)
+
+
+def test_ensemble_matches_launch():
+    from project_2 import launch_ensemble
+
+    rocket = saturn_v()
+    burnout = np.cumsum([s.burn_time + 3 for s in rocket.stages[:3]]) - 3
+    t, x, v, a, m = rocket.launch(dt=0.01, analytic=True)
+
+    apogee, apogee_time, burnouts, stats = launch_ensemble(
+        [34e6, 5e6, 1e6], [2580, 4130, 4130], [2169e3, 444e3, 108e3],
+        [131e3, 36e3, 11e3], payload_mass=52e3, dt=10.0)
+
+    assert apogee[0] == pytest.approx(max(x), abs=10.0)
+    assert apogee_time[0] == pytest.approx(t[-1], abs=1e-3)
+    assert burnouts[0] == pytest.approx(burnout)
+
+
+def test_ensemble_statistics_stream():
+    from project_2 import launch_ensemble
+
+    rng = np.random.default_rng(273)
+    thrust = [34e6, 5e6, 1e6] * rng.normal(1, 0.01, (300, 3))
+    args = (thrust, [2580, 4130, 4130], [2169e3, 444e3, 108e3], [131e3, 36e3, 11e3], 52e3)
+
+    apogee, apogee_time, burnout, stats = launch_ensemble(*args, stage_delay=rng.normal(3, 0.3, 300), dt=5.0, batch=64)
+    kept = launch_ensemble(*args, stage_delay=3.0, dt=5.0, batch=1000)
+    streamed = launch_ensemble(*args, stage_delay=3.0, dt=5.0, batch=64, keep=False)
+
+    assert apogee.shape == (300,) and burnout.shape == (300, 3)
+    assert stats['apogee'].mean == pytest.approx(apogee.mean())
+    assert stats['burnout'].std == pytest.approx(burnout.std(axis=0, ddof=1))
+
+    assert streamed[0] is None
+    assert streamed[3]['apogee'].mean == pytest.approx(kept[0].mean())
+    assert streamed[3]['apogee_time'].max == kept[1].max()
@@ -0,0 +1,213 @@
+''' ME273 Benchmark Suite
+
+    Fixed workloads for the integrators, quadrature rules, root finders and
+    linear solvers of the Guided Activities, Projects and Chapter 5 method
+    implementations, each timed at a few sizes (see me273.benchmark).
+
+    Run from the repository root:
+
+        $ python benchmarks/benchmarks.py              time all, compare to baseline.json
+        $ python benchmarks/benchmarks.py 'roots.*'    only the root finders
+        $ python benchmarks/benchmarks.py --list       workloads and their sizes
+        $ python benchmarks/benchmarks.py --save       store new baselines
+
+    The exit status is 1 if any time, retaken in --rounds (default 3), is
+    slower than its baseline by more than both --threshold (default 25%) and
+    the noise measured between the rounds of the baseline. Baselines are
+    only comparable on the machine that took them; retake them with --save
+    on a new one.
+
+    Project 1's euler_method is not benchmarked: it fails on a misspelled
+    name (dimesnions) before its first step. batch_euler_method is timed
+    instead.
+'''
+
+import os
+import sys
+
+import numpy as np
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from me273.activities import load
+from me273.benchmark import Suite, main
+
+suite = Suite()
+
+# Integrators: size is the number of steps.
+
+@suite.workload(1000, 10000, 100000, name='integrators.euler_method')
+def euler_method(steps):
+    ga2 = load('harmonic_oscillator')
+
+    return lambda: ga2.euler_method(ga2.acceleration, 0, 10, 10 / steps, x0=0.1, v0=0.0,
+                                    modified=True, k=10, m=1)
+
+@suite.workload(1000, 10000, 100000, name='integrators.orbit_euler_method')
+def orbit_euler_method(steps):
+    ga3 = load('orbital_motion')
+
+    # One day of the GA3 moon orbit.
+    x0, v0 = np.asarray([3.84e8, 0.0]), np.asarray([0.0, 1.022e3])
+
+    return lambda: ga3.euler_method(ga3.gravitational_acceleration, 0, 86400, 86400 / steps,
+                                    x0=x0, v0=v0, modified=True, m=7.35e22)
+
+@suite.workload(1000, 10000, 100000, name='integrators.euler_projectile')
+def euler_projectile(steps):
+    ga1 = load('falling_objects')
+
+    # The GA1 bowling ball dropped from 440 m, which takes about 10 s.
+    return lambda: ga1.euler_projectile(mass=7.26, area=0.0366, x0=440, dt=10 / steps)
+
+@suite.workload(10, 100, 1000, name='integrators.batch_euler_method')
+def batch_euler_method(trajectories):
+    project_1 = load('project_1')
+
+    v0 = project_1.launch_vector(mag=np.linspace(100, 750, trajectories), incline=45)
+    x0 = np.zeros_like(v0)
+
+    return lambda: project_1.batch_euler_method(project_1.acceleration, x0, v0, dt=0.1,
+                                                D=0.3, rho=1.2, A=0.1, m=1225)
+
+@suite.workload(1000, 10000, 100000, name='integrators.runga_kutta')
+def runga_kutta(steps):
+    rk = load('runga_kutta')
+
+    return lambda: rk.runga_kutta(lambda x, y: -y, 1.0, 0.0, 10.0, 10 / steps)
+
+@suite.workload(10, 30, 100, name='integrators.Body')
+def body(bodies):
+    project_2 = load('project_2')
+
+    rng = np.random.default_rng(273)
+    x0 = rng.uniform(-1e3, 1e3, (bodies, 2))
+    v0 = rng.uniform(-1, 1, (bodies, 2))
+    m = rng.uniform(1e8, 1e10, bodies)
+
+    def run():
+        project_2.Body.big_bang()
+        universe = [project_2.Body(x0=x, v0=v, m=mi) for x, v, mi in zip(x0, v0, m)]
+
+        for _ in range(10):
+            for b in universe:
+                b.step(1.0)
+
+    return run
+
+@suite.workload(1, 10, 100, name='integrators.Rocket.launch')
+def rocket_launch(steps_per_second):
+    project_2 = load('project_2')
+    Rocket, Stage = project_2.Rocket, project_2.Stage
+
+    # The Saturn V of the Project 2 tests; launch burns its fuel, so it is
+    # rebuilt on every call.
+    def run():
+        rocket = Rocket([Stage(name='Stage I', empty_mass=131e3, fuel_mass=2300e3 - 131e3,
+                               thrust=34e6, exhaust_velocity=2580),
+                         Stage(name='Stage II', empty_mass=36e3, fuel_mass=480e3 - 36e3,
+                               thrust=5e6, exhaust_velocity=4130),
+                         Stage(name='Stage III', empty_mass=11e3, fuel_mass=119e3 - 11e3,
+                               thrust=1e6, exhaust_velocity=4130),
+                         Stage(name='Payload', empty_mass=52e3)])
+
+        return rocket.launch(1 / steps_per_second)
+
+    return run
+
+# Quadrature: size is the number of intervals.
+
+def quadrature(method):
+    def setup(intervals):
+        ga4 = load('numerical_integration')
+        return lambda: ga4.integrate(np.sin, 0, 10, step=10 / intervals, method=method)
+
+    return setup
+
+for method in ['left', 'right', 'trap', 'simp']:
+    suite.workload(1000, 100000, 1000000, name='quadrature.integrate.' + method)(quadrature(method))
+
+@suite.workload(1, name='quadrature.integrate.adaptive')
+def adaptive(_):
+    ga4 = load('numerical_integration')
+
+    return lambda: ga4.integrate(lambda x: np.sin(x) * np.exp(-x / 5), 0, 100, method='adaptive')
+
+# Root finders: size is the number of problems, each the GA5 parachutist's
+# drag coefficient for a different mass.
+
+def parachutist(problems):
+    m = np.linspace(60, 100, problems)
+    func = lambda c, m: m * 9.81 / c * (1 - np.exp(-c * 4 / m)) - 36
+
+    return m, func
+
+@suite.workload(1, 100, 10000, name='roots.bisect')
+def bisect(problems):
+    bracketing = load('bracketing_method')
+    m, func = parachutist(problems)
+
+    return lambda: bracketing.bisect(func, 1e-3, 10, et=1e-8, args=(m,))
+
+@suite.workload(1, 100, 10000, name='roots.false_position')
+def false_position(problems):
+    bracketing = load('bracketing_method')
+    m, func = parachutist(problems)
+
+    return lambda: bracketing.false_position(func, 1e-3, 10, et=1e-8, args=(m,))
+
+@suite.workload(1, 100, 1000, name='roots.secant')
+def secant(problems):
+    open_method = load('open_method')
+    m, func = parachutist(problems)
+
+    # Scalar only: one problem after another.
+    return lambda: [open_method.secant(lambda c: func(c, mi), 1.0, et=1e-8) for mi in m]
+
+@suite.workload(1, 100, 1000, name='roots.newton_raphson')
+def newton_raphson(problems):
+    ga5 = load('root_finding')
+    m, func = parachutist(problems)
+    prime = lambda c, m: 9.81 * (4 / c * np.exp(-c * 4 / m) - m / c**2 * (1 - np.exp(-c * 4 / m)))
+
+    return lambda: [ga5.newton_raphson(lambda c: func(c, mi), lambda c: prime(c, mi), 1.0, e_req=1e-8)
+                    for mi in m]
+
+# Linear solvers: size is the number of unknowns.
+
+def system(n, seed=273):
+    rng = np.random.default_rng(seed)
+    # Diagonally dominant, and scaled so that Cramer's determinants stay finite.
+    return rng.uniform(-1, 1, (n, n)) + n * np.eye(n), rng.uniform(-1, 1, (n, 1))
+
+@suite.workload(3, 30, 100, name='linear.cramer')
+def cramer(n):
+    ga6 = load('matrix_methods')
+    A, b = system(n)
+
+    return lambda: ga6.cramer(A, b)
+
+@suite.workload(3, 100, 1000, name='linear.inverse_solve')
+def inverse_solve(n):
+    ga6 = load('matrix_methods')
+    A, b = system(n)
+
+    return lambda: ga6.inverse_solve(A, b)
+
+@suite.workload(3, 100, 1000, name='linear.np.linalg.solve')
+def linalg_solve(n):
+    A, b = system(n)
+
+    return lambda: np.linalg.solve(A, b)
+
+@suite.workload(3, 100, 1000, name='linear.factor_solve')
+def factor_solve(n):
+    ga6 = load('matrix_methods')
+    A, b = system(n)
+
+    return lambda: ga6.factor_solve(A, b)
+
+if __name__ == '__main__':
+    sys.exit(main(suite, BASELINE))
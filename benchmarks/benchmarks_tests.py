@@ -0,0 +1,15 @@
+from benchmarks import BASELINE, suite
+
+from me273.benchmark import load
+
+
+def test_every_workload_runs():
+    for name, (setup, sizes) in suite.workloads.items():
+        setup(min(sizes))()
+
+
+def test_baseline_covers_every_workload():
+    baseline = load(BASELINE)
+
+    for name, (setup, sizes) in suite.workloads.items():
+        assert sorted(baseline[name]) == sorted(sizes), name
@@ -0,0 +1,27 @@
+''' ME273 - shared numerical methods.
+
+    Methods used across the Guided Activities and Projects that are general
+    enough to live outside any one assignment.
+
+    Modules:
+
+        activities:         the activity and project modules, imported by name
+        adaptive_method:    embedded Runge-Kutta integration with error control
+        banded:             banded (e.g. tridiagonal) matrix storage and solves
+        benchmark:          timed, sized workloads compared against baselines
+        cache:              on-disk memoization of simulation results
+        cumulative:         running integrals of sampled data, over many intervals
+        convergence:        step-size selection by Richardson extrapolation
+        events:             event location and dense output for any stepper
+        factorization:      factor a matrix once, solve it against many vectors
+        instrumentation:    opt-in evaluation counters and phase timers
+        linear_method:      exact propagation of linear (spring-mass) systems
+        plotting:           figures, with matplotlib imported on first use
+        recording:          preallocated, decimated trajectory recording
+        roots:              bracketing root finders over arrays of problems
+        sparse:             CSR matrices, iterative and multigrid solvers
+        statistics:         streaming summary statistics of large ensembles
+        sweep:              parameter and dt sweeps across a process pool
+        symplectic_method:  energy-conserving orbital steppers, chosen by name
+        trajectory:         streamed, chunked trajectory files, readable mid-run
+'''
@@ -0,0 +1,70 @@
+''' Activity Modules
+
+    The Guided Activities, Projects and Chapter 5 method implementations
+    live in folders named for the course, with spaces in their names, and
+    runga-kutta.py is not a valid module name, so none of them can be
+    imported as part of a package. This module imports each by name, from
+    its file, the first time it is used:
+
+        >>> from me273 import activities
+        >>> rocket = activities.project_2.Rocket(stages)
+
+        >>> from me273.activities import runga_kutta, matrix_methods
+
+    Each is imported once, under its own name, so it is the same module
+    that `import project_2` gives with its folder on the path.
+'''
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = {
+    'falling_objects':          'Guided Activities/GA1 - Falling Objects/falling_objects.py',
+    'harmonic_oscillator':      'Guided Activities/GA2 - Simple Harmonic Oscillator/harmonic_oscillator.py',
+    'orbital_motion':           'Guided Activities/GA3 - Orbital Mechanics/orbital_motion.py',
+    'numerical_integration':    'Guided Activities/GA4 - Numerical Integration/numerical_integration.py',
+    'root_finding':             'Guided Activities/GA5 - Roots/root_finding.py',
+    'matrix_methods':           'Guided Activities/GA6 - Matrix Methods/matrix_methods.py',
+    'project_1':                'Projects/Project 1/project_1.py',
+    'project_2':                'Projects/Project 2/project_2.py',
+    'barnes_hut':               'Projects/Project 2/barnes_hut.py',
+    'bracketing_method':        'Method Implementations/Part II/Chapter 5/bracketing_method.py',
+    'graphical_method':         'Method Implementations/Part II/Chapter 5/graphical_method.py',
+    'open_method':              'Method Implementations/Part II/Chapter 5/open_method.py',
+    'runga_kutta':              'Method Implementations/Part II/Chapter 5/runga-kutta.py',
+}
+
+def load(name):
+    ''' Return the activity module name (a key of MODULES), importing it if needed. '''
+
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if name not in MODULES:
+        raise ImportError('No activity module %r; choose from %s.' % (name, ', '.join(MODULES)))
+
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, MODULES[name]))
+    module = importlib.util.module_from_spec(spec)
+
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+
+    return module
+
+def __getattr__(name):
+
+    if name in MODULES:
+        return load(name)
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+
+    return sorted(list(globals()) + list(MODULES))
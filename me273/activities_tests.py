@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from me273 import activities
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importing every numerical module of the package and of the activities,
+# after numpy, must not import matplotlib or scipy, and must fit this budget.
+IMPORT_BUDGET = 0.5
+
+IMPORT_ALL = '''
+import importlib, json, pkgutil, sys, time
+import numpy
+
+start = time.perf_counter()
+
+import me273
+from me273 import activities
+
+for module in pkgutil.iter_modules(me273.__path__):
+    if not module.name.endswith('_tests'):
+        importlib.import_module('me273.' + module.name)
+
+for name in activities.MODULES:
+    activities.load(name)
+
+print(json.dumps({'seconds': time.perf_counter() - start,
+                  'heavy': sorted({m.split('.')[0] for m in sys.modules} & {'matplotlib', 'scipy'})}))
+'''
+
+
+def test_load_by_name():
+    project_2 = activities.load('project_2')
+
+    assert activities.project_2 is project_2
+    assert sys.modules['project_2'] is project_2
+    assert hasattr(activities.runga_kutta, 'runga_kutta')
+
+    from me273.activities import matrix_methods
+    assert hasattr(matrix_methods, 'cramer')
+
+
+def test_unknown_name():
+    with pytest.raises(ImportError):
+        activities.load('project_3')
+
+    with pytest.raises(AttributeError):
+        activities.project_3
+
+
+def test_import_budget():
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, '-c', IMPORT_ALL], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    imported = json.loads(result.stdout)
+
+    assert imported['heavy'] == []
+    assert imported['seconds'] < IMPORT_BUDGET
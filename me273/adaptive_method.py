@@ -0,0 +1,285 @@
+''' Adaptive Runge-Kutta Methods
+
+    An embedded Runge-Kutta pair computes two solutions of different order
+    from the same function evaluations. Their difference estimates the local
+    error of the step, which lets the integrator grow the step where the
+    motion is smooth and shrink it where it is not, rather than running the
+    whole simulation at the dt required by the worst moment.
+
+    The integrators here use the same calling convention as the Euler
+    methods in the Guided Activities and Projects:
+
+                    a = acceleration(x, v, **kwargs)
+'''
+
+import numpy as np
+
+from me273.events import EventMonitor
+from me273.instrumentation import active
+
+# Dormand-Prince 5(4) Butcher tableau (Dormand & Prince, 1980).
+C = np.asarray([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+
+A = [[],
+     [1/5],
+     [3/40, 9/40],
+     [44/45, -56/15, 32/9],
+     [19372/6561, -25360/2187, 64448/6561, -212/729],
+     [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+     [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84]]
+
+# Fifth-order weights (used to advance) and fourth-order weights (used for
+# the error estimate). The last stage is evaluated at the new state, so it
+# is reused as the first stage of the next step (First Same As Last).
+B5 = np.asarray([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+B4 = np.asarray([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+E = B5 - B4
+
+def error_norm(error, y0, y1, rtol, atol):
+    ''' Return the RMS of the error scaled by the mixed tolerance.
+
+        Uses:
+
+            sc = atol + rtol * max(|y0|, |y1|)
+
+            norm = sqrt(mean((error / sc)**2))
+
+        A step is accepted when the norm is no greater than 1.
+
+        Args:
+            error (np.array):   local error estimate
+            y0 (np.array):      state at the start of the step
+            y1 (np.array):      state at the end of the step
+            rtol (float):       relative tolerance
+            atol (float):       absolute tolerance
+
+        Returns:
+            float:              scaled error norm
+    '''
+
+    scale = atol + rtol * np.maximum(np.abs(y0), np.abs(y1))
+
+    return np.sqrt(np.mean(np.square(error / scale)))
+
+def dormand_prince_step(acceleration, x, v, a, dt, **kwargs):
+    ''' Return the stages of one Dormand-Prince step from (x, v).
+
+        The second-order system x'' = a(x, v) is treated as the first-order
+        system y = [x, v], y' = [v, a(x, v)].
+
+        Args:
+            acceleration (func):  a function that accepts x, v, and **kwargs and
+                                      return acceleration.
+            x (np.array):         position at the start of the step
+            v (np.array):         velocity at the start of the step
+            a (np.array):         acceleration at the start of the step
+            dt (float):           step size (s)
+            **kwargs:             any additional arguments required for the
+                                      accleration function
+
+        Returns:
+            np.array:   (7, ...) position derivatives (velocity) at each stage
+            np.array:   (7, ...) velocity derivatives (acceleration) at each stage
+    '''
+
+    kx = np.empty((7,) + np.shape(x))
+    kv = np.empty((7,) + np.shape(x))
+
+    kx[0] = v
+    kv[0] = a
+
+    for i in range(1, 7):
+        xs = x + dt * np.tensordot(A[i], kx[:i], axes=1)
+        vs = v + dt * np.tensordot(A[i], kv[:i], axes=1)
+
+        kx[i] = vs
+        kv[i] = acceleration(xs, vs, **kwargs)
+
+    return kx, kv
+
+def initial_step(acceleration, t0, x0, v0, a0, order, rtol, atol, **kwargs):
+    ''' Return a starting step size for an adaptive integrator.
+
+        Follows the heuristic of Hairer, Norsett & Wanner (1993): take a
+        step small enough that an explicit Euler step stays within tolerance,
+        then adjust it by an estimate of the second derivative.
+
+        Returns:
+            float:  initial step size (s)
+    '''
+
+    y0 = np.concatenate([np.ravel(x0), np.ravel(v0)])
+    f0 = np.concatenate([np.ravel(v0), np.ravel(a0)])
+
+    scale = atol + rtol * np.abs(y0)
+    d0 = np.sqrt(np.mean(np.square(y0 / scale)))
+    d1 = np.sqrt(np.mean(np.square(f0 / scale)))
+
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+
+    x1 = x0 + h0 * v0
+    v1 = v0 + h0 * a0
+    a1 = acceleration(x1, v1, **kwargs)
+
+    f1 = np.concatenate([np.ravel(v1), np.ravel(a1)])
+    d2 = np.sqrt(np.mean(np.square((f1 - f0) / scale))) / h0
+
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / (order + 1))
+
+    return min(100 * h0, h1)
+
+def dormand_prince(acceleration, t0, tf, x0=0, v0=0, dt=None, rtol=1e-6, atol=1e-9,
+                   safety=0.9, min_factor=0.2, max_factor=10.0, max_steps=int(1e6),
+                   events=None, **kwargs):
+    ''' Returns t, x, v, and a arrays and step statistics for Dormand-Prince 5(4)
+
+        Integrates from t0 to tf with a step size chosen so that the
+        estimated local error of every accepted step satisfies
+
+                |error| <= atol + rtol * |y|
+
+        in the RMS sense over all position and velocity components. After
+        each step the size is rescaled by
+
+                dt_new = dt * safety * (1 / norm)**(1/5)
+
+        limited to [min_factor, max_factor] times the old step.
+
+        Events (see me273.events) are located on the interpolant of each
+        accepted step. A terminal event ends the run with the event state as
+        the final sample.
+
+        Args:
+            acceleration (func):  a function that accepts x, v, and **kwargs and
+                                      return acceleration.
+            t0 (float):           initial time (s)
+            tf (float):           final time (s)
+            x0 (np.array):        initial displacement (m)
+            v0 (np.array):        initial velocity (m/s)
+            dt (float):           initial step size; estimated if None (s)
+            rtol (float):         relative tolerance
+            atol (float):         absolute tolerance
+            safety (float):       safety factor on the step size update
+            min_factor (float):   smallest allowed step size ratio
+            max_factor (float):   largest allowed step size ratio
+            max_steps (int):      largest number of attempted steps
+            events (list):        Event objects or functions g(t, x, v)
+            **kwargs:             any additional arguments required for the
+                                      accleration function
+
+        Returns:
+            np.float64 (np.array): accepted times (s)
+            np.float64 (np.array): positions at each accepted time (m)
+            np.float64 (np.array): velocities at each accepted time (m/s)
+            np.float64 (np.array): accelerations at each accepted time (m/s**2)
+            dict:                  step statistics with keys 'accepted',
+                                       'rejected' and 'evaluations', and,
+                                       when events are given, 't_events',
+                                       'x_events' and 'v_events' (one list
+                                       of occurrences per event)
+
+        Examples:
+            Integrate one lunar month of the GA3 moon orbit.
+                >>> x0 = np.asarray([0.3633e9, 0])
+                >>> v0 = np.asarray([0, 1.082e3])
+                >>> t, x, v, a, stats = dormand_prince(gravitational_acceleration,
+                ...                                    0, 3600 * 24 * 30, x0, v0, m=7.35e22)
+
+            Find the impact time of the GA1 bowling ball.
+                >>> ground = Event(lambda t, x, v: x, direction=-1, terminal=True)
+                >>> t, x, v, a, stats = dormand_prince(lambda x, v: acceleration(v, area, mass),
+                ...                                    0, np.inf, x0=440, events=[ground])
+                >>> stats['t_events'][0]
+    '''
+
+    t = float(t0)
+    x = np.asarray(x0, dtype=np.float64)
+    v = np.asarray(v0, dtype=np.float64) + np.zeros_like(x)
+    a = np.asarray(acceleration(x, v, **kwargs), dtype=np.float64)
+
+    stats = {'accepted': 0, 'rejected': 0, 'evaluations': 1}
+
+    if dt is None:
+        dt = initial_step(acceleration, t, x, v, a, 5, rtol, atol, **kwargs)
+        stats['evaluations'] += 1
+
+    t_num = [t]
+    x_num = [x]
+    v_num = [v]
+    a_num = [a]
+
+    monitor = EventMonitor(events, t, x, v) if events else None
+
+    steps = 0
+    while t < tf:
+        if steps >= max_steps:
+            raise RuntimeError('Failed to reach tf in {} steps.'.format(max_steps))
+
+        steps += 1
+
+        # Never step past the final time.
+        dt = min(dt, tf - t)
+
+        if dt <= 16 * np.finfo(float).eps * max(abs(t), 1.0):
+            raise RuntimeError('Step size underflow at t = {}.'.format(t))
+
+        kx, kv = dormand_prince_step(acceleration, x, v, a, dt, **kwargs)
+        stats['evaluations'] += 6
+
+        x_new = x + dt * np.tensordot(B5, kx, axes=1)
+        v_new = v + dt * np.tensordot(B5, kv, axes=1)
+
+        error = np.concatenate([np.ravel(dt * np.tensordot(E, kx, axes=1)),
+                                np.ravel(dt * np.tensordot(E, kv, axes=1))])
+
+        norm = error_norm(error,
+                          np.concatenate([np.ravel(x), np.ravel(v)]),
+                          np.concatenate([np.ravel(x_new), np.ravel(v_new)]),
+                          rtol, atol)
+
+        if norm <= 1.0:
+            t_old, x_old, v_old, a_old = t, x, v, a
+
+            t += dt
+            x, v, a = x_new, v_new, kv[6]
+
+            terminal = monitor and monitor.step(t_old, x_old, v_old, a_old, t, x, v, a)
+            if terminal:
+                t, x, v = terminal
+                a = np.asarray(acceleration(x, v, **kwargs), dtype=np.float64)
+                stats['evaluations'] += 1
+
+            t_num.append(t)
+            x_num.append(x)
+            v_num.append(v)
+            a_num.append(a)
+
+            stats['accepted'] += 1
+
+            if terminal:
+                break
+
+            factor = max_factor if norm == 0 else min(max_factor, safety * norm ** -0.2)
+        else:
+            stats['rejected'] += 1
+            factor = max(min_factor, safety * norm ** -0.2)
+
+        dt *= factor
+
+    probe = active()
+    if probe is not None:
+        probe.count('steps', stats['accepted'])
+        probe.count('rejected', stats['rejected'])
+        probe.count('acceleration', stats['evaluations'])
+
+    if monitor:
+        stats['t_events'] = [np.asarray(e) for e in monitor.t_events]
+        stats['x_events'] = [np.asarray(e) for e in monitor.x_events]
+        stats['v_events'] = [np.asarray(e) for e in monitor.v_events]
+
+    return (np.asarray(t_num), np.asarray(x_num), np.asarray(v_num),
+            np.asarray(a_num), stats)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from me273.adaptive_method import dormand_prince
+
+
+def oscillator(x, v, k, m):
+    return -1 * (k / m) * x
+
+
+def gravity(x, v, M=5.972e24, G=6.67408e-11):
+    return -(x * G * M) / np.power(np.linalg.norm(x), 3)
+
+
+def test_harmonic_oscillator_accuracy():
+    k, m, x0 = 2.5, 0.250, 0.10
+
+    t, x, v, a, stats = dormand_prince(oscillator, 0, 15, x0=x0, v0=0, rtol=1e-9, atol=1e-12, k=k, m=m)
+
+    assert t[-1] == 15
+    assert x == pytest.approx(x0 * np.cos(np.sqrt(k / m) * t), abs=1e-8)
+    assert stats['evaluations'] == 2 + 6 * (stats['accepted'] + stats['rejected'])
+
+
+def test_moon_orbit_closes_with_few_evaluations():
+    r = 0.3633e9
+    speed = np.sqrt(6.67408e-11 * 5.972e24 / r)
+    period = 2 * np.pi * r / speed
+
+    t, x, v, a, stats = dormand_prince(gravity, 0, period,
+                                       x0=np.asarray([r, 0.0]),
+                                       v0=np.asarray([0.0, speed]),
+                                       rtol=1e-8, atol=1e-3)
+
+    assert x.shape == (t.size, 2)
+    assert x[-1] == pytest.approx([r, 0.0], abs=r * 1e-6)
+    assert stats['evaluations'] < 2000
+
+
+def test_tolerance_controls_rejections():
+    t, x, v, a, stats = dormand_prince(oscillator, 0, 1, x0=1.0, dt=10.0, k=1, m=1)
+
+    assert stats['rejected'] > 0
+    assert np.all(np.diff(t) > 0)
@@ -0,0 +1,201 @@
+''' Banded Matrices
+
+    Spring-mass chains and finite-difference grids give matrices whose
+    nonzeros lie within a few diagonals of the main one. Stored densely,
+    such a matrix costs O(n**2) memory and O(n**3) to solve; stored by
+    diagonals it costs O(n * bw) memory and O(n * bw**2) to solve, where
+    bw = lower + upper + 1 is the bandwidth. A tridiagonal system with a
+    million unknowns then solves in milliseconds.
+
+    Storage is LAPACK's: row upper + i - j of ab holds A[i, j], so each
+    diagonal is a row,
+
+            ab[upper - k] = A.diagonal(k)   (padded, for k from upper to -lower)
+
+    Solves use LAPACK's banded LU with partial pivoting (for tridiagonal
+    systems, the Thomas algorithm with pivoting) through scipy.linalg.
+'''
+
+import numpy as np
+
+def bandwidth(A):
+    ''' Return the number of (lower, upper) diagonals holding nonzeros of A. '''
+
+    rows, cols = np.nonzero(A)
+
+    if rows.size == 0:
+        return 0, 0
+
+    return int(max(np.max(rows - cols), 0)), int(max(np.max(cols - rows), 0))
+
+class BandedMatrix:
+    ''' Square matrix stored by its diagonals.
+
+        Args:
+            ab (np.array):  (lower + upper + 1, n) diagonals in LAPACK storage
+            lower (int):    diagonals below the main one
+            upper (int):    diagonals above the main one
+
+        Examples:
+            A spring-mass chain of n masses, stiffness k, fixed at both ends.
+                >>> K = BandedMatrix.from_diagonals([-k, 2 * k, -k], [-1, 0, 1], n)
+                >>> x = K.solve(forces)
+
+            From a dense matrix, with the bandwidth found automatically.
+                >>> K = BandedMatrix.from_dense(A)
+    '''
+
+    def __init__(self, ab, lower, upper):
+
+        self.ab = np.asarray(ab, dtype=np.float64)
+        self.lower = lower
+        self.upper = upper
+
+        if self.ab.shape[0] != lower + upper + 1:
+            raise ValueError('ab must have lower + upper + 1 = %d rows, not %d.'
+                             % (lower + upper + 1, self.ab.shape[0]))
+
+        self.n = self.ab.shape[1]
+        self.shape = (self.n, self.n)
+
+    @classmethod
+    def from_dense(cls, A, lower=None, upper=None):
+        ''' Return the banded form of dense A, finding its bandwidth if not given. '''
+
+        A = np.asarray(A, dtype=np.float64)
+
+        if lower is None or upper is None:
+            found = bandwidth(A)
+            lower = found[0] if lower is None else lower
+            upper = found[1] if upper is None else upper
+
+        n = A.shape[0]
+        ab = np.zeros((lower + upper + 1, n))
+
+        for k in range(-lower, upper + 1):
+            diagonal = A.diagonal(k)
+            if k >= 0:
+                ab[upper - k, k:] = diagonal
+            else:
+                ab[upper - k, :n + k] = diagonal
+
+        return cls(ab, lower, upper)
+
+    @classmethod
+    def from_diagonals(cls, diagonals, offsets, n=None):
+        ''' Return the matrix with the given diagonals at the given offsets
+            (0 main, positive above, negative below). A diagonal may be a
+            number, repeated along its length, or an array of it.
+        '''
+
+        if n is None:
+            n = max(np.size(d) + abs(k) for d, k in zip(diagonals, offsets))
+
+        lower = max(0, -min(offsets))
+        upper = max(0, max(offsets))
+        ab = np.zeros((lower + upper + 1, n))
+
+        for diagonal, k in zip(diagonals, offsets):
+            if k >= 0:
+                ab[upper - k, k:] = diagonal
+            else:
+                ab[upper - k, :n + k] = diagonal
+
+        return cls(ab, lower, upper)
+
+    def todense(self):
+        ''' Return the dense (n, n) matrix. '''
+
+        A = np.zeros(self.shape)
+
+        for k in range(-self.lower, self.upper + 1):
+            i = np.arange(max(0, -k), min(self.n, self.n - k))
+            A[i, i + k] = self.ab[self.upper - k, i + k]
+
+        return A
+
+    def dot(self, x):
+        ''' Return A @ x, for x of shape (n,) or (n, m), in O(n * bw). '''
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.zeros(np.broadcast_shapes(x.shape, (self.n,) + x.shape[1:]))
+
+        for k in range(-self.lower, self.upper + 1):
+            diagonal = self.ab[self.upper - k].reshape((self.n,) + (1,) * (x.ndim - 1))
+            if k >= 0:
+                y[:self.n - k] += diagonal[k:] * x[k:]
+            else:
+                y[-k:] += diagonal[:self.n + k] * x[:self.n + k]
+
+        return y
+
+    __matmul__ = dot
+
+    def solve(self, b):
+        ''' Return x for Ax = b, for b of shape (n,) or (n, k). '''
+
+        from scipy.linalg import solve_banded
+
+        return solve_banded((self.lower, self.upper), self.ab, b, check_finite=False)
+
+    def factor(self):
+        ''' Return a BandedFactorization, to solve against many right-hand sides. '''
+
+        return BandedFactorization(self)
+
+class BandedFactorization:
+    ''' Banded LU factors of a BandedMatrix, for repeated O(n * bw) solves.
+
+        Examples:
+            >>> solve = K.factor()
+            >>> for f in loads:
+            ...     x = solve(f)
+    '''
+
+    def __init__(self, A):
+
+        from scipy.linalg import lapack
+
+        # LAPACK needs room for lower more diagonals of fill-in above.
+        ab = np.zeros((2 * A.lower + A.upper + 1, A.n))
+        ab[A.lower:] = A.ab
+
+        self.lu, self.piv, info = lapack.dgbtrf(ab, A.lower, A.upper, overwrite_ab=True)
+
+        if info > 0:
+            raise np.linalg.LinAlgError('Singular matrix')
+
+        self.n, self.lower, self.upper = A.n, A.lower, A.upper
+        self.solves = 0
+
+    def solve(self, b):
+        ''' Return x for Ax = b, for b of shape (n,) or (n, k). '''
+
+        from scipy.linalg import lapack
+
+        b = np.asarray(b, dtype=np.float64)
+        self.solves += 1 if b.ndim == 1 else b.shape[1]
+
+        x, info = lapack.dgbtrs(self.lu, self.lower, self.upper, b.reshape(self.n, -1), self.piv)
+
+        return x.reshape(b.shape)
+
+    __call__ = solve
+
+def banded_solve(A, b, max_fraction=0.1):
+    ''' Return x for Ax = b, using banded storage when A is narrowly banded.
+
+        A may be dense, whose bandwidth is found automatically, or a
+        BandedMatrix. Dense A wider than max_fraction of n is solved densely.
+    '''
+
+    if not isinstance(A, BandedMatrix):
+        A = np.asarray(A, dtype=np.float64)
+        lower, upper = bandwidth(A)
+
+        if lower + upper + 1 > max_fraction * A.shape[0]:
+            return np.linalg.solve(A, b)
+
+        A = BandedMatrix.from_dense(A, lower, upper)
+
+    return A.solve(b)
@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+import pytest
+
+from me273.banded import BandedMatrix, banded_solve, bandwidth
+
+
+def random_banded(n=30, lower=2, upper=3):
+    rng = np.random.default_rng(273)
+    A = 10 * np.eye(n)
+    for k in range(-lower, upper + 1):
+        A += np.diag(rng.normal(size=n - abs(k)), k)
+
+    return A, rng.normal(size=(n, 3))
+
+
+def test_dense_round_trip():
+    A, B = random_banded()
+
+    assert bandwidth(A) == (2, 3)
+
+    banded = BandedMatrix.from_dense(A)
+
+    assert banded.ab.shape == (6, 30)
+    assert np.all(banded.todense() == A)
+    assert banded @ B == pytest.approx(A @ B, abs=1e-12)
+    assert banded @ B[:, 0] == pytest.approx(A @ B[:, 0], abs=1e-12)
+
+
+def test_solves_match_dense():
+    A, B = random_banded()
+    banded = BandedMatrix.from_dense(A)
+    solve = banded.factor()
+
+    assert banded.solve(B) == pytest.approx(np.linalg.solve(A, B), abs=1e-12)
+    assert solve(B) == pytest.approx(np.linalg.solve(A, B), abs=1e-12)
+    assert solve(B[:, 0]) == pytest.approx(np.linalg.solve(A, B[:, 0]), abs=1e-12)
+    assert banded_solve(A, B, max_fraction=1) == pytest.approx(np.linalg.solve(A, B), abs=1e-12)
+
+
+def test_million_unknown_tridiagonal():
+    # -u'' = 1 on (0, 1), u(0) = u(1) = 0, whose solution is x (1 - x) / 2.
+    n = 10**6
+    x = np.arange(1, n + 1) / (n + 1)
+
+    start = time.perf_counter()
+    K = BandedMatrix.from_diagonals([-1.0, 2.0, -1.0], [-1, 0, 1], n)
+    u = K.solve(np.full(n, 1 / (n + 1)**2))
+    elapsed = time.perf_counter() - start
+
+    assert np.max(np.abs(u - x * (1 - x) / 2)) < 1e-6
+    assert elapsed < 1
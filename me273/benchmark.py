@@ -0,0 +1,307 @@
+''' Benchmarks
+
+    A Suite holds named workloads, each a function of a size (steps,
+    unknowns, bodies, problems) returning the zero-argument call to time:
+
+        >>> suite = Suite()
+        >>> @suite.workload(1000, 10000)
+        ... def euler(steps):
+        ...     return lambda: euler_method(acceleration, 0, 10, 10 / steps, ...)
+
+    Everything done before the return is setup and is not timed. Each call
+    is repeated until a run lasts at least min_time, and the best of
+    repeat runs is kept, as timeit does, so that noise from the rest of the
+    machine only ever makes a time longer.
+
+    Best-of-repeat does not remove slower spells of the machine that last
+    longer than a run: on a shared machine the same workload can take twice
+    as long a minute later. So a baseline is taken in rounds, passes over
+    every workload, and keeps the median of each time's rounds, together
+    with its noise, how far apart its rounds were.
+
+    Results are saved as JSON baselines, seconds per call by workload and
+    size. compare() flags every time slower than its baseline by more than
+    both threshold (a fraction) and the baseline's noise; from the command
+    line, a time flagged is taken again in rounds, and their median
+    compared, before it is reported. Times depend on the machine, so a
+    baseline records the one it was taken on, and should be retaken on a
+    new one.
+'''
+
+import argparse
+import fnmatch
+import gc
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+class Suite:
+    ''' A collection of named, sized workloads.
+
+        Examples:
+            >>> results = suite.run(['euler*'], report=print)
+            >>> save('baseline.json', results)
+            >>> regressions = compare(suite.run(), load('baseline.json'))
+    '''
+
+    def __init__(self):
+
+        self.workloads = {}
+
+    def workload(self, *sizes, name=None):
+        ''' Return a decorator registering setup(size) -> call at each size. '''
+
+        def register(setup):
+            self.workloads[name or setup.__name__] = (setup, sizes)
+            return setup
+
+        return register
+
+    def select(self, patterns=None):
+        ''' Return the names of workloads matching any of the glob patterns. '''
+
+        if not patterns:
+            return list(self.workloads)
+
+        return [name for name in self.workloads
+                if any(fnmatch.fnmatchcase(name, p) for p in patterns)]
+
+    def run(self, patterns=None, largest=None, repeat=5, min_time=0.05, rounds=1, report=None,
+            full_output=False):
+        ''' Return seconds per call of each selected workload at each size.
+
+            Args:
+                patterns (list):    glob patterns of workload names (default all)
+                largest (int):      skip sizes above this
+                repeat (int):       runs, of which the fastest is kept
+                min_time (float):   shortest run (s); fast calls are repeated
+                rounds (int):       passes over all the workloads, of which
+                                        the median time is kept
+                report (func):      called as report(name, size, seconds)
+                full_output (bool): also return the noise of each time
+
+            Returns:
+                dict:   name -> {size: seconds}
+                dict:   name -> {size: noise}, if full_output (see noise())
+        '''
+
+        results = {}
+        takes = {}
+
+        for name in self.select(patterns):
+            results[name] = {}
+
+            for size in self.workloads[name][1]:
+                if largest is None or size <= largest:
+                    takes[name, size] = []
+
+        # Each round times every workload once, so that a slow spell of the
+        # machine falls on one round of many times, not every round of one.
+        for i in range(rounds):
+            for (name, size), times in takes.items():
+                setup = self.workloads[name][0]
+                times.append(best_time(setup(size), repeat=repeat, min_time=min_time))
+
+                if i == rounds - 1:
+                    results[name][size] = float(np.median(times))
+
+                    if report is not None:
+                        report(name, size, results[name][size])
+
+        if full_output:
+            spread = {name: {} for name in results}
+            for (name, size), times in takes.items():
+                spread[name][size] = noise(times)
+
+            return results, spread
+
+        return results
+
+def best_time(call, repeat=5, min_time=0.05):
+    ''' Return the fastest time (s) per call of call(), over repeat runs.
+
+        Each run calls it number times, number doubling from 1 until a run
+        takes min_time. A first, untimed call pays for any lazy imports or
+        caches. The garbage collector is off while timing.
+    '''
+
+    call()
+
+    number = 1
+    enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                call()
+            elapsed = time.perf_counter() - start
+
+            if elapsed >= min_time:
+                break
+
+            number *= 2
+
+        times = [elapsed]
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                call()
+            times.append(time.perf_counter() - start)
+
+    finally:
+        if enabled:
+            gc.enable()
+
+    return min(times) / number
+
+def noise(times):
+    ''' Return how far apart repeated times are, as a fraction of the fastest. '''
+
+    return max(times) / min(times) - 1
+
+def machine():
+    ''' Return a description of this machine and its Python, for baselines. '''
+
+    return {'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'python': platform.python_version(),
+            'numpy': np.__version__}
+
+def save(path, results, noise=None):
+    ''' Write results, and their noise, with this machine's description, as a JSON baseline. '''
+
+    def table(values):
+        return {name: {str(size): values[name][size] for size in sorted(values[name])}
+                for name in sorted(values)}
+
+    baseline = {'machine': machine(), 'results': table(results)}
+
+    if noise is not None:
+        baseline['noise'] = table(noise)
+
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=4)
+        f.write('\n')
+
+def load(path, field='results'):
+    ''' Return the results of a JSON baseline, name -> {size: seconds}.
+
+        With field='noise', return the noise of each time instead (empty
+        for a baseline saved without it).
+    '''
+
+    with open(path) as f:
+        baseline = json.load(f)
+
+    return {name: {int(size): value for size, value in values.items()}
+            for name, values in baseline.get(field, {}).items()}
+
+def compare(results, baseline, threshold=0.25, noise=None):
+    ''' Return the regressions of results against baseline.
+
+        Workloads or sizes missing from the baseline are not compared.
+
+        Args:
+            results (dict):     name -> {size: seconds}
+            baseline (dict):    the same, e.g. from load()
+            threshold (float):  allowed slowdown, as a fraction
+            noise (dict):       name -> {size: noise} of the baseline; a
+                                    time may be slower by its noise, where
+                                    that is more than threshold
+
+        Returns:
+            list:   (name, size, baseline seconds, seconds, ratio) of every
+                        time above (1 + threshold) times its baseline
+    '''
+
+    regressions = []
+
+    for name, times in results.items():
+        for size, seconds in times.items():
+            before = baseline.get(name, {}).get(size)
+            allowed = max(threshold, (noise or {}).get(name, {}).get(size, 0))
+
+            if before is not None and seconds > (1 + allowed) * before:
+                regressions.append((name, size, before, seconds, seconds / before))
+
+    return regressions
+
+def main(suite, baseline, argv=None):
+    ''' Run suite from the command line; return 1 on a regression, else 0.
+
+        Examples:
+            Time every workload and compare it to the stored baseline.
+                $ python benchmarks.py
+
+            Store new baselines for the root finders, from five rounds.
+                $ python benchmarks.py --save --rounds 5 'roots.*'
+    '''
+
+    parser = argparse.ArgumentParser(description='Time the workloads of a benchmark suite.')
+    parser.add_argument('patterns', nargs='*', help='glob patterns of workloads to run (default all)')
+    parser.add_argument('--list', action='store_true', help='list the workloads and their sizes')
+    parser.add_argument('--largest', type=int, help='skip sizes above this')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per time, the fastest is kept')
+    parser.add_argument('--min-time', type=float, default=0.05, help='shortest run (s)')
+    parser.add_argument('--rounds', type=int, default=3,
+                        help='rounds of a saved or retaken time, the median is kept')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed slowdown, as a fraction, where more than the noise of the baseline')
+    parser.add_argument('--baseline', default=baseline, help='baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='store the times as the new baseline')
+
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in suite.select(args.patterns):
+            print('{:<32} {}'.format(name, ', '.join(map(str, suite.workloads[name][1]))))
+        return 0
+
+    try:
+        stored = load(args.baseline)
+        stored_noise = load(args.baseline, 'noise')
+    except FileNotFoundError:
+        stored, stored_noise = {}, {}
+
+    def report(name, size, seconds):
+        before = stored.get(name, {}).get(size)
+        change = '{:>+8.1%}'.format(seconds / before - 1) if before else ''
+        print('{:<32} {:>10} {:>12.3e} s {}'.format(name, size, seconds, change))
+        sys.stdout.flush()
+
+    if args.save:
+        results, spread = suite.run(args.patterns, largest=args.largest, repeat=args.repeat,
+                                    min_time=args.min_time, rounds=args.rounds, report=report,
+                                    full_output=True)
+
+        for name, times in stored.items():
+            results[name] = {**times, **results.get(name, {})}
+        for name, values in stored_noise.items():
+            spread[name] = {**values, **spread.get(name, {})}
+
+        save(args.baseline, results, spread)
+        print('Saved %s.' % args.baseline)
+        return 0
+
+    results = suite.run(args.patterns, largest=args.largest, repeat=args.repeat,
+                        min_time=args.min_time, report=report)
+
+    # One slow time may be a slow spell of the machine, so time each suspect
+    # again in rounds, as the baseline was, and compare the median.
+    for name, size, before, seconds, ratio in compare(results, stored, args.threshold, stored_noise):
+        setup = suite.workloads[name][0]
+        times = [seconds] + [best_time(setup(size), repeat=args.repeat, min_time=args.min_time)
+                             for _ in range(args.rounds)]
+        results[name][size] = float(np.median(times))
+
+    regressions = compare(results, stored, args.threshold, stored_noise)
+
+    for name, size, before, seconds, ratio in regressions:
+        print('REGRESSION {} at {}: {:.3e} s -> {:.3e} s ({:.2f}x)'.format(name, size, before, seconds, ratio))
+
+    return 1 if regressions else 0
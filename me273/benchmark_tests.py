@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from me273.benchmark import Suite, best_time, compare, load, main, noise, save
+
+
+def sleeper():
+    suite = Suite()
+
+    @suite.workload(1, 2)
+    def sleep(size):
+        return lambda: time.sleep(0.001 * size)
+
+    @suite.workload(10)
+    def noop(size):
+        return lambda: None
+
+    return suite
+
+
+def test_best_time():
+    seconds = best_time(lambda: time.sleep(0.002), repeat=3, min_time=0.01)
+
+    assert 0.002 <= seconds < 0.01
+
+
+def test_run_and_select():
+    suite = sleeper()
+
+    assert suite.select() == ['sleep', 'noop']
+    assert suite.select(['s*']) == ['sleep']
+
+    reported = []
+    results = suite.run(largest=5, repeat=1, min_time=0, report=lambda *r: reported.append(r))
+
+    assert set(results) == {'sleep', 'noop'}
+    assert list(results['sleep']) == [1, 2]
+    assert results['noop'] == {}
+    assert results['sleep'][2] > results['sleep'][1] >= 0.001
+    assert [r[:2] for r in reported] == [('sleep', 1), ('sleep', 2)]
+
+
+def test_rounds_keep_median_and_noise():
+    suite = sleeper()
+
+    results, spread = suite.run(['sleep'], repeat=1, min_time=0, rounds=3, full_output=True)
+
+    assert list(results['sleep']) == list(spread['sleep']) == [1, 2]
+    assert results['sleep'][1] >= 0.001
+    assert spread['sleep'][1] >= 0
+    assert noise([1.0, 1.5, 1.2]) == pytest.approx(0.5)
+
+
+def test_baseline_round_trip(tmp_path):
+    results = {'sleep': {1: 0.001, 2: 0.002}}
+    spread = {'sleep': {1: 0.1, 2: 0.4}}
+
+    save(tmp_path / 'baseline.json', results)
+
+    assert load(tmp_path / 'baseline.json') == results
+    assert load(tmp_path / 'baseline.json', 'noise') == {}
+
+    save(tmp_path / 'baseline.json', results, spread)
+
+    assert load(tmp_path / 'baseline.json') == results
+    assert load(tmp_path / 'baseline.json', 'noise') == spread
+
+
+def test_compare_flags_regressions():
+    baseline = {'a': {1: 1.0, 2: 1.0}, 'b': {1: 1.0}}
+    results = {'a': {1: 1.2, 2: 1.5}, 'b': {1: 0.5}, 'new': {1: 9.0}}
+
+    assert compare(results, baseline) == [('a', 2, 1.0, 1.5, 1.5)]
+    assert compare(results, baseline, threshold=0.1) == [('a', 1, 1.0, 1.2, pytest.approx(1.2)),
+                                                         ('a', 2, 1.0, 1.5, 1.5)]
+
+
+def test_compare_tolerates_baseline_noise():
+    baseline = {'a': {1: 1.0, 2: 1.0}}
+    results = {'a': {1: 1.5, 2: 1.5}}
+
+    # Rounds of a 2 were 60% apart when it was saved; 50% slower is noise.
+    assert compare(results, baseline, noise={'a': {1: 0.1, 2: 0.6}}) == [('a', 1, 1.0, 1.5, 1.5)]
+
+
+def test_main(tmp_path, capsys):
+    suite = sleeper()
+    baseline = str(tmp_path / 'baseline.json')
+    quick = ['--repeat', '1', '--min-time', '0']
+
+    assert main(suite, baseline, ['--save', '--rounds', '2'] + quick) == 0
+    assert set(load(baseline)) == {'sleep', 'noop'}
+    assert list(load(baseline, 'noise')['sleep']) == [1, 2]
+
+    # A baseline 100 times faster than possible is a regression.
+    save(baseline, {'sleep': {1: 1e-5}})
+
+    assert main(suite, baseline, ['sleep'] + quick) == 1
+    assert 'REGRESSION sleep at 1' in capsys.readouterr().out
+    assert main(suite, baseline, ['sleep', '--threshold', '1000'] + quick) == 0
@@ -0,0 +1,358 @@
+''' Result Cache
+
+    Re-running a notebook recomputes the same trajectories every time a
+    plot is tweaked. A Cache memoizes simulation calls on disk, keyed by a
+    SHA-256 hash of
+
+        - the simulation function and every function passed to it (e.g. the
+          acceleration), by module, name, source code and default arguments;
+        - every function these call by a global name (e.g. the acceleration
+          a GA1 stepper calls directly), and the functions those call, in
+          turn, outside the standard library and installed packages;
+        - every argument, arrays by dtype, shape and contents.
+
+    Editing the source of the integrator or force model therefore changes
+    the key, so stale results are never returned; invalidate() also drops
+    them explicitly. Each result is stored as .npy files and loaded back
+    memory-mapped, so a cached trajectory costs no copy until it is read.
+    When the cache grows past max_bytes, the least recently used results
+    are evicted.
+'''
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sysconfig
+import tempfile
+import time
+
+import numpy as np
+
+def function_name(func):
+    ''' Return module.qualname of a function, method, or callable object. '''
+
+    func = getattr(func, '__func__', func)
+    module = getattr(func, '__module__', None) or ''
+    name = getattr(func, '__qualname__', None) or type(func).__qualname__
+
+    return module + '.' + name
+
+def function_source(func):
+    ''' Return the source of a function, or its bytecode if none is available. '''
+
+    func = getattr(func, '__func__', func)
+
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        code = getattr(func, '__code__', None)
+        return repr((code.co_code, code.co_consts)) if code is not None else repr(func)
+
+# Functions defined here are taken to be fixed; only changes to the
+# activities and to me273 need to reach the key.
+_LIBRARIES = tuple(os.path.realpath(sysconfig.get_path(name)) + os.sep
+                   for name in ('stdlib', 'platstdlib', 'purelib', 'platlib'))
+
+def _code_names(code):
+    ''' Return the global names used by code and the functions nested in it. '''
+
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names.extend(_code_names(const))
+
+    return names
+
+def referenced_functions(func):
+    ''' Return the user-defined functions func calls by global name. '''
+
+    func = getattr(func, '__func__', func)
+    code = getattr(func, '__code__', None)
+    scope = getattr(func, '__globals__', None)
+
+    if code is None or scope is None:
+        return []
+
+    referenced = []
+    for name in dict.fromkeys(_code_names(code)):
+        value = scope.get(name)
+        if not inspect.isfunction(value):
+            continue
+
+        try:
+            path = os.path.realpath(inspect.getsourcefile(value) or '')
+        except TypeError:
+            continue
+
+        if path and not path.startswith(_LIBRARIES):
+            referenced.append(value)
+
+    return referenced
+
+def _feed(h, value, functions):
+    ''' Feed a stable representation of value into the hash h. '''
+
+    if isinstance(value, functools.partial):
+        _feed(h, (value.func, value.args, value.keywords), functions)
+
+    elif inspect.isroutine(value):
+        name = function_name(value)
+        functions.add(name)
+
+        h.update(b'function' + name.encode() + function_source(value).encode())
+
+        func = getattr(value, '__func__', value)
+        _feed(h, getattr(func, '__defaults__', None), functions)
+        _feed(h, getattr(func, '__kwdefaults__', None), functions)
+
+        # Each called function once, so that recursion ends.
+        for called in referenced_functions(func):
+            if function_name(called) not in functions:
+                _feed(h, called, functions)
+
+        # A bound method also depends on the state of its object.
+        if hasattr(value, '__self__') and not inspect.isclass(value.__self__):
+            _feed(h, value.__self__, functions)
+
+    elif isinstance(value, np.ndarray) or isinstance(value, np.generic):
+        value = np.ascontiguousarray(value)
+        h.update(b'array' + value.dtype.str.encode() + repr(value.shape).encode())
+        h.update(value.tobytes())
+
+    elif isinstance(value, dict):
+        h.update(b'dict%d' % len(value))
+        for key in sorted(value, key=repr):
+            _feed(h, key, functions)
+            _feed(h, value[key], functions)
+
+    elif isinstance(value, (list, tuple)):
+        h.update(type(value).__name__.encode() + b'%d' % len(value))
+        for item in value:
+            _feed(h, item, functions)
+
+    elif value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        h.update(type(value).__name__.encode() + repr(value).encode())
+
+    elif hasattr(value, '__dict__'):
+        # Objects (e.g. a Rocket, or a BarnesHut solver) by class and state.
+        _feed(h, type(value).__call__ if callable(value) else None, functions)
+        h.update(b'object' + function_name(type(value)).encode())
+        _feed(h, vars(value), functions)
+
+    else:
+        raise TypeError('Cannot hash argument of type %s for the cache.' % type(value).__name__)
+
+def cache_key(func, args=(), kwargs=None):
+    ''' Return the hex key of a call, and the names of the functions it uses. '''
+
+    h = hashlib.sha256()
+    functions = set()
+
+    _feed(h, func, functions)
+    _feed(h, tuple(args), functions)
+    _feed(h, kwargs or {}, functions)
+
+    return h.hexdigest(), sorted(functions)
+
+class Cache:
+    ''' On-disk, content-addressed cache of simulation results.
+
+        Results may be arrays, numbers, strings, or any nesting of tuples,
+        lists and dicts of them; lists of numbers come back as arrays.
+
+        Args:
+            directory (str):    where results are stored (default
+                                    $ME273_CACHE or ~/.cache/me273)
+            max_bytes (int):    size above which the least recently used
+                                    results are evicted
+
+        Examples:
+            Cache the bowling ball drop.
+                >>> cache = Cache()
+                >>> t, x, v, a = cache(euler_projectile, mass, area, x0=440, dt=1e-4)
+
+            Or wrap the function once.
+                >>> euler_projectile = cache.memoize(euler_projectile)
+
+            Drop every result that used a force model.
+                >>> cache.invalidate(gravitational_acceleration)
+    '''
+
+    def __init__(self, directory=None, max_bytes=2**30):
+
+        if directory is None:
+            directory = os.environ.get('ME273_CACHE', os.path.join('~', '.cache', 'me273'))
+
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __call__(self, func, *args, **kwargs):
+        ''' Return func(*args, **kwargs), from the cache if it has been run before. '''
+
+        key, functions = cache_key(func, args, kwargs)
+        path = os.path.join(self.directory, key)
+
+        if os.path.isdir(path):
+            try:
+                result = self._load(path)
+            except (OSError, ValueError, KeyError):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                self.hits += 1
+                return result
+
+        self.misses += 1
+        result = func(*args, **kwargs)
+
+        self._store(path, result, function_name(func), functions)
+        self.evict()
+
+        return result
+
+    def memoize(self, func):
+        ''' Return a version of func whose calls go through the cache. '''
+
+        def cached(*args, **kwargs):
+            return self(func, *args, **kwargs)
+
+        cached.__name__ = getattr(func, '__name__', 'cached')
+        cached.__doc__ = func.__doc__
+        cached.__wrapped__ = func
+
+        return cached
+
+    def entries(self):
+        ''' Return (path, meta) for every stored result. '''
+
+        entries = []
+        for key in os.listdir(self.directory):
+            try:
+                with open(os.path.join(self.directory, key, 'meta.json')) as f:
+                    entries.append((os.path.join(self.directory, key), json.load(f)))
+            except (OSError, ValueError):
+                pass
+
+        return entries
+
+    def invalidate(self, func=None):
+        ''' Remove results that used func (as the simulation or an argument),
+            or every result if func is None. Return the number removed.
+        '''
+
+        name = None if func is None else function_name(func)
+        removed = 0
+
+        for path, meta in self.entries():
+            if name is None or name in meta['functions']:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+
+        return removed
+
+    def clear(self):
+        ''' Remove every stored result. '''
+
+        return self.invalidate()
+
+    def evict(self):
+        ''' Remove least recently used results until under max_bytes. '''
+
+        entries = []
+        for path, meta in self.entries():
+            try:
+                used = os.stat(os.path.join(path, 'meta.json')).st_mtime
+            except OSError:
+                continue
+            entries.append((used, meta['bytes'], path))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def _store(self, path, result, name, functions):
+        ''' Write result to path atomically. '''
+
+        staging = tempfile.mkdtemp(dir=self.directory, prefix='.tmp-')
+        arrays = []
+
+        def encode(value):
+            if isinstance(value, dict):
+                return {'dict': [[encode(k), encode(v)] for k, v in value.items()]}
+
+            if isinstance(value, tuple):
+                return {'tuple': [encode(v) for v in value]}
+
+            if isinstance(value, (np.ndarray, np.generic, list)):
+                array = np.asarray(value)
+                if array.dtype != object:
+                    index = len(arrays)
+                    np.save(os.path.join(staging, '%d.npy' % index), array)
+                    arrays.append(array.nbytes)
+                    return {'array': index, 'scalar': isinstance(value, np.generic)}
+
+            if isinstance(value, list):
+                return {'list': [encode(v) for v in value]}
+
+            if value is None or isinstance(value, (bool, int, float, str)):
+                return {'value': value}
+
+            raise TypeError('Cannot cache a result of type %s.' % type(value).__name__)
+
+        try:
+            meta = {'function': name,
+                    'functions': functions,
+                    'result': encode(result),
+                    'bytes': sum(arrays),
+                    'created': time.time()}
+
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+
+            os.replace(staging, path)
+        except OSError:
+            # Another process stored the same result first.
+            shutil.rmtree(staging, ignore_errors=True)
+        except TypeError:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def _load(self, path):
+        ''' Return the result stored at path, memory-mapped. '''
+
+        meta_path = os.path.join(path, 'meta.json')
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        # Mark as recently used.
+        os.utime(meta_path)
+
+        def decode(node):
+            if 'array' in node:
+                array = np.load(os.path.join(path, '%d.npy' % node['array']), mmap_mode='r')
+                return array[()] if node['scalar'] else array
+
+            if 'dict' in node:
+                return {decode(k): decode(v) for k, v in node['dict']}
+
+            if 'tuple' in node:
+                return tuple(decode(v) for v in node['tuple'])
+
+            if 'list' in node:
+                return [decode(v) for v in node['list']]
+
+            return node['value']
+
+        return decode(meta['result'])
@@ -0,0 +1,120 @@
+import importlib
+import sys
+
+import numpy as np
+import pytest
+
+from me273.cache import Cache
+
+
+def spring(x, v, k):
+    return -k * x
+
+
+def euler(acceleration, x0, dt, steps, **kwargs):
+    x = np.empty(steps)
+    v = np.empty(steps)
+    x[0], v[0] = x0, 0.0
+
+    for i in range(1, steps):
+        v[i] = v[i-1] + dt * acceleration(x[i-1], v[i-1], **kwargs)
+        x[i] = x[i-1] + dt * v[i]
+
+    return x, v, {'steps': steps, 'dt': dt}
+
+
+def test_hit_returns_memory_mapped_result(tmp_path):
+    cache = Cache(tmp_path)
+
+    x, v, info = cache(euler, spring, 1.0, dt=0.01, steps=100, k=2.0)
+    x_hit, v_hit, info_hit = cache(euler, spring, 1.0, dt=0.01, steps=100, k=2.0)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert isinstance(x_hit, np.memmap)
+    assert np.array_equal(x, x_hit)
+    assert info_hit == info
+
+    cache(euler, spring, 1.0, dt=0.01, steps=100, k=3.0)
+    assert cache.misses == 2
+
+
+def test_source_change_and_invalidate(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    model = tmp_path / 'force_model.py'
+
+    model.write_text('def force(x, v):\n    return -x\n')
+    import force_model
+
+    cache = Cache(tmp_path / 'cache')
+    first = cache(euler, force_model.force, 1.0, dt=0.1, steps=10)[0]
+
+    model.write_text('def force(x, v):\n    return -2 * x\n')
+    importlib.reload(force_model)
+    second = cache(euler, force_model.force, 1.0, dt=0.1, steps=10)[0]
+
+    assert cache.misses == 2
+    assert not np.array_equal(first, second)
+
+    assert cache.invalidate(force_model.force) == 2
+    assert cache.entries() == []
+
+    del sys.modules['force_model']
+
+
+def test_global_force_model_change_and_invalidate(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    model = tmp_path / 'fall_model.py'
+
+    # As in GA1, the stepper calls a module-level acceleration directly.
+    source = """
+def acceleration(v):
+    return {} - 0.1 * v
+
+def fall(dt, steps):
+    v = 0.0
+    for _ in range(steps):
+        v += dt * acceleration(v)
+    return v
+"""
+
+    model.write_text(source.format(9.81))
+    import fall_model
+
+    cache = Cache(tmp_path / 'cache')
+    first = cache(fall_model.fall, 0.1, 100)
+
+    model.write_text(source.format(1.62))
+    importlib.reload(fall_model)
+    second = cache(fall_model.fall, 0.1, 100)
+
+    assert cache.misses == 2
+    assert second != first
+
+    assert cache.invalidate(fall_model.acceleration) == 2
+    assert cache.entries() == []
+
+    del sys.modules['fall_model']
+
+
+def test_least_recently_used_are_evicted(tmp_path):
+    cache = Cache(tmp_path, max_bytes=3 * 2 * 8 * 1000)
+
+    for k in [1.0, 2.0, 3.0]:
+        cache(euler, spring, 1.0, dt=0.01, steps=1000, k=k)
+
+    # Touch k=1, so adding k=4 evicts k=2.
+    cache(euler, spring, 1.0, dt=0.01, steps=1000, k=1.0)
+    cache(euler, spring, 1.0, dt=0.01, steps=1000, k=4.0)
+
+    assert len(cache.entries()) == 3
+
+    cache(euler, spring, 1.0, dt=0.01, steps=1000, k=1.0)
+    assert cache.hits == 2
+
+    cache(euler, spring, 1.0, dt=0.01, steps=1000, k=2.0)
+    assert cache.misses == 5
+
+
+def test_unhashable_argument(tmp_path):
+    with pytest.raises(TypeError):
+        Cache(tmp_path)(euler, spring, 1.0, dt=0.01, steps=10, k=iter([1]))
@@ -0,0 +1,127 @@
+''' Step-Size Convergence
+
+    "What dt is small enough?" can be answered without an exact solution.
+    A method of order p has error close to C * dt**p once dt is small, so
+    three runs at dt, dt/r and dt/r**2 giving q0, q1, q2 reveal the
+    observed order,
+
+            p = log(|q0 - q1| / |q1 - q2|) / log(r)
+
+    and the error left in each run (Richardson extrapolation),
+
+            error(q0) = |q0 - q1| / (1 - r**-p)
+
+    converge() halves dt until a run's estimated error meets the tolerance,
+    and returns the largest such dt, so only a few runs are ever made. The
+    extrapolated value
+
+            q = q1 + (q1 - q0) / (r**p - 1)
+
+    cancels the leading error term and is accurate to a higher order.
+'''
+
+import numpy as np
+
+from me273.adaptive_method import error_norm
+
+def observed_order(q0, q1, q2, ratio=2):
+    ''' Return the observed order of convergence from three runs. '''
+
+    d1 = np.sqrt(np.mean(np.square(np.subtract(q0, q1))))
+    d2 = np.sqrt(np.mean(np.square(np.subtract(q1, q2))))
+
+    if d2 == 0:
+        return np.inf
+
+    return np.log(d1 / d2) / np.log(ratio)
+
+def converge(run, dt, quantity=None, rtol=1e-3, atol=1e-6, ratio=2, max_runs=12, extrapolate=False):
+    ''' Return the largest dt, found by refinement, whose error meets tolerance.
+
+        Args:
+            run (func):             run(dt) returns a simulation result
+            dt (float):             first (largest) time step to try (s)
+            quantity (func):        maps a result to the numbers compared
+                                        between runs; they must not depend
+                                        on dt in shape (default np.asarray)
+            rtol (float):           relative tolerance
+            atol (float):           absolute tolerance
+            ratio (float):          factor dt is divided by between runs
+            max_runs (int):         most runs to make before giving up
+            extrapolate (bool):     return the Richardson-extrapolated value
+
+        Returns:
+            float:      the selected time step (s)
+            np.array:   quantity at that time step (or extrapolated)
+            dict:       'order', 'error' (estimated, of the returned value;
+                        for the extrapolated value, a bound),
+                        'extrapolated', 'result' (run's return at dt),
+                        'dts' and 'values' of every run
+
+        Raises:
+            RuntimeError:   if max_runs is reached first
+
+        Examples:
+            Find a dt for the GA1 bowling ball's impact speed to 0.1%.
+                >>> def impact(dt):
+                ...     return euler_projectile(mass, area, x0=440, dt=dt, events=[ground])
+                >>> dt, v, stats = converge(impact, 1.0, quantity=lambda r: r[2][-1], rtol=1e-3)
+    '''
+
+    if quantity is None:
+        quantity = np.asarray
+
+    dts = []
+    values = []
+    results = []
+
+    def refine():
+        step = dt / ratio**len(dts)
+        result = run(step)
+
+        dts.append(step)
+        values.append(np.asarray(quantity(result), dtype=np.float64))
+        results.append(result)
+
+        # Only the last three results can still be selected.
+        if len(results) > 3:
+            results[-4] = None
+
+    for _ in range(3):
+        refine()
+
+    while True:
+        q0, q1, q2 = values[-3:]
+        p = observed_order(q0, q1, q2, ratio)
+
+        # Check the coarsest run on the first pass; later it has failed already.
+        # Until the runs converge (p > 0) no error estimate can be trusted.
+        candidates = [-3, -2] if len(values) == 3 else [-2]
+        if not p > 0:
+            candidates = []
+
+        for k in candidates:
+            finer = values[k + 1]
+            error = np.abs(values[k] - finer) / (1 - ratio**-p) if np.isfinite(p) else np.zeros_like(finer)
+
+            if error_norm(error, values[k], finer, rtol, atol) <= 1:
+                extrapolated = finer + (finer - values[k]) / (ratio**p - 1) if np.isfinite(p) else finer
+
+                stats = {'order': p,
+                         'error': error,
+                         'extrapolated': extrapolated,
+                         'result': results[k],
+                         'dts': dts,
+                         'values': values}
+
+                if extrapolate:
+                    # Bounded by the error left in the finer run.
+                    stats['error'] = error / ratio**p
+                    return dts[k], extrapolated, stats
+
+                return dts[k], values[k], stats
+
+        if len(dts) >= max_runs:
+            raise RuntimeError('Not converged after %d runs, down to dt=%g.' % (len(dts), dts[-1]))
+
+        refine()
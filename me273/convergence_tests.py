@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from me273.convergence import converge, observed_order
+
+
+def decay(dt, k=1.0, tf=2.0):
+    ''' Euler run of x' = -k x from x = 1, return the final value. '''
+
+    x = 1.0
+    for _ in range(int(round(tf / dt))):
+        x += dt * -k * x
+
+    return x
+
+
+def test_observed_order():
+    assert observed_order(decay(0.1), decay(0.05), decay(0.025)) == pytest.approx(1, abs=0.05)
+
+
+def test_selected_dt_meets_tolerance():
+    exact = np.exp(-2.0)
+
+    dt, x, stats = converge(decay, 0.5, rtol=1e-3, atol=0)
+
+    assert abs(x - exact) <= 2e-3 * exact
+    assert stats['order'] == pytest.approx(1, abs=0.1)
+
+    # The next larger dt would not have met it.
+    assert abs(decay(2 * dt) - exact) > 1e-3 * exact
+    assert len(stats['dts']) <= 12
+
+
+def test_extrapolation_is_more_accurate():
+    exact = np.exp(-2.0)
+
+    dt, x, stats = converge(decay, 0.5, rtol=1e-3, atol=0)
+    dt_ex, x_ex, stats_ex = converge(decay, 0.5, rtol=1e-3, atol=0, extrapolate=True)
+
+    assert dt_ex == dt
+    assert abs(x_ex - exact) < 0.1 * abs(x - exact)
+
+
+def test_gives_up():
+    with pytest.raises(RuntimeError):
+        converge(decay, 0.5, rtol=1e-12, atol=0, max_runs=5)
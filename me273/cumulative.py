@@ -0,0 +1,252 @@
+''' Cumulative Integration of Sampled Data
+
+    Work, impulse and distance travelled are integrals of recorded
+    trajectories (t, v, a arrays) rather than of functions. One pass over
+    the samples builds the running integral
+
+            F[k] = integral of y from x[0] to x[k]
+
+    after which the integral over any interval (a, b) is F(b) - F(a): a
+    binary search and a few operations per query, however many are asked
+    for at once. Spacing may be non-uniform.
+
+    Methods:
+
+        'trapezoid':    straight lines between samples
+        'simpson':      on each interval, the parabola through it and the
+                        next sample (the previous one for the last
+                        interval), so unequal spacing is handled exactly
+
+    CumulativeIntegral takes the samples a chunk at a time, e.g. from a
+    Recorder callback, so a long simulation can be integrated as it runs.
+'''
+
+import numpy as np
+
+def parabola_integral(s, h0, h1, y0, y1, y2):
+    ''' Return the integral from 0 to s of the parabola through
+        (0, y0), (h0, y1), and (h0 + h1, y2).
+    '''
+
+    H = h0 + h1
+
+    w0 = (s**3 / 3 - (h0 + H) * s**2 / 2 + h0 * H * s) / (h0 * H)
+    w1 = -(s**3 / 3 - H * s**2 / 2) / (h0 * h1)
+    w2 = (s**3 / 3 - h0 * s**2 / 2) / (H * h1)
+
+    return w0 * y0 + w1 * y1 + w2 * y2
+
+def _column(h, y):
+    ''' Shape spacings h to broadcast against samples y of shape (n, ...). '''
+
+    return np.reshape(h, np.shape(h) + (1,) * (np.ndim(y) - 1))
+
+def interval_integrals(x, y, method='trapezoid'):
+    ''' Return the (n - 1, ...) integrals over each interval between samples.
+
+        Args:
+            x (np.array):   (n,) increasing sample points, e.g. times (s)
+            y (np.array):   (n, ...) samples
+            method (str):   'trapezoid' or 'simpson'
+
+        Returns:
+            np.array:       (n - 1, ...) interval integrals
+    '''
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    h = _column(np.diff(x), y)
+
+    if method == 'trapezoid' or x.size < 3:
+        return 0.5 * h * (y[:-1] + y[1:])
+
+    if method != 'simpson':
+        raise ValueError("method must be 'trapezoid' or 'simpson', not %r" % method)
+
+    h0, h1 = h[:-1], h[1:]
+
+    # Forward parabolas for all but the last interval...
+    D = np.empty((x.size - 1,) + y.shape[1:])
+    D[:-1] = parabola_integral(h0, h0, h1, y[:-2], y[1:-1], y[2:])
+
+    # ...which uses the parabola through the last three samples.
+    D[-1] = (parabola_integral(h0[-1] + h1[-1], h0[-1], h1[-1], y[-3], y[-2], y[-1]) -
+             parabola_integral(h0[-1], h0[-1], h1[-1], y[-3], y[-2], y[-1]))
+
+    return D
+
+def cumulative_integral(x, y, method='trapezoid', initial=0.0):
+    ''' Return the (n, ...) running integral of samples y over x.
+
+        Examples:
+            Work done on the GA2 oscillator's mass, W = m * integral(a * v dt).
+                >>> t, x, v, a = euler_method(acceleration, 0, 15, 0.01, x0=0.1, k=2.5, m=0.25)
+                >>> W = 0.25 * cumulative_integral(t, a * v, method='simpson')
+    '''
+
+    D = interval_integrals(x, y, method)
+    F = np.empty((D.shape[0] + 1,) + D.shape[1:])
+
+    F[0] = initial
+    np.cumsum(D, axis=0, out=F[1:])
+    F[1:] += initial
+
+    return F
+
+class CumulativeIntegral:
+    ''' Running integral of samples that arrive in chunks, queried over many intervals at once.
+
+        Args:
+            method (str):   'trapezoid' or 'simpson'
+            keep (bool):    keep the samples and running integral, needed
+                                for at() and between(); otherwise only the
+                                total is kept, in constant memory
+            chunk (int):    smallest number of samples to grow buffers by
+
+        Examples:
+            Distance flown by the rocket, queried for each stage.
+                >>> distance = CumulativeIntegral(method='simpson')
+                >>> distance.update(t, np.abs(v))
+                >>> distance.between([0, 165, 534], [165, 534, 983])
+
+            Impulse of a long run, integrated as it is recorded.
+                >>> impulse = CumulativeIntegral(keep=False)
+                >>> recorder = Recorder(final_only=True, callback=lambda t, x, v, a: impulse.update([t], [m * a]))
+    '''
+
+    def __init__(self, method='trapezoid', keep=True, chunk=4096):
+
+        if method not in ('trapezoid', 'simpson'):
+            raise ValueError("method must be 'trapezoid' or 'simpson', not %r" % method)
+
+        self.method = method
+        self.keep = keep
+        self.chunk = chunk
+
+        self.size = 0
+
+        # Samples and running integral; the last three only unless keep.
+        self._x = None
+        self._y = None
+        self._F = None
+        self._start = 0
+
+    def update(self, x, y):
+        ''' Append samples y at points x, which continue the increasing order. '''
+
+        x = np.asarray(x, dtype=np.float64).reshape(-1)
+        y = np.asarray(y, dtype=np.float64)
+
+        if x.size == 0:
+            return
+
+        old = self.size
+        self._append(x, y)
+
+        # Intervals from old - 2 on are new, or were provisional (the last
+        # Simpson interval) and can now use the next sample.
+        first = max(old - 2, 0)
+        context = max(old - 3, 0)
+
+        xs = self._x[context - self._start:self.size - self._start]
+        ys = self._y[context - self._start:self.size - self._start]
+
+        D = interval_integrals(xs, ys, self.method)[first - context:]
+
+        F = self._F[first - self._start]
+        self._F[first + 1 - self._start:self.size - self._start] = F + np.cumsum(D, axis=0)
+
+        if not self.keep:
+            self._trim()
+
+    @property
+    def total(self):
+        ''' Return the integral from the first sample to the last. '''
+
+        if self.size == 0:
+            return 0.0
+
+        return self._F[self.size - 1 - self._start].copy()
+
+    @property
+    def x(self):
+        ''' Return the sample points. '''
+
+        return self._x[:self.size - self._start]
+
+    @property
+    def F(self):
+        ''' Return the running integral at every sample point. '''
+
+        return self._F[:self.size - self._start]
+
+    def at(self, t):
+        ''' Return the integral from the first sample to t, for any array of t. '''
+
+        if not self.keep:
+            raise RuntimeError('at() needs the samples; create with keep=True.')
+
+        x, y, F = self.x, self._y[:self.size - self._start], self.F
+        t = np.asarray(t, dtype=np.float64)
+
+        if self.size < 2:
+            return np.zeros(t.shape + y.shape[1:])
+
+        i = np.clip(np.searchsorted(x, t, side='right') - 1, 0, self.size - 2)
+        s = _column(t - x[i], y)
+        h0 = _column(x[i + 1] - x[i], y)
+
+        if self.method == 'trapezoid' or self.size < 3:
+            y_t = y[i] + (y[i + 1] - y[i]) * s / h0
+            return F[i] + 0.5 * s * (y[i] + y_t)
+
+        # Same parabolas as interval_integrals: forward, or backward for the last.
+        j = np.minimum(i, self.size - 3)
+        h0 = _column(x[j + 1] - x[j], y)
+        h1 = _column(x[j + 2] - x[j + 1], y)
+        offset = _column(x[i] - x[j], y)
+
+        return F[i] + (parabola_integral(s + offset, h0, h1, y[j], y[j + 1], y[j + 2]) -
+                       parabola_integral(offset, h0, h1, y[j], y[j + 1], y[j + 2]))
+
+    def between(self, a, b):
+        ''' Return the integrals over the intervals (a, b), for arrays of a and b. '''
+
+        return self.at(b) - self.at(a)
+
+    def _append(self, x, y):
+        ''' Write new samples into the buffers, growing them as needed. '''
+
+        n = self.size - self._start + x.size
+
+        if self._x is None:
+            capacity = max(n, self.chunk)
+            self._x = np.empty(capacity)
+            self._y = np.empty((capacity,) + y.shape[1:])
+            self._F = np.empty((capacity,) + y.shape[1:])
+            self._F[0] = 0.0
+
+        elif n > self._x.shape[0]:
+            capacity = max(n, self._x.shape[0] + max(self.chunk, self._x.shape[0]))
+            for name in ('_x', '_y', '_F'):
+                old = getattr(self, name)
+                grown = np.empty((capacity,) + old.shape[1:])
+                grown[:self.size - self._start] = old[:self.size - self._start]
+                setattr(self, name, grown)
+
+        self._x[self.size - self._start:n] = x
+        self._y[self.size - self._start:n] = y
+        self.size += x.size
+
+    def _trim(self):
+        ''' Keep only the last three samples, all that later updates need. '''
+
+        keep = min(3, self.size - self._start)
+        drop = self.size - self._start - keep
+
+        if drop > 0:
+            for name in ('_x', '_y', '_F'):
+                buffer = getattr(self, name)
+                buffer[:keep] = buffer[drop:drop + keep].copy()
+
+            self._start += drop
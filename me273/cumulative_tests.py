@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from me273.cumulative import CumulativeIntegral, cumulative_integral
+
+
+def uneven(n=41, stop=3.0):
+    rng = np.random.default_rng(273)
+    x = np.sort(rng.uniform(0, stop, n))
+    x[0], x[-1] = 0, stop
+
+    return x
+
+
+def test_simpson_is_exact_for_quadratics_on_uneven_samples():
+    x = uneven()
+    F = cumulative_integral(x, 1 - 2 * x + 3 * x**2, method='simpson')
+
+    assert F == pytest.approx(x - x**2 + x**3, abs=1e-12)
+
+
+def test_trapezoid_matches_numpy():
+    x = uneven()
+    F = cumulative_integral(x, np.sin(x))
+
+    assert F[-1] == pytest.approx(np.trapezoid(np.sin(x), x), rel=1e-14)
+
+
+@pytest.mark.parametrize('method', ['trapezoid', 'simpson'])
+def test_chunks_match_whole_sample(method):
+    x = uneven()
+    y = np.stack([np.sin(x), np.cos(x)], axis=1)
+
+    whole = cumulative_integral(x, y, method=method)
+
+    chunked = CumulativeIntegral(method, chunk=4)
+    total = CumulativeIntegral(method, keep=False)
+    for start in range(0, x.size, 7):
+        chunked.update(x[start:start + 7], y[start:start + 7])
+        total.update(x[start:start + 7], y[start:start + 7])
+
+    assert chunked.F == pytest.approx(whole, abs=1e-14)
+    assert total.total == pytest.approx(whole[-1], abs=1e-14)
+
+    with pytest.raises(RuntimeError):
+        total.between(0, 1)
+
+
+def test_many_intervals():
+    x = np.linspace(0, np.pi, 2001)
+    integral = CumulativeIntegral('simpson')
+    integral.update(x, np.sin(x))
+
+    a = np.linspace(0, 1, 50)
+    b = a + np.linspace(0.1, 2, 50)
+
+    assert integral.between(a, b) == pytest.approx(np.cos(a) - np.cos(b), abs=1e-9)
+    assert integral.between(x[10], x[500]) == pytest.approx(integral.F[500] - integral.F[10], abs=1e-15)
@@ -0,0 +1,206 @@
+''' Events and Dense Output
+
+    A stepper only knows the state at the ends of each step. Stopping a
+    loop with a condition such as `while x >= xf` or `while v > 0` therefore
+    overshoots the moment of interest by up to one step.
+
+    Instead, every step is bridged with a Hermite interpolant built from the
+    recorded position, velocity and acceleration at both ends. An event
+    function g(t, x, v) is then root-found on that interpolant inside the
+    step where g changes sign, which places the event to within the accuracy
+    of the integrator rather than the size of dt.
+'''
+
+import numpy as np
+
+def hermite(s, h, x0, v0, a0, x1, v1, a1):
+    ''' Return position and velocity on the quintic Hermite interpolant.
+
+        The position is the quintic which matches x, v and a at both ends of
+        a step of length h. The velocity is its derivative.
+
+        Args:
+            s (np.array):   fraction of the step, 0 <= s <= 1
+            h (np.array):   step length (s)
+            x0, v0, a0:     position, velocity and acceleration at s = 0
+            x1, v1, a1:     position, velocity and acceleration at s = 1
+
+        Returns:
+            np.array:       position at s
+            np.array:       velocity at s
+    '''
+
+    s = np.asarray(s, dtype=np.float64)
+    h = np.asarray(h, dtype=np.float64)
+
+    # Broadcast the scalar weights over any vector dimensions of the state.
+    shape = np.shape(s) + (1,) * (np.ndim(x0) - np.ndim(s))
+    s = s.reshape(shape)
+    h = h.reshape(np.shape(h) + (1,) * (len(shape) - np.ndim(h)))
+
+    s2, s3, s4, s5 = s**2, s**3, s**4, s**5
+
+    x = ((1 - 10*s3 + 15*s4 - 6*s5) * x0
+         + (s - 6*s3 + 8*s4 - 3*s5) * h * v0
+         + (0.5*s2 - 1.5*s3 + 1.5*s4 - 0.5*s5) * h**2 * a0
+         + (10*s3 - 15*s4 + 6*s5) * x1
+         + (-4*s3 + 7*s4 - 3*s5) * h * v1
+         + (0.5*s3 - s4 + 0.5*s5) * h**2 * a1)
+
+    v = ((-30*s2 + 60*s3 - 30*s4) / h * (x0 - x1)
+         + (1 - 18*s2 + 32*s3 - 15*s4) * v0
+         + (s - 4.5*s2 + 6*s3 - 2.5*s4) * h * a0
+         + (-12*s2 + 28*s3 - 15*s4) * v1
+         + (1.5*s2 - 4*s3 + 2.5*s4) * h * a1)
+
+    return x, v
+
+class DenseOutput:
+    ''' Continuous solution through a recorded trajectory.
+
+        Any integrator in this course that returns t, x, v, and a can be
+        queried between its time steps without re-running it.
+
+        Examples:
+            Sample a coarse adaptive solution every millisecond.
+                >>> t, x, v, a, stats = dormand_prince(acceleration, 0, 10, x0=1.0, k=2.5, m=0.25)
+                >>> solution = DenseOutput(t, x, v, a)
+                >>> x_fine, v_fine = solution(np.arange(0, 10, 0.001))
+    '''
+
+    def __init__(self, t, x, v, a):
+
+        self.t = np.asarray(t, dtype=np.float64)
+        self.x = np.asarray(x, dtype=np.float64)
+        self.v = np.asarray(v, dtype=np.float64)
+        self.a = np.asarray(a, dtype=np.float64)
+
+    def __call__(self, t):
+        ''' Return position and velocity at time(s) t. '''
+
+        t = np.asarray(t, dtype=np.float64)
+
+        i = np.searchsorted(self.t, t, side='right') - 1
+        i = np.clip(i, 0, self.t.size - 2)
+
+        h = self.t[i + 1] - self.t[i]
+        s = (t - self.t[i]) / h
+
+        return hermite(s, h,
+                       self.x[i], self.v[i], self.a[i],
+                       self.x[i + 1], self.v[i + 1], self.a[i + 1])
+
+class Event:
+    ''' A function of state whose zero crossings are located during a run.
+
+        Args:
+            func (func):        g(t, x, v) which crosses zero at the event.
+            direction (int):    only trigger on crossings from negative to
+                                    positive (1), positive to negative (-1)
+                                    or either (0).
+            terminal (bool):    stop the integration at this event.
+
+        Examples:
+            Stop a falling object when it reaches the ground.
+                >>> ground = Event(lambda t, x, v: x, direction=-1, terminal=True)
+
+            Record every apogee of a bouncing object.
+                >>> apogee = Event(lambda t, x, v: v, direction=-1)
+    '''
+
+    def __init__(self, func, direction=0, terminal=False):
+
+        self.func = func
+        self.direction = direction
+        self.terminal = terminal
+
+    def __call__(self, t, x, v):
+        return self.func(t, x, v)
+
+def find_root(func, xl, xu, fl, fu, xtol, max_iterations=100):
+    ''' Return the root of func in [xl, xu] using the Illinois method.
+
+        False position with the retained endpoint's value halved whenever
+        the same endpoint is kept twice in a row, which avoids the slow
+        one-sided convergence of plain false position.
+    '''
+
+    side = 0
+    for _ in range(max_iterations):
+        xr = xu - fu * (xl - xu) / (fl - fu)
+        fr = func(xr)
+
+        if fr == 0 or abs(xu - xl) < xtol:
+            return xr
+
+        if fl * fr < 0:
+            xu, fu = xr, fr
+            if side == -1:
+                fl *= 0.5
+            side = -1
+        else:
+            xl, fl = xr, fr
+            if side == 1:
+                fu *= 0.5
+            side = 1
+
+    return xr
+
+class EventMonitor:
+    ''' Watches a list of events across the steps of an integrator.
+
+        Events may be Event objects or plain functions g(t, x, v), in which
+        case they trigger in both directions and are not terminal.
+
+        After each step the integrator calls step() with the state at both
+        ends of the step. Every crossing is located and recorded in
+        t_events, x_events and v_events (one list per event). If a
+        terminal event occurred, its (t, x, v) is returned so that the
+        integrator can end the run there.
+    '''
+
+    def __init__(self, events, t, x, v):
+
+        self.events = list(events)
+        self.g = [event(t, x, v) for event in self.events]
+
+        self.t_events = [[] for _ in self.events]
+        self.x_events = [[] for _ in self.events]
+        self.v_events = [[] for _ in self.events]
+
+    def step(self, t0, x0, v0, a0, t1, x1, v1, a1):
+        ''' Return (t, x, v) of the first terminal event in the step, or None. '''
+
+        h = t1 - t0
+        g1 = [event(t1, x1, v1) for event in self.events]
+
+        found = []
+        for i, event in enumerate(self.events):
+            direction = getattr(event, 'direction', 0)
+
+            up = self.g[i] < 0 <= g1[i]
+            down = self.g[i] > 0 >= g1[i]
+
+            if not ((up and direction >= 0) or (down and direction <= 0)):
+                continue
+
+            def g(s):
+                x, v = hermite(s, h, x0, v0, a0, x1, v1, a1)
+                return event(t0 + s * h, x, v)
+
+            s = find_root(g, 0.0, 1.0, self.g[i], g1[i], xtol=4 * np.finfo(float).eps)
+            found.append((s, i))
+
+        self.g = g1
+
+        for s, i in sorted(found):
+            x, v = hermite(s, h, x0, v0, a0, x1, v1, a1)
+
+            self.t_events[i].append(t0 + s * h)
+            self.x_events[i].append(x)
+            self.v_events[i].append(v)
+
+            if getattr(self.events[i], 'terminal', False):
+                return t0 + s * h, x, v
+
+        return None
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from me273.adaptive_method import dormand_prince
+from me273.events import DenseOutput, Event
+
+
+def oscillator(x, v, k=1.0, m=1.0):
+    return -1 * (k / m) * x
+
+
+def falling(x, v, area=0.01, mass=8.0, rho=1.225, g=9.80665, D=0.5):
+    return -1 * (g - ((D * rho * area) / (2 * mass)) * (v**2))
+
+
+def test_dense_output_between_steps():
+    t, x, v, a, stats = dormand_prince(oscillator, 0, 10, x0=1.0, rtol=1e-8, atol=1e-10)
+
+    solution = DenseOutput(t, x, v, a)
+    times = np.linspace(0, 10, 1001)
+    x_fine, v_fine = solution(times)
+
+    assert t.size < 200
+    assert x_fine == pytest.approx(np.cos(times), abs=1e-7)
+    assert v_fine == pytest.approx(-np.sin(times), abs=1e-7)
+
+
+def test_terminal_event_locates_impact():
+    k = (0.5 * 1.225 * 0.01) / (2 * 8.0)
+    t_impact = np.arccosh(np.exp(440 * k)) / np.sqrt(9.80665 * k)
+
+    ground = Event(lambda t, x, v: x, direction=-1, terminal=True)
+    t, x, v, a, stats = dormand_prince(falling, 0, np.inf, x0=440.0, rtol=1e-8, atol=1e-8, events=[ground])
+
+    assert stats['accepted'] < 50
+    assert stats['t_events'][0][0] == pytest.approx(t_impact, abs=1e-4)
+    assert t[-1] == stats['t_events'][0][0]
+    assert x[-1] == pytest.approx(0, abs=1e-9)
+
+
+def test_non_terminal_events_respect_direction():
+    peaks = Event(lambda t, x, v: v, direction=-1)
+    crossings = lambda t, x, v: x
+
+    t, x, v, a, stats = dormand_prince(oscillator, 0, 3.5 * np.pi, x0=0.0, v0=1.0, events=[peaks, crossings])
+
+    assert stats['t_events'][0] == pytest.approx([np.pi / 2, 5 * np.pi / 2], abs=1e-5)
+    assert stats['t_events'][1] == pytest.approx([np.pi, 2 * np.pi, 3 * np.pi], abs=1e-5)
+    assert t[-1] == 3.5 * np.pi
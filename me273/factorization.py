@@ -0,0 +1,133 @@
+''' Factor Once, Solve Many
+
+    Solving Ax = b costs O(n**3) to factor A but only O(n**2) per right-hand
+    side once the factors are known. Cramer's rule, the explicit inverse
+    and np.linalg.solve all start again from A on every call; when the same
+    A is solved against a stream of right-hand sides (every step of a
+    simulation, every load case of a structure) a Factorization keeps the
+    factors and pays only the O(n**2) triangular solves each time.
+
+    Methods:
+
+        'lu':           PA = LU with partial pivoting, for any nonsingular A
+        'cholesky':     A = U^T U, for symmetric positive definite A, half
+                        the work and storage of LU
+        'auto':         Cholesky if A is symmetric and it succeeds, else LU
+
+    The factors come from LAPACK through scipy.linalg.
+'''
+
+import warnings
+
+import numpy as np
+
+class Factorization:
+    ''' LU or Cholesky factors of a square matrix A, for repeated solves.
+
+        Args:
+            A (np.array):       (n, n) matrix
+            method (str):       'auto', 'lu' or 'cholesky'
+
+        Raises:
+            ValueError:                 if A is not square
+            np.linalg.LinAlgError:      if A is singular, or not positive
+                                            definite for method='cholesky'
+
+        Examples:
+            Factor the GA6 system once.
+                >>> solve = Factorization(A)
+                >>> x = solve(b)
+
+            Solve a block of right-hand sides, one per column.
+                >>> X = solve(np.column_stack([b1, b2, b3]))
+
+            Or a stream of them, solved a batch at a time.
+                >>> for x in solve.solve_stream(loads(), batch=64):
+                ...     record(x)
+    '''
+
+    def __init__(self, A, method='auto'):
+
+        from scipy import linalg
+
+        A = np.asarray(A, dtype=np.float64)
+
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise ValueError('A must be square, not of shape %s.' % (A.shape,))
+
+        if method not in ('auto', 'lu', 'cholesky'):
+            raise ValueError("method must be 'auto', 'lu' or 'cholesky', not %r" % method)
+
+        self.n = A.shape[0]
+        self.solves = 0
+
+        if method == 'cholesky' or (method == 'auto' and np.allclose(A, A.T, rtol=1e-12, atol=0)):
+            try:
+                self.factors = linalg.cho_factor(A, check_finite=False)
+                self.method = 'cholesky'
+                return
+            except np.linalg.LinAlgError:
+                if method == 'cholesky':
+                    raise
+
+        # A zero pivot is raised as an error below, not warned about.
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', linalg.LinAlgWarning)
+            lu, piv = linalg.lu_factor(A, check_finite=False)
+
+        if np.any(np.diag(lu) == 0):
+            raise np.linalg.LinAlgError('Singular matrix')
+
+        self.factors = (lu, piv)
+        self.method = 'lu'
+
+    def solve(self, b):
+        ''' Return x for Ax = b, for b of shape (n,) or a block (n, k). '''
+
+        from scipy import linalg
+
+        b = np.asarray(b, dtype=np.float64)
+
+        if b.shape[0] != self.n:
+            raise ValueError('b must have %d rows, not %d.' % (self.n, b.shape[0]))
+
+        self.solves += 1 if b.ndim == 1 else b.shape[1]
+
+        if self.method == 'cholesky':
+            return linalg.cho_solve(self.factors, b, check_finite=False)
+
+        return linalg.lu_solve(self.factors, b, check_finite=False)
+
+    __call__ = solve
+
+    def solve_stream(self, bs, batch=1):
+        ''' Yield x for each right-hand side b drawn from an iterable.
+
+            Right-hand sides are gathered into (n, batch) blocks, so that
+            each block is one call into LAPACK; a batch of 1 solves each b
+            as soon as it arrives.
+        '''
+
+        block = []
+
+        for b in bs:
+            block.append(b)
+
+            if len(block) == batch:
+                yield from self.solve(np.column_stack(block)).T
+                block = []
+
+        if block:
+            yield from self.solve(np.column_stack(block)).T
+
+    @property
+    def det(self):
+        ''' Return the determinant of A, from the factors. '''
+
+        if self.method == 'cholesky':
+            return np.prod(np.diag(self.factors[0]))**2
+
+        lu, piv = self.factors
+        swaps = np.count_nonzero(piv != np.arange(self.n))
+
+        return (-1)**swaps * np.prod(np.diag(lu))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from me273.factorization import Factorization
+
+# GA6 Exercise 2.
+A = np.asarray([[27.6, -123.5, -97.8],
+                [45.5,  100.3,   2.1],
+                [ 1.2,   67.3,  99.4]])
+
+b = np.asarray([-11.0, 744.3, 7.7])
+
+
+def test_lu_matches_numpy():
+    solve = Factorization(A)
+
+    assert solve.method == 'lu'
+    assert solve(b) == pytest.approx(np.linalg.solve(A, b), rel=1e-12)
+    assert solve.det == pytest.approx(np.linalg.det(A), rel=1e-12)
+
+
+def test_cholesky_for_symmetric_positive_definite():
+    rng = np.random.default_rng(273)
+    M = rng.normal(size=(50, 50))
+    S = M @ M.T + 50 * np.eye(50)
+    B = rng.normal(size=(50, 4))
+
+    solve = Factorization(S)
+
+    assert solve.method == 'cholesky'
+    assert solve(B) == pytest.approx(np.linalg.solve(S, B), rel=1e-10)
+    assert solve.det == pytest.approx(np.linalg.det(S), rel=1e-10)
+
+    # Symmetric but indefinite falls back to LU.
+    assert Factorization(S - 100 * np.eye(50)).method == 'lu'
+
+    with pytest.raises(np.linalg.LinAlgError):
+        Factorization(S - 100 * np.eye(50), method='cholesky')
+
+
+def test_stream_matches_block():
+    rng = np.random.default_rng(273)
+    B = rng.normal(size=(3, 10))
+    solve = Factorization(A)
+
+    streamed = np.column_stack(list(solve.solve_stream(iter(B.T), batch=4)))
+
+    assert streamed == pytest.approx(solve(B), rel=1e-12)
+    assert solve.solves == 20
+
+
+def test_singular():
+    with pytest.raises(np.linalg.LinAlgError):
+        Factorization([[1.0, 2.0], [2.0, 4.0]], method='lu')
@@ -0,0 +1,210 @@
+''' Instrumentation
+
+    When a run is slow, the first questions are how many times the
+    acceleration was evaluated, how many steps were taken (and rejected),
+    how many iterations a solver needed, and where the time went. Printing
+    every step (the verbose flags) answers them, but slows the loop far
+    more than the work it reports on.
+
+    A Probe answers them instead. While one is open, the integrators and
+    solvers of this package and of the activities add to its counters:
+
+        'steps'         steps taken by an integrator
+        'rejected'      steps rejected by an adaptive integrator
+        'iterations'    solver iterations
+        'evaluations'   function evaluations made by a solver
+        'acceleration'  calls to an integrator's acceleration (or, for a
+                        first-order integrator, derivative) function
+
+    and time their phases (e.g. Rocket.launch's 'burn' and 'coast').
+
+        >>> with Probe() as probe:
+        ...     rocket.launch(dt=0.1)
+        >>> probe.counters
+        {'steps': 2883, ...}
+        >>> probe.timers
+        {'burn': 0.061, 'coast': 0.004}
+
+    Every finished phase, and every counter when the probe closes, is also
+    sent to its sink: a MemorySink, a CSVSink, or any function called as
+    sink(kind, name, value).
+
+    With no probe open, instrumented code costs one check per call, before
+    its loop: counted() hands back the function it is given, count() and
+    phase() return at once. Probes belong to the process (and thread) that
+    opened them; the workers of a process pool are not seen.
+'''
+
+import csv
+import time
+
+_probes = []
+
+def active():
+    ''' Return the innermost open Probe, or None. '''
+
+    return _probes[-1] if _probes else None
+
+def count(name, n=1):
+    ''' Add n to counter name of the open Probe, if any. '''
+
+    if _probes:
+        _probes[-1].count(name, n)
+
+def counted(func, name):
+    ''' Return func, counting its calls as name while a Probe is open.
+
+        Wrap once, before a loop: with no probe open func itself is
+        returned, and the loop runs as if uninstrumented.
+    '''
+
+    if not _probes:
+        return func
+
+    counters = _probes[-1].counters
+
+    def wrapper(*args, **kwargs):
+        counters[name] = counters.get(name, 0) + 1
+        return func(*args, **kwargs)
+
+    return wrapper
+
+class _Null:
+    ''' A context manager that does nothing, for phases with no probe open. '''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_null = _Null()
+
+def phase(name):
+    ''' Return a context manager timing a phase of the open Probe, if any. '''
+
+    if not _probes:
+        return _null
+
+    return _probes[-1].phase(name)
+
+class _Phase:
+
+    def __init__(self, probe, name):
+
+        self.probe = probe
+        self.name = name
+
+    def __enter__(self):
+
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+
+        self.probe.time(self.name, time.perf_counter() - self.start)
+        return False
+
+class Probe:
+    ''' Counters and phase timers, filled by instrumented code while open.
+
+        Probes nest; only the innermost open one is filled.
+
+        Args:
+            sink:   MemorySink, CSVSink, or function sink(kind, name, value),
+                        sent ('timer', phase, seconds) as each phase ends and
+                        ('counter', name, total) when the probe closes
+
+        Examples:
+            Steps and acceleration evaluations of an adaptive run.
+                >>> with Probe() as probe:
+                ...     dormand_prince(acceleration, 0, 10, x0, v0, rtol=1e-9)
+                >>> probe.counters['rejected'], probe.counters['acceleration']
+
+            Log every phase of a batch of launches to a file.
+                >>> with Probe(sink=CSVSink('launches.csv')):
+                ...     for rocket in rockets:
+                ...         rocket.launch(0.1)
+
+            Time a phase of your own.
+                >>> with Probe() as probe:
+                ...     with phase('setup'):
+                ...         A = poisson(1000)
+    '''
+
+    def __init__(self, sink=None):
+
+        self.counters = {}
+        self.timers = {}
+        self.sink = sink
+
+    def count(self, name, n=1):
+        ''' Add n to counter name. '''
+
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def time(self, name, seconds):
+        ''' Add seconds to the timer of phase name. '''
+
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+        if self.sink is not None:
+            self.sink('timer', name, seconds)
+
+    def phase(self, name):
+        ''' Return a context manager adding its duration to timer name. '''
+
+        return _Phase(self, name)
+
+    def __enter__(self):
+
+        _probes.append(self)
+        return self
+
+    def __exit__(self, *exc):
+
+        _probes.remove(self)
+
+        if self.sink is not None:
+            for name, total in self.counters.items():
+                self.sink('counter', name, total)
+
+            if hasattr(self.sink, 'close'):
+                self.sink.close()
+
+        return False
+
+class MemorySink:
+    ''' Keeps every (kind, name, value) record sent to it, in records. '''
+
+    def __init__(self):
+
+        self.records = []
+
+    def __call__(self, kind, name, value):
+
+        self.records.append((kind, name, value))
+
+class CSVSink:
+    ''' Writes every record sent to it as a row of a CSV file,
+
+            time,kind,name,value
+
+        time being seconds since the sink was made.
+    '''
+
+    def __init__(self, path):
+
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(['time', 'kind', 'name', 'value'])
+        self.start = time.perf_counter()
+
+    def __call__(self, kind, name, value):
+
+        self.writer.writerow(['%.6f' % (time.perf_counter() - self.start), kind, name, value])
+
+    def close(self):
+        ''' Close the file. '''
+
+        self.file.close()
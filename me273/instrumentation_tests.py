@@ -0,0 +1,112 @@
+import csv
+
+import numpy as np
+import pytest
+
+from me273.adaptive_method import dormand_prince
+from me273.instrumentation import CSVSink, MemorySink, Probe, active, count, counted, phase
+from me273.roots import bracket, brent
+from me273.sparse import cg, poisson
+from me273.symplectic_method import symplectic_method
+
+
+def spring(x, v, k=4.0):
+    return -k * x
+
+
+def test_disabled_costs_nothing():
+    assert active() is None
+    assert counted(spring, 'acceleration') is spring
+
+    with phase('anything'):
+        count('steps')
+
+    assert active() is None
+
+
+def test_integrator_counters():
+    with Probe() as probe:
+        symplectic_method(spring, 0, 1, 0.01, x0=1.0, method='verlet')
+
+    # One evaluation to start, one per Verlet step.
+    assert probe.counters == {'steps': 100, 'acceleration': 101}
+    assert active() is None
+
+
+def test_adaptive_counts_rejected_steps():
+    with Probe() as probe:
+        t, x, v, a, stats = dormand_prince(spring, 0, 10, x0=1.0, v0=0.0, dt=5.0, rtol=1e-9)
+
+    assert stats['rejected'] > 0
+    assert probe.counters == {'steps': stats['accepted'], 'rejected': stats['rejected'],
+                              'acceleration': stats['evaluations']}
+
+
+def test_solver_counters():
+    A = poisson(10)
+
+    with Probe() as probe:
+        roots, bracket_stats = bracket(lambda x: x**2 - 2, 0, 2, e_req=1e-10)
+        root, brent_stats = brent(lambda x: x**2 - 2, 0, 2)
+        x, cg_stats = cg(A, np.ones(A.shape[0]))
+
+    assert probe.counters['iterations'] == (bracket_stats['iterations']
+                                            + brent_stats['iterations'] + cg_stats['iterations'])
+    assert probe.counters['evaluations'] == bracket_stats['evaluations'] + brent_stats['evaluations']
+
+
+def test_phases_and_nesting():
+    with Probe() as outer:
+        with phase('setup'):
+            count('steps', 2)
+
+        with Probe() as inner:
+            with phase('run'):
+                count('steps')
+
+        with phase('setup'):
+            pass
+
+    assert outer.counters == {'steps': 2}
+    assert inner.counters == {'steps': 1}
+    assert set(outer.timers) == {'setup'}
+    assert set(inner.timers) == {'run'}
+    assert outer.timers['setup'] >= 0
+
+
+def test_memory_and_callback_sinks():
+    sink = MemorySink()
+    seen = []
+
+    with Probe(sink=sink):
+        with Probe(sink=lambda *record: seen.append(record)):
+            count('iterations', 3)
+
+        with phase('solve'):
+            count('iterations', 4)
+
+    assert seen == [('counter', 'iterations', 3)]
+    assert [r[:2] for r in sink.records] == [('timer', 'solve'), ('counter', 'iterations')]
+    assert sink.records[-1][2] == 4
+
+
+def test_csv_sink(tmp_path):
+    path = tmp_path / 'probe.csv'
+
+    with Probe(sink=CSVSink(path)):
+        with phase('burn'):
+            count('steps', 10)
+
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+
+    assert [(r['kind'], r['name']) for r in rows] == [('timer', 'burn'), ('counter', 'steps')]
+    assert rows[1]['value'] == '10'
+
+
+def test_probe_closes_on_error():
+    with pytest.raises(ValueError):
+        with Probe():
+            raise ValueError
+
+    assert active() is None
@@ -0,0 +1,193 @@
+''' Linear Method
+
+    A mass on a spring, with or without damping and a driving force,
+
+            m x'' + c x' + k x = F0 + F cos(w t)
+
+    is linear in its state. Augmenting the state with the forcing terms,
+
+            y = [x, v, 1, cos(w t), sin(w t)]
+
+    turns it into y' = A y for a constant matrix A, whose exact solution is
+
+            y(t + dt) = expm(A dt) y(t)
+
+    so the one-step state-transition matrix expm(A dt) is computed once and
+    each step is a single matrix product, exact for any dt. For output at
+    arbitrary times A is diagonalized, A = V diag(l) V**-1, and
+
+            y(t) = V diag(exp(l t)) V**-1 y(0)
+
+    is evaluated for all times at once with one matrix product.
+'''
+
+import numpy as np
+
+from me273.recording import Recorder, step_count
+
+class LinearOscillator:
+    ''' A damped, driven linear oscillator with exact time stepping.
+
+        Args:
+            k (float):          spring constant (N/m)
+            m (float):          mass (kg)
+            c (float):          damping coefficient (N*s/m)
+            force (float):      constant force, e.g. gravity (N)
+            drive (float):      amplitude of the driving force (N)
+            frequency (float):  angular frequency of the driving force (rad/s)
+
+        Examples:
+            A million samples of the GA2 oscillator.
+                >>> oscillator = LinearOscillator(k=2.5, m=0.250)
+                >>> x, v = oscillator.evaluate(np.linspace(0, 100, 10**6), x0=0.1)
+
+            Step it like euler_method, exactly and at any step size.
+                >>> t, x, v, a = oscillator.run(0, 15, dt=0.5, x0=0.1)
+    '''
+
+    def __init__(self, k, m, c=0.0, force=0.0, drive=0.0, frequency=0.0):
+
+        self.k = k
+        self.m = m
+        self.c = c
+        self.force = force
+        self.drive = drive
+        self.frequency = frequency
+
+        w = frequency
+
+        self.A = np.asarray([[0.0,    1.0,    0.0,       0.0,       0.0],
+                             [-k / m, -c / m, force / m, drive / m, 0.0],
+                             [0.0,    0.0,    0.0,       0.0,       0.0],
+                             [0.0,    0.0,    0.0,       0.0,       -w ],
+                             [0.0,    0.0,    0.0,       w,         0.0]])
+
+        self._transitions = {}
+        self._eigen = None
+
+    def acceleration(self, x, v, t=0.0):
+        ''' Return acceleration (m/s**2) at position x, velocity v and time t. '''
+
+        drive = self.drive * np.cos(self.frequency * t)
+
+        return (self.force + drive - self.k * x - self.c * v) / self.m
+
+    def state(self, x, v, t=0.0):
+        ''' Return the augmented (5, ...) state at position x, velocity v and time t. '''
+
+        x, v, t = np.broadcast_arrays(*(np.asarray(z, dtype=np.float64) for z in (x, v, t)))
+        wt = self.frequency * t
+
+        return np.stack([x, v, np.ones_like(x), np.cos(wt), np.sin(wt)])
+
+    def transition(self, dt):
+        ''' Return the (5, 5) state-transition matrix expm(A dt), cached by dt. '''
+
+        if dt not in self._transitions:
+            from scipy.linalg import expm
+            self._transitions[dt] = expm(self.A * dt)
+
+        return self._transitions[dt]
+
+    def run(self, t0, tf, dt, x0=0, v0=0, recorder=None):
+        ''' Returns t, x, v, and a arrays stepping exactly from t0 to tf.
+
+            x0 and v0 may be arrays, to run many oscillators at once.
+
+            Args:
+                t0 (float):           initial time (s)
+                tf (float):           final time (s)
+                dt (float):           time step (s)
+                x0 (float):           initial displacement (m)
+                v0 (float):           intiial velocity (m/s)
+                recorder (Recorder):  records each step (see me273.recording)
+
+            Returns:
+                float (np.array): times (s)
+                float (np.array): positions (m)
+                float (np.array): velocities (m/s)
+                float (np.array): acceleration (m/s**2)
+        '''
+
+        steps = step_count(t0, tf, dt)
+
+        if recorder is None:
+            recorder = Recorder(steps=steps + 1)
+
+        phi = self.transition(dt)
+
+        y = self.state(x0, v0, t0)
+        shape = y.shape[1:]
+        y = y.reshape(5, -1)
+
+        for i in range(steps + 1):
+            if i:
+                y = phi @ y
+
+            x = y[0].reshape(shape)
+            v = y[1].reshape(shape)
+            a = (self.A[1] @ y).reshape(shape)
+
+            recorder.record(t0 + i * dt, x, v, a)
+
+        return recorder.arrays()
+
+    def evaluate(self, t, x0=0, v0=0, t0=0.0, chunk=65536):
+        ''' Return x and v at every time in t, starting from x0 and v0 at t0.
+
+            Args:
+                t (np.array):   (N,) times (s)
+                x0 (float):     initial displacement (m), or an array of them
+                v0 (float):     initial velocity (m/s), or an array of them
+                t0 (float):     initial time (s)
+                chunk (int):    times per call when A cannot be diagonalized
+
+            Returns:
+                np.array:       (N, ...) positions (m)
+                np.array:       (N, ...) velocities (m/s)
+        '''
+
+        tau = np.ravel(np.asarray(t, dtype=np.float64) - t0)
+
+        y0 = self.state(x0, v0, t0)
+        shape = y0.shape[1:]
+        y0 = y0.reshape(5, -1)
+
+        V, l, c = self.eigen(y0)
+
+        if V is not None:
+            # Scale each eigen-coordinate by exp(l t) and map back in one product.
+            E = np.exp(np.multiply.outer(tau, l))
+            Z = E[:, :, np.newaxis] * c
+            y = (V @ Z.transpose(1, 0, 2).reshape(5, -1)).real
+            y = y.reshape(5, tau.size, -1)
+        else:
+            # Defective A (critical damping, or driving at resonance).
+            from scipy.linalg import expm
+
+            y = np.empty((5, tau.size, y0.shape[1]))
+            for start in range(0, tau.size, chunk):
+                phi = expm(self.A * tau[start:start + chunk, np.newaxis, np.newaxis])
+                y[:, start:start + chunk] = (phi @ y0).transpose(1, 0, 2)
+
+        shape = np.shape(t) + shape
+
+        return y[0].reshape(shape), y[1].reshape(shape)
+
+    def eigen(self, y0):
+        ''' Return V, l, and V**-1 y0, or None's if A is not diagonalizable. '''
+
+        if self._eigen is None:
+            l, V = np.linalg.eig(self.A)
+
+            if np.linalg.cond(V) > 1e8:
+                self._eigen = (None, None, None)
+            else:
+                self._eigen = (V, l, np.linalg.inv(V))
+
+        V, l, V_inv = self._eigen
+
+        if V is None:
+            return None, None, None
+
+        return V, l, V_inv @ y0
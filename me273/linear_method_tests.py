@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from me273.linear_method import LinearOscillator
+
+
+def test_run_is_exact_at_any_step():
+    k, m, x0 = 2.5, 0.250, 0.10
+    w = np.sqrt(k / m)
+
+    t, x, v, a = LinearOscillator(k, m).run(0, 100, dt=2.0, x0=x0)
+
+    assert t[-1] == 100
+    assert x == pytest.approx(x0 * np.cos(w * t), abs=1e-13)
+    assert v == pytest.approx(-x0 * w * np.sin(w * t), abs=1e-12)
+    assert a == pytest.approx(-(k / m) * x, abs=1e-12)
+
+
+def test_evaluate_matches_run():
+    oscillator = LinearOscillator(k=2.5, m=0.250, c=0.1, force=2.45, drive=1.0, frequency=2.0)
+
+    t, x, v, a = oscillator.run(0, 20, dt=0.1, x0=[0.1, 0.2], v0=[0.0, -1.0])
+    x_t, v_t = oscillator.evaluate(t, x0=[0.1, 0.2], v0=[0.0, -1.0])
+
+    assert x_t.shape == x.shape == (t.size, 2)
+    assert x_t == pytest.approx(x, abs=1e-12)
+    assert v_t == pytest.approx(v, abs=1e-12)
+
+
+def test_driven_damped_matches_reference():
+    from scipy.integrate import solve_ivp
+
+    oscillator = LinearOscillator(k=2.5, m=0.250, c=0.1, force=2.45, drive=1.0, frequency=2.0)
+    t = np.linspace(0, 20, 201)
+
+    reference = solve_ivp(lambda t, y: [y[1], oscillator.acceleration(y[0], y[1], t)],
+                          (0, 20), [0.1, 0.0], t_eval=t, rtol=1e-11, atol=1e-12)
+    x, v = oscillator.evaluate(t, x0=0.1)
+
+    assert x == pytest.approx(reference.y[0], abs=1e-9)
+    assert v == pytest.approx(reference.y[1], abs=1e-9)
+
+
+def test_critical_damping_falls_back_to_expm():
+    k, m, x0 = 2.5, 0.250, 0.10
+    w = np.sqrt(k / m)
+    oscillator = LinearOscillator(k, m, c=2 * np.sqrt(k * m))
+
+    t = np.linspace(0, 5, 1001)
+    x, v = oscillator.evaluate(t, x0=x0, chunk=100)
+
+    assert oscillator.eigen(np.zeros((5, 1)))[0] is None
+    assert x == pytest.approx(x0 * (1 + w * t) * np.exp(-w * t), abs=1e-14)
@@ -0,0 +1,64 @@
+''' Plotting
+
+    Importing matplotlib.pyplot takes longer than everything else in a
+    simulation's start-up put together, and a worker process that only
+    computes never needs it. So the numerical modules never import it;
+    figures are drawn here, and pyplot is imported on the first call.
+'''
+
+def pyplot():
+    ''' Return matplotlib.pyplot, importing it on first use. '''
+
+    import matplotlib.pyplot as plt
+
+    return plt
+
+def kinematics_plots(t, x, v, a, xe=None, ve=None, ae=None, title=None, show=True):
+    ''' Graph set of plots for kinematics lists.
+
+    Args:
+        t (list):   list of times
+        x (list):   list of positions (m)
+        v (list):   list of velocities (m/s)
+        a (list):   list of accelerations (m/s**2)
+
+        Optional:
+
+        xe (list):  list of exact solution positions (m)
+        ve (list):  list of exact solution velocities (m/s)
+        ae (list):  list of exact solution accelerations (m/s**2)
+        title (str):    title of the top plot
+        show (bool):    show the figure
+
+    Returns:
+        Figure:     the figure
+    '''
+
+    plt = pyplot()
+
+    f, (ax, av, aa) = plt.subplots(3, sharex=True)
+
+    if title: ax.set_title(title)
+
+    ax.plot(t, x, color='black', linestyle='-')
+    av.plot(t, v, color='black', linestyle='-')
+    aa.plot(t, a, color='black', linestyle='-')
+
+    if xe is not None: ax.plot(t, xe, color='black', linestyle='--')
+    if ve is not None: av.plot(t, ve, color='black', linestyle='--')
+    if ae is not None: aa.plot(t, ae, color='black', linestyle='--')
+
+    for axis in (ax, av, aa):
+        axis.grid(which='both', linestyle=':')
+        axis.tick_params(which='both', direction='in')
+
+    ax.set_ylabel('Position ($m$)')
+    av.set_ylabel('Velocity ($m/s$)')
+    aa.set_ylabel('Acceleration ($m/s^2$)')
+
+    aa.set_xlabel('Time ($s$)')
+
+    if show:
+        plt.show()
+
+    return f
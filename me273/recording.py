@@ -0,0 +1,150 @@
+''' Trajectory Recording
+
+    Appending t, x, v, and a to Python lists on every step boxes each value
+    as a separate float object and copies everything again when the lists
+    are turned into arrays. For small dt over long runs that dominates both
+    memory and run time.
+
+    A Recorder writes each step straight into preallocated NumPy buffers,
+    which grow a chunk at a time if the number of steps is not known up
+    front. It can also keep only every k-th step, or only the final state,
+    and hand every step to a callback so that memory stays bounded however
+    long the run.
+'''
+
+import numpy as np
+
+def step_count(t0, tf, dt):
+    ''' Return the number of steps a `while t < tf: t += dt` loop takes.
+
+        Args:
+            t0 (float):     initial time (s)
+            tf (float):     final time (s)
+            dt (float):     time step (s)
+
+        Returns:
+            int:            number of steps, not counting the initial state
+    '''
+
+    return max(int(np.ceil((tf - t0) / dt)), 0)
+
+class Recorder:
+    ''' Records the t, x, v, and a of a stepper into NumPy buffers.
+
+        Args:
+            steps (int):        expected number of record() calls, used to
+                                    size the buffers exactly (optional)
+            record_every (int): keep every k-th state (the final state is
+                                    always kept)
+            final_only (bool):  keep only the final state
+            callback (func):    called as callback(t, x, v, a) on every step
+            chunk (int):        smallest number of states to grow by when
+                                    the buffers fill up
+
+        Examples:
+            Keep every 100th step of a long, fine-grained fall.
+                >>> recorder = Recorder(record_every=100)
+                >>> t, x, v, a = euler_projectile(mass, area, x0=440, dt=1e-5, recorder=recorder)
+
+            Track the peak speed without storing the trajectory.
+                >>> peak = []
+                >>> recorder = Recorder(final_only=True, callback=lambda t, x, v, a: peak.append(abs(v)))
+    '''
+
+    def __init__(self, steps=None, record_every=1, final_only=False, callback=None, chunk=4096):
+
+        self.record_every = record_every
+        self.final_only = final_only
+        self.callback = callback
+        self.chunk = chunk
+
+        if final_only:
+            self.capacity = 1
+        elif steps is not None:
+            # Every k-th state, plus the final state if it is off the stride,
+            # and always room for the initial state (a run with t0 == tf).
+            steps = max(steps, 1)
+            self.capacity = (steps - 1) // record_every + 1 + bool((steps - 1) % record_every)
+        else:
+            self.capacity = chunk
+
+        self.count = 0
+        self.size = 0
+
+        self.t = None
+        self.x = None
+        self.v = None
+        self.a = None
+
+        self._last = None
+        self._last_stored = False
+
+    def record(self, t, x, v, a):
+        ''' Record the state of one step. '''
+
+        if self.callback is not None:
+            self.callback(t, x, v, a)
+
+        i = self.count
+        self.count += 1
+
+        if self.final_only or i % self.record_every:
+            self._last = (t, x, v, a)
+            self._last_stored = False
+        else:
+            self._store(t, x, v, a)
+            self._last_stored = True
+
+    def arrays(self):
+        ''' Return t, x, v, and a arrays of the recorded states.
+
+            The final state is always included, even if it does not fall on
+            the record_every stride.
+        '''
+
+        if self._last is not None and not self._last_stored:
+            if self.final_only:
+                self.size = 0
+
+            self._store(*self._last)
+            self._last_stored = True
+
+        if self.t is None:
+            return np.empty(0), np.empty(0), np.empty(0), np.empty(0)
+
+        return (self.t[:self.size], self.x[:self.size],
+                self.v[:self.size], self.a[:self.size])
+
+    def _store(self, t, x, v, a):
+        ''' Write one state into the buffers, allocating or growing them. '''
+
+        if self.t is None:
+            shape = np.shape(x)
+
+            self.t = np.empty(self.capacity)
+            self.x = np.empty((self.capacity,) + shape)
+            self.v = np.empty((self.capacity,) + shape)
+            self.a = np.empty((self.capacity,) + shape)
+
+        elif self.size == self.capacity:
+            # Grow by whole chunks, at least doubling so that unknown-length
+            # runs cost amortized O(1) per step.
+            self.capacity += max(self.chunk, self.capacity)
+
+            self.t = self._grow(self.t)
+            self.x = self._grow(self.x)
+            self.v = self._grow(self.v)
+            self.a = self._grow(self.a)
+
+        self.t[self.size] = t
+        self.x[self.size] = x
+        self.v[self.size] = v
+        self.a[self.size] = a
+
+        self.size += 1
+
+    def _grow(self, buffer):
+        grown = np.empty((self.capacity,) + buffer.shape[1:])
+        grown[:self.size] = buffer[:self.size]
+
+        return grown
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from me273.recording import Recorder, step_count
+
+
+def run(recorder, steps, shape=()):
+    for i in range(steps):
+        recorder.record(float(i), np.full(shape, i), np.full(shape, -i), np.full(shape, 2 * i))
+
+    return recorder.arrays()
+
+
+def test_step_count_matches_loop():
+    t, steps = 0.0, 0
+    while t < 15:
+        t += 0.25
+        steps += 1
+
+    assert step_count(0, 15, 0.25) == steps
+
+
+def test_buffers_grow_by_chunk():
+    recorder = Recorder(chunk=16)
+    t, x, v, a = run(recorder, 1000, shape=(2,))
+
+    assert x.shape == (1000, 2)
+    assert t == pytest.approx(np.arange(1000))
+    assert a[:, 1] == pytest.approx(2 * np.arange(1000))
+
+
+def test_exact_size_when_steps_known():
+    recorder = Recorder(steps=101)
+    run(recorder, 101)
+
+    assert recorder.capacity == recorder.size == 101
+
+
+def test_zero_steps_keeps_initial_state():
+    # step_count(t0, tf, dt) is 0 when t0 == tf.
+    t, x, v, a = run(Recorder(steps=0), 1)
+
+    assert list(t) == [0]
+
+
+def test_record_every_keeps_final_state():
+    t, x, v, a = run(Recorder(record_every=10), 95)
+
+    assert list(t) == list(range(0, 95, 10)) + [94]
+
+
+def test_final_only_with_callback():
+    seen = []
+    recorder = Recorder(final_only=True, callback=lambda t, x, v, a: seen.append(t))
+
+    t, x, v, a = run(recorder, 50)
+
+    assert list(t) == [49] and list(v) == [-49]
+    assert len(seen) == 50
@@ -0,0 +1,367 @@
+''' Root Finding
+
+    Bracketing methods for many problems at once. Solving the parachutist
+    drag coefficient for thousands of (m, v, t) combinations one call at a
+    time is thousands of Python loops; bracket() instead keeps arrays of
+    bracket endpoints and advances every unconverged problem together, so
+    each iteration is a single vectorized evaluation of func.
+
+    Each problem stops on its own when the approximate relative error
+
+            |x_new - x_old| / |x_new| < e_req
+
+    is met (or func is exactly zero), and reports its iteration count.
+
+    Methods:
+
+        'bisection':        midpoint of the bracket
+        'false_position':   root of the line through the bracket endpoints
+
+    For functions that are whole simulations, where every call costs
+    seconds, brent() finds one root in as few evaluations as possible:
+    inverse quadratic and secant steps where they are safe, bisection
+    where they are not, every value cached, and a hard max_evals budget.
+
+    find_roots() replaces the graphical method: rather than plotting and
+    zooming in by hand, it samples func over an interval, brackets every
+    sign change, halves the intervals between samples wherever func bends
+    enough that a pair of roots could hide between them, and polishes all
+    the brackets at once with bracket().
+'''
+
+import numpy as np
+
+from me273.instrumentation import count
+
+def next_point(method, xl, xu, fl, fu):
+    ''' Return the next estimate inside brackets (xl, xu) with values fl, fu. '''
+
+    if method == 'bisection':
+        return 0.5 * (xl + xu)
+
+    if method == 'false_position':
+        return xu - fu * (xl - xu) / (fl - fu)
+
+    raise ValueError("method must be 'bisection' or 'false_position', not %r" % method)
+
+def bracket(func, xl, xu, args=(), method='bisection', e_req=0.001, max_iterations=100, verbose=False):
+    ''' Return roots of func within brackets (xl, xu), solved together.
+
+        Args:
+            func (func):            vectorized function, func(x, *args)
+            xl (np.array):          lower bounds, any shape
+            xu (np.array):          upper bounds, broadcastable with xl
+            args (tuple):           parameters broadcastable with the
+                                        brackets, one value per problem;
+                                        func only receives the entries of
+                                        unconverged problems
+            method (str):           'bisection' or 'false_position'
+            e_req (float):          required approximate relative error
+            max_iterations (int):   most iterations for any problem
+            verbose (bool):         print progress each iteration
+
+        Returns:
+            np.array:   roots, the shape of the brackets
+            dict:       'iterations' (per problem), 'converged' (mask),
+                        'evaluations' (calls to func)
+
+        Raises:
+            ValueError: if a bracket does not contain a sign change
+
+        Examples:
+            Drag coefficient giving an 82 kg parachutist 36 m/s after 4 s.
+                >>> func = lambda c, m, v, t: m * 9.81 / c * (1 - np.exp(-c * t / m)) - v
+                >>> c, stats = bracket(func, 1e-3, 20, args=(82, 36, 4))
+
+            And for every (m, v) pair on a grid, in the same few iterations.
+                >>> m, v = np.meshgrid(np.linspace(60, 100, 100), np.linspace(30, 40, 100))
+                >>> c, stats = bracket(func, 1e-3, 20, args=(m, v, 4))
+    '''
+
+    xl, xu, *args = np.broadcast_arrays(np.asarray(xl, dtype=np.float64),
+                                        np.asarray(xu, dtype=np.float64), *args)
+    shape = xl.shape
+
+    xl, xu = xl.ravel().copy(), xu.ravel().copy()
+    args = [np.ravel(arg) for arg in args]
+
+    # Both endpoints in one call.
+    f = np.asarray(func(np.concatenate([xl, xu]), *[np.concatenate([arg, arg]) for arg in args]),
+                   dtype=np.float64)
+    fl, fu = f[:xl.size], f[xl.size:]
+    evaluations = 1
+
+    missing = np.sign(fl) * np.sign(fu) > 0
+    if np.any(missing):
+        i = np.flatnonzero(missing)[0]
+        raise ValueError('Interval (%s, %s) does not contain root (%d of %d brackets)'
+                         % (xl[i], xu[i], missing.sum(), missing.size))
+
+    roots = np.where(fl == 0, xl, np.where(fu == 0, xu, next_point(method, xl, xu, fl, fu)))
+    iterations = np.zeros(xl.size, dtype=int)
+    converged = (fl == 0) | (fu == 0)
+
+    active = np.flatnonzero(~converged)
+
+    for i in range(max_iterations):
+        if active.size == 0:
+            break
+
+        xm = roots[active]
+        fm = np.asarray(func(xm, *[arg[active] for arg in args]), dtype=np.float64)
+        evaluations += 1
+        iterations[active] += 1
+
+        # Keep the half containing the sign change.
+        lower = np.sign(fm) == np.sign(fl[active])
+        xl[active] = np.where(lower, xm, xl[active])
+        fl[active] = np.where(lower, fm, fl[active])
+        xu[active] = np.where(lower, xu[active], xm)
+        fu[active] = np.where(lower, fu[active], fm)
+
+        new = next_point(method, xl[active], xu[active], fl[active], fu[active])
+        done = (fm == 0) | (np.abs(new - xm) < e_req * np.abs(new))
+
+        roots[active] = np.where(fm == 0, xm, new)
+        converged[active] = done
+
+        if verbose:
+            print('iteration: {:<5d}\tactive: {:<8d}\tconverged: {:<8d}'.format(
+                i + 1, active.size, done.sum()))
+
+        active = active[~done]
+
+    stats = {'iterations': iterations.reshape(shape),
+             'converged': converged.reshape(shape),
+             'evaluations': evaluations}
+
+    count('iterations', evaluations - 1)
+    count('evaluations', evaluations)
+
+    return roots.reshape(shape), stats
+
+def bracket_result(roots, stats, full_output=False, warn=False):
+    ''' Return the roots from bracket(), a float for a single problem, and
+        its stats if full_output. With warn, print a message if any problem
+        did not converge.
+    '''
+
+    if warn and not stats['converged'].all():
+        print('Failed to find root in {} iterations.'.format(stats['iterations'].max()))
+
+    roots = roots if roots.ndim else float(roots)
+
+    return (roots, stats) if full_output else roots
+
+def brent(func, xl, xu, args=(), xtol=2e-12, rtol=8.9e-16, max_evals=100, cache=None):
+    ''' Return the root of func within (xl, xu) by Brent's method.
+
+        Each step is an inverse quadratic or secant step through the last
+        points when it stays well inside the bracket and shrinks it fast
+        enough, and a bisection otherwise; so the root is kept bracketed,
+        and convergence is superlinear for smooth func. Every evaluation is
+        cached, and no point is evaluated twice.
+
+        Args:
+            func (func):        function to find the root of, func(x, *args)
+            xl (float):         lower bound
+            xu (float):         upper bound
+            args (tuple):       extra arguments to func
+            xtol (float):       absolute tolerance on the root
+            rtol (float):       relative tolerance on the root
+            max_evals (int):    most new calls to func
+            cache (dict):       (x, args) -> func(x, *args), shared
+                                    between calls, e.g. to tighten the
+                                    tolerance without repeating the
+                                    evaluations already made; args must
+                                    then be hashable
+
+        Returns:
+            float:      the root (best estimate, if not converged)
+            dict:       'evaluations' (new calls to func), 'cached' (values
+                        reused), 'iterations', 'history' (bracket after
+                        each iteration), 'reason' ('root' if func was zero,
+                        'xtol' or 'max_evals') and 'converged'
+
+        Raises:
+            ValueError: if the bracket does not contain a sign change, or
+                            a cache is shared with unhashable args
+
+        Examples:
+            The Project 2 thrust giving a 300 km apogee, one launch per call.
+                >>> def apogee(thrust):
+                ...     return max(rocket(thrust).launch(1.0)[1]) - 300e3
+                >>> thrust, stats = brent(apogee, 3e7, 4e7, xtol=1e3, max_evals=20)
+    '''
+
+    # A shared cache may hold other problems' values, so it is keyed on args
+    # too; a private one only ever sees these.
+    if cache is None:
+        cache = {}
+        problem = ()
+    else:
+        problem = tuple(args)
+        try:
+            hash(problem)
+        except TypeError:
+            raise ValueError('A shared cache needs hashable args, not %r.' % (args,))
+
+    stats = {'evaluations': 0, 'cached': 0, 'iterations': 0, 'history': [],
+             'reason': None, 'converged': False}
+
+    def evaluate(x):
+        key = (float(x), problem)
+
+        if key in cache:
+            stats['cached'] += 1
+        else:
+            cache[key] = float(func(key[0], *args))
+            stats['evaluations'] += 1
+
+        return cache[key]
+
+    def finish(x, reason):
+        stats['reason'] = reason
+        stats['converged'] = reason != 'max_evals'
+        count('iterations', stats['iterations'])
+        count('evaluations', stats['evaluations'])
+        return x, stats
+
+    xpre, xcur = float(xl), float(xu)
+    fpre, fcur = evaluate(xpre), evaluate(xcur)
+
+    if fpre == 0:
+        return finish(xpre, 'root')
+    if fcur == 0:
+        return finish(xcur, 'root')
+    if np.sign(fpre) == np.sign(fcur):
+        raise ValueError('Interval (%s, %s) does not contain root' % (xl, xu))
+
+    # xcur is the best estimate, xblk the other end of the bracket, and
+    # xpre the previous estimate; spre and scur are the last two steps.
+    xblk, fblk = 0.0, 0.0
+    spre = scur = 0.0
+
+    while True:
+        if np.sign(fpre) != np.sign(fcur):
+            xblk, fblk = xpre, fpre
+            spre = scur = xcur - xpre
+
+        if abs(fblk) < abs(fcur):
+            xpre, xcur, xblk = xcur, xblk, xcur
+            fpre, fcur, fblk = fcur, fblk, fcur
+
+        stats['history'].append((min(xcur, xblk), max(xcur, xblk)))
+
+        delta = (xtol + rtol * abs(xcur)) / 2
+        sbis = (xblk - xcur) / 2
+
+        if fcur == 0:
+            return finish(xcur, 'root')
+        if abs(sbis) < delta:
+            return finish(xcur, 'xtol')
+        if stats['evaluations'] >= max_evals:
+            return finish(xcur, 'max_evals')
+
+        stats['iterations'] += 1
+
+        if abs(spre) > delta and abs(fcur) < abs(fpre):
+            if xpre == xblk:
+                # Secant.
+                stry = -fcur * (xcur - xpre) / (fcur - fpre)
+            else:
+                # Inverse quadratic interpolation.
+                dpre = (fpre - fcur) / (xpre - xcur)
+                dblk = (fblk - fcur) / (xblk - xcur)
+                stry = -fcur * (fblk * dblk - fpre * dpre) / (dblk * dpre * (fblk - fpre))
+
+            # Accept only steps well inside the bracket that shrink quickly.
+            if 2 * abs(stry) < min(abs(spre), 3 * abs(sbis) - delta):
+                spre, scur = scur, stry
+            else:
+                spre = scur = sbis
+        else:
+            spre = scur = sbis
+
+        xpre, fpre = xcur, fcur
+        xcur += scur if abs(scur) > delta else np.copysign(delta, sbis)
+        fcur = evaluate(xcur)
+
+def find_roots(func, start, stop, samples=500, args=(), e_req=1e-12, max_depth=12):
+    ''' Return every root of func in [start, stop].
+
+        Args:
+            func (func):        vectorized function, func(x, *args)
+            start (float):      lower end of the interval
+            stop (float):       upper end of the interval
+            samples (int):      points in the first scan
+            args (tuple):       extra arguments to func
+            e_req (float):      required approximate relative error of roots
+            max_depth (int):    most times an interval is halved
+
+        Returns:
+            np.array:   the roots, in increasing order
+            dict:       'evaluations' (points evaluated, scan and polish),
+                        'refined' (intervals halved), 'brackets'
+
+        Examples:
+            Every root of the Chapter 5 graphical method's function.
+                >>> roots, stats = find_roots(lambda x: np.sin(10 * x) + np.cos(3 * x), 0, 5)
+
+        Roots of even multiplicity (e.g. x**2 at 0) have no sign change; they
+        are found only if a sample lands on them exactly.
+    '''
+
+    x = np.linspace(start, stop, samples)
+    y = np.asarray(func(x, *args), dtype=np.float64)
+    evaluations = x.size
+    refined = 0
+
+    change = np.sign(y[:-1]) * np.sign(y[1:]) < 0
+    lows, highs, exact = [x[:-1][change]], [x[1:][change]], [x[y == 0]]
+
+    # Intervals without a sign change may still hide an even number of roots.
+    keep = ~change & (y[:-1] != 0) & (y[1:] != 0)
+    a, b, fa, fb = x[:-1][keep], x[1:][keep], y[:-1][keep], y[1:][keep]
+
+    for depth in range(max_depth):
+        if a.size == 0:
+            break
+
+        m = 0.5 * (a + b)
+        fm = np.asarray(func(m, *args), dtype=np.float64)
+        evaluations += m.size
+        refined += m.size
+
+        exact.append(m[fm == 0])
+
+        # Halves with a sign change are bracketed...
+        left = np.sign(fa) * np.sign(fm) < 0
+        right = np.sign(fm) * np.sign(fb) < 0
+        lows += [a[left], m[right]]
+        highs += [m[left], b[right]]
+
+        # ...the rest are halved again wherever func bends by as much as it
+        # stays away from zero, which is where it may oscillate or dip
+        # through zero between the samples.
+        bend = np.abs(fm - 0.5 * (fa + fb))
+        near = np.minimum(np.minimum(np.abs(fa), np.abs(fb)), np.abs(fm))
+        again = (bend >= 0.5 * near) & ~left & ~right & (fm != 0)
+
+        a, m, b = a[again], m[again], b[again]
+        fa, fm, fb = fa[again], fm[again], fb[again]
+
+        a, b = np.concatenate([a, m]), np.concatenate([m, b])
+        fa, fb = np.concatenate([fa, fm]), np.concatenate([fm, fb])
+
+    lows, highs = np.concatenate(lows), np.concatenate(highs)
+    roots = np.concatenate(exact)
+
+    if lows.size:
+        polished, stats = bracket(func, lows, highs, args=args, e_req=e_req)
+        evaluations += 2 * lows.size + np.sum(stats['iterations'])
+        roots = np.concatenate([roots, polished])
+
+    stats = {'evaluations': int(evaluations), 'refined': refined, 'brackets': lows.size}
+
+    return np.unique(roots), stats
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from me273.roots import bracket, bracket_result, brent, find_roots
+
+
+def counted(func):
+    calls = []
+
+    def wrapper(x):
+        calls.append(x)
+        return func(x)
+
+    return wrapper, calls
+
+
+@pytest.mark.parametrize('func, xl, xu, root', [
+    (np.cos, 0, 3, np.pi / 2),
+    (lambda x: 2**x - 5, 0, 3, np.log2(5)),
+    (lambda x: x**3 - 6 * x**2 + 11 * x - 6.1, 2.5, 4.0, 3.046680531804601),
+    (lambda x: np.exp(-0.5 * x) * (4 - x) - 2, 0, 10, 0.8857088020047772),
+])
+def test_brent_evaluates_each_point_once(func, xl, xu, root):
+    func, calls = counted(func)
+    x, stats = brent(func, xl, xu)
+
+    assert x == pytest.approx(root, abs=1e-11)
+    assert stats['converged']
+    assert stats['evaluations'] == len(calls) == len(set(calls)) <= 12
+
+    # Every bracket lies within the last, and contains the root.
+    for (a0, b0), (a1, b1) in zip(stats['history'], stats['history'][1:]):
+        assert a0 <= a1 <= b1 <= b0
+    assert stats['history'][-1][0] <= root + 1e-11 and root - 1e-11 <= stats['history'][-1][1]
+
+
+def test_brent_budget_and_cache():
+    cache = {}
+
+    x, stats = brent(np.cos, 0, 3, max_evals=4, cache=cache)
+    assert stats['reason'] == 'max_evals' and not stats['converged']
+    assert stats['evaluations'] == 4
+
+    x, stats = brent(np.cos, 0, 3, cache=cache)
+    assert stats['converged']
+    assert stats['cached'] >= 4
+    assert x == pytest.approx(np.pi / 2, abs=1e-11)
+
+    with pytest.raises(ValueError):
+        brent(np.cos, 0, 1)
+
+
+def test_brent_shared_cache_keeps_problems_apart():
+    cache = {}
+    func = lambda x, c: x**2 - c
+
+    two, _ = brent(func, 0, 3, args=(2.0,), cache=cache)
+    three, stats = brent(func, 0, 3, args=(3.0,), cache=cache)
+
+    assert two == pytest.approx(np.sqrt(2), abs=1e-11)
+    assert three == pytest.approx(np.sqrt(3), abs=1e-11)
+    assert stats['cached'] == 0
+
+    with pytest.raises(ValueError):
+        brent(func, 0, 3, args=(np.asarray([3.0]),), cache=cache)
+
+
+def test_bracket_counts_iterations_per_problem():
+    roots, stats = bracket(np.sin, [1, 3], [5, 3.5], e_req=1e-12)
+
+    assert roots == pytest.approx([np.pi, np.pi])
+    assert stats['converged'].all()
+    assert stats['iterations'][1] < stats['iterations'][0]
+    assert stats['evaluations'] == stats['iterations'].max() + 1
+
+
+def test_find_roots_of_oscillating_function():
+    func = lambda x: np.sin(10 * x) + np.cos(3 * x)
+
+    # Every sign change on a fine grid.
+    x = np.linspace(0, 5, 1000001)
+    y = func(x)
+    expected = np.sum(np.sign(y[:-1]) * np.sign(y[1:]) < 0)
+
+    for samples in [500, 20]:
+        roots, stats = find_roots(func, 0, 5, samples=samples)
+
+        assert roots.size == expected == 15
+        assert np.all(np.abs(func(roots)) < 1e-10)
+
+
+def test_find_roots_between_samples():
+    roots, stats = find_roots(lambda x: (x - 1) * (x - 1.0001) * (x - 3), 0, 5, samples=50)
+
+    assert roots == pytest.approx([1, 1.0001, 3], abs=1e-10)
+    assert stats['refined'] > 0
+
+
+def test_bracket_result(capsys):
+    roots, stats = bracket(np.cos, 0, 3)
+    assert isinstance(bracket_result(roots, stats), float)
+
+    roots, stats = bracket(np.cos, [0, 0], [3, 3], max_iterations=2)
+    roots, same = bracket_result(roots, stats, full_output=True, warn=True)
+
+    assert roots.shape == (2,) and same is stats
+    assert 'Failed' in capsys.readouterr().out
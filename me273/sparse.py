@@ -0,0 +1,530 @@
+''' Sparse Matrices and Iterative Solvers
+
+    Structural and thermal grids give systems with millions of unknowns but
+    only a handful of nonzeros per row. Stored densely they do not fit in
+    memory, and factoring them costs O(n**3); stored in compressed sparse
+    row (CSR) form they cost O(nnz), and iterative solvers need nothing but
+    products A @ x, so A may even be a function (matrix-free).
+
+    Solvers:
+
+        jacobi:     x += D^-1 (b - A x), all unknowns at once
+        sor:        Gauss-Seidel (omega = 1) or successive over-relaxation,
+                    swept one color at a time: a coloring splits the
+                    unknowns into sets that do not touch each other, so each
+                    set is updated at once and still sees the latest values
+        cg:         preconditioned conjugate gradients, for symmetric
+                    positive definite A; preconditioned by the diagonal
+                    ('jacobi'), by an algebraic multigrid V-cycle ('amg'),
+                    or by any function M(r)
+
+    Every solver stops on the residual,
+
+            |b - A x| <= max(rtol * |b|, atol)
+
+    takes a starting guess x0 (a warm start from a previous solution), and
+    returns stats: 'iterations', 'residuals' (|b - A x| / |b| at every
+    iteration), 'converged' and 'reason'.
+
+    Products and sparse matrix products use scipy.sparse's compiled kernels
+    on the CSR arrays.
+'''
+
+import numpy as np
+
+from me273.instrumentation import count
+
+class CSRMatrix:
+    ''' Sparse matrix in compressed sparse row form.
+
+        Row i holds values data[indptr[i]:indptr[i + 1]] in the columns
+        indices[indptr[i]:indptr[i + 1]].
+
+        Args:
+            data (np.array):    (nnz,) values
+            indices (np.array): (nnz,) column of each value
+            indptr (np.array):  (rows + 1,) start of each row in data
+            shape (tuple):      (rows, columns)
+
+        Examples:
+            >>> A = CSRMatrix.from_coo(rows, cols, values, shape=(n, n))
+            >>> A = poisson(1000)
+            >>> x, stats = cg(A, b, M='amg')
+    '''
+
+    def __init__(self, data, indices, indptr, shape):
+
+        self.data = np.asarray(data, dtype=np.float64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = tuple(shape)
+
+        self._scipy = None
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        ''' Return the matrix with values at (rows, cols); duplicates are summed. '''
+
+        from scipy.sparse import coo_matrix
+
+        return cls.from_scipy(coo_matrix((values, (rows, cols)), shape=shape))
+
+    @classmethod
+    def from_dense(cls, A):
+        ''' Return the CSR form of dense A. '''
+
+        A = np.asarray(A, dtype=np.float64)
+        rows, cols = np.nonzero(A)
+
+        return cls.from_coo(rows, cols, A[rows, cols], A.shape)
+
+    @classmethod
+    def from_scipy(cls, A):
+        ''' Return a CSRMatrix sharing the arrays of a scipy.sparse matrix. '''
+
+        A = A.tocsr()
+        A.sum_duplicates()
+
+        return cls(A.data, A.indices, A.indptr, A.shape)
+
+    def to_scipy(self):
+        ''' Return a scipy.sparse.csr_matrix sharing these arrays. '''
+
+        if self._scipy is None:
+            from scipy.sparse import csr_matrix
+            self._scipy = csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+        return self._scipy
+
+    @property
+    def nnz(self):
+        ''' Return the number of stored values. '''
+
+        return self.data.size
+
+    def todense(self):
+        ''' Return the dense matrix. '''
+
+        return self.to_scipy().toarray()
+
+    def diagonal(self):
+        ''' Return the main diagonal. '''
+
+        return self.to_scipy().diagonal()
+
+    def dot(self, x):
+        ''' Return A @ x, for a vector x, a block of them, or another CSRMatrix. '''
+
+        if isinstance(x, CSRMatrix):
+            return CSRMatrix.from_scipy(self.to_scipy() @ x.to_scipy())
+
+        return self.to_scipy() @ x
+
+    __matmul__ = dot
+
+    @property
+    def T(self):
+        ''' Return the transpose. '''
+
+        return CSRMatrix.from_scipy(self.to_scipy().T)
+
+    def rows(self, index):
+        ''' Return the matrix of only the given rows. '''
+
+        return CSRMatrix.from_scipy(self.to_scipy()[index])
+
+    def _row_ids(self):
+        ''' Return the row of every stored value. '''
+
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+def poisson(nx, ny=None):
+    ''' Return the 5-point finite-difference Laplacian (times -h**2) on an
+        nx by ny grid of interior points, with zero boundary values.
+
+        Solving poisson(n) u = h**2 f gives -u'' = f on the unit square.
+    '''
+
+    ny = nx if ny is None else ny
+    index = np.arange(nx * ny).reshape(ny, nx)
+
+    rows, cols, values = [index.ravel()], [index.ravel()], [np.full(nx * ny, 4.0)]
+
+    for a, b in [(index[:, :-1], index[:, 1:]), (index[:-1], index[1:])]:
+        rows += [a.ravel(), b.ravel()]
+        cols += [b.ravel(), a.ravel()]
+        values += [np.full(a.size, -1.0)] * 2
+
+    return CSRMatrix.from_coo(np.concatenate(rows), np.concatenate(cols), np.concatenate(values),
+                              (nx * ny, nx * ny))
+
+def as_operator(A):
+    ''' Return a function x -> A @ x for a CSRMatrix, array, or function. '''
+
+    if callable(A) and not hasattr(A, 'dot'):
+        return A
+
+    return A.dot
+
+def coloring(A, seed=273):
+    ''' Return a color for each unknown of A, so that no two unknowns coupled
+        by A share a color.
+
+        Each color is a maximal independent set of the uncolored unknowns,
+        found by Luby's method: every unknown whose random priority beats
+        all its candidate neighbours joins at once. A 5-point grid needs
+        only a few colors.
+    '''
+
+    n = A.shape[0]
+    rows, cols = A._row_ids(), A.indices
+    off = rows != cols
+    rows, cols = rows[off], cols[off]
+
+    priority = np.random.default_rng(seed).random(n)
+    color = np.full(n, -1)
+    c = 0
+
+    while np.any(color < 0):
+        candidate = color < 0
+
+        while np.any(candidate):
+            # Best priority among each unknown's candidate neighbours.
+            best = np.full(n, -1.0)
+            np.maximum.at(best, rows, np.where(candidate[cols], priority[cols], -1.0))
+
+            chosen = candidate & (priority > best)
+            color[chosen] = c
+
+            # Neighbours of the chosen can no longer join this color.
+            blocked = np.zeros(n, dtype=bool)
+            blocked[rows[chosen[cols]]] = True
+            candidate &= ~chosen & ~blocked
+
+        c += 1
+
+    return color
+
+def _result(x, residuals, norm_b, tol, iteration, max_iterations):
+    ''' Return x and the solver's stats. '''
+
+    converged = residuals[-1] * norm_b <= tol
+    count('iterations', iteration)
+
+    stats = {'iterations': iteration,
+             'residuals': np.asarray(residuals),
+             'converged': bool(converged),
+             'reason': 'converged' if converged else 'max_iterations'}
+
+    return x, stats
+
+def _start(A, b, x0, rtol, atol):
+    ''' Return the operator, b, x, residual, |b| and the absolute tolerance. '''
+
+    matvec = as_operator(A)
+    b = np.asarray(b, dtype=np.float64)
+    x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=np.float64)
+
+    r = b - matvec(x) if x0 is not None else b.copy()
+    norm_b = np.linalg.norm(b) or 1.0
+
+    return matvec, b, x, r, norm_b, max(rtol * norm_b, atol)
+
+def jacobi(A, b, x0=None, diagonal=None, omega=1.0, rtol=1e-8, atol=0.0, max_iterations=10000, callback=None):
+    ''' Return x for Ax = b by (damped) Jacobi iteration.
+
+        Converges for diagonally dominant A; slowly, O(n) iterations on an
+        n by n grid, which is why it is mostly used as a smoother.
+
+        Args:
+            A:                      CSRMatrix, array, or function x -> A @ x
+            b (np.array):           right-hand side
+            x0 (np.array):          starting guess, e.g. a previous solution
+            diagonal (np.array):    diagonal of A (needed if A is a function)
+            omega (float):          damping factor
+            rtol (float):           relative tolerance on the residual
+            atol (float):           absolute tolerance on the residual
+            max_iterations (int):   most iterations
+            callback (func):        called as callback(iteration, x, residual)
+
+        Returns:
+            np.array:   x
+            dict:       'iterations', 'residuals', 'converged', 'reason'
+    '''
+
+    if diagonal is None and not hasattr(A, 'diagonal'):
+        raise ValueError('jacobi needs the diagonal of a matrix-free A.')
+
+    matvec, b, x, r, norm_b, tol = _start(A, b, x0, rtol, atol)
+    d = A.diagonal() if diagonal is None else np.asarray(diagonal, dtype=np.float64)
+
+    residuals = [np.linalg.norm(r) / norm_b]
+    iteration = 0
+
+    while residuals[-1] * norm_b > tol and iteration < max_iterations:
+        x += omega * r / d
+        r = b - matvec(x)
+        iteration += 1
+
+        residuals.append(np.linalg.norm(r) / norm_b)
+        if callback is not None:
+            callback(iteration, x, residuals[-1])
+
+    return _result(x, residuals, norm_b, tol, iteration, max_iterations)
+
+def sor(A, b, x0=None, omega=1.0, rtol=1e-8, atol=0.0, max_iterations=10000, colors=None, callback=None):
+    ''' Return x for Ax = b by Gauss-Seidel (omega = 1) or SOR iteration.
+
+        Sweeps the unknowns one color at a time (see coloring), so each
+        sweep is a few vectorized products rather than a loop over rows.
+        Converges for symmetric positive definite A with 0 < omega < 2.
+
+        Args:
+            A (CSRMatrix):          the matrix (its rows are needed)
+            colors (np.array):      color of each unknown (default coloring(A))
+
+        Other arguments and returns are as for jacobi.
+    '''
+
+    matvec, b, x, r, norm_b, tol = _start(A, b, x0, rtol, atol)
+    d = A.diagonal()
+
+    if colors is None:
+        colors = coloring(A)
+
+    sets = [np.flatnonzero(colors == c) for c in range(colors.max() + 1)]
+    blocks = [(S, A.rows(S), d[S]) for S in sets]
+
+    residuals = [np.linalg.norm(r) / norm_b]
+    iteration = 0
+
+    while residuals[-1] * norm_b > tol and iteration < max_iterations:
+        for S, A_S, d_S in blocks:
+            x[S] += omega * (b[S] - A_S @ x) / d_S
+
+        r = b - matvec(x)
+        iteration += 1
+
+        residuals.append(np.linalg.norm(r) / norm_b)
+        if callback is not None:
+            callback(iteration, x, residuals[-1])
+
+    return _result(x, residuals, norm_b, tol, iteration, max_iterations)
+
+def gauss_seidel(A, b, x0=None, **kwargs):
+    ''' Return x for Ax = b by Gauss-Seidel iteration (SOR with omega = 1). '''
+
+    return sor(A, b, x0, omega=1.0, **kwargs)
+
+def cg(A, b, x0=None, M='jacobi', diagonal=None, rtol=1e-8, atol=0.0, max_iterations=None, callback=None):
+    ''' Return x for Ax = b by preconditioned conjugate gradients.
+
+        A must be symmetric positive definite. Unpreconditioned, the
+        iterations grow with the grid size (O(n) on an n by n grid); with
+        M='amg', they stay nearly constant.
+
+        Args:
+            A:                      CSRMatrix, array, or function x -> A @ x
+            M:                      preconditioner: None, 'jacobi', 'amg'
+                                        (A must be a CSRMatrix), a Multigrid,
+                                        or a function r -> approximately A^-1 r
+            diagonal (np.array):    diagonal of A for 'jacobi' (if A is a
+                                        function without one, 'jacobi' falls
+                                        back to no preconditioner)
+            max_iterations (int):   most iterations (default size of b)
+
+        Other arguments and returns are as for jacobi.
+
+        Examples:
+            A million-unknown Poisson problem.
+                >>> A = poisson(1000)
+                >>> u, stats = cg(A, np.full(A.shape[0], 1 / 1001**2), M='amg')
+
+            Warm start the next time step from the last solution.
+                >>> u, stats = cg(A, b_next, x0=u, M=stats['preconditioner'])
+    '''
+
+    matvec, b, x, r, norm_b, tol = _start(A, b, x0, rtol, atol)
+
+    if max_iterations is None:
+        max_iterations = b.size
+
+    if M is None:
+        precondition = np.copy
+    elif isinstance(M, str) and M == 'jacobi':
+        if diagonal is not None:
+            d = np.asarray(diagonal, dtype=np.float64)
+            precondition = lambda r: r / d
+        elif hasattr(A, 'diagonal'):
+            d = A.diagonal()
+            precondition = lambda r: r / d
+        else:
+            precondition = np.copy
+    elif isinstance(M, str) and M == 'amg':
+        M = Multigrid(A)
+        precondition = M
+    elif callable(M):
+        precondition = M
+    else:
+        raise ValueError("M must be None, 'jacobi', 'amg' or a function, not %r" % (M,))
+
+    residuals = [np.linalg.norm(r) / norm_b]
+    iteration = 0
+
+    z = precondition(r)
+    p = z.copy()
+    rz = r @ z
+
+    while residuals[-1] * norm_b > tol and iteration < max_iterations:
+        Ap = matvec(p)
+        alpha = rz / (p @ Ap)
+
+        x += alpha * p
+        r -= alpha * Ap
+        iteration += 1
+
+        residuals.append(np.linalg.norm(r) / norm_b)
+        if callback is not None:
+            callback(iteration, x, residuals[-1])
+
+        z = precondition(r)
+        rz, rz_old = r @ z, rz
+        p *= rz / rz_old
+        p += z
+
+    x, stats = _result(x, residuals, norm_b, tol, iteration, max_iterations)
+    stats['preconditioner'] = M
+
+    return x, stats
+
+def aggregate(A, theta=0.0, rounds=3):
+    ''' Return an aggregate number for every unknown of A, and the count.
+
+        Unknowns are paired along their strongest connections (|a_ij|, of
+        those at least theta * sqrt(|a_ii a_jj|)): each pairs with the
+        neighbour it is most strongly connected to, if that neighbour picks
+        it too.
+        Equal connections (as on a uniform grid) are told apart by a small
+        pseudo-random weight that is the same seen from either end, so that
+        pairs still form. Unknowns left over join the aggregate of the
+        neighbour they are most strongly connected to.
+    '''
+
+    n = A.shape[0]
+    rows, cols = A._row_ids(), A.indices
+    d = np.abs(A.diagonal())
+
+    weight = np.abs(A.data)
+    strong = (rows != cols) & (weight >= theta * np.sqrt(d[rows] * d[cols]))
+
+    low = np.minimum(rows, cols).astype(np.uint64)
+    high = np.maximum(rows, cols).astype(np.uint64)
+    jitter = ((low * np.uint64(2654435761) + high * np.uint64(40503)) % np.uint64(1000003)) / 1000003
+    weight = weight * (1 + 1e-6 * jitter)
+
+    def strongest(mask):
+        ''' Return each row's most strongly connected column within mask, or -1. '''
+
+        value = np.where(mask, weight, -np.inf)
+        best = np.maximum.reduceat(value, A.indptr[:-1]) if value.size else value
+        best[np.diff(A.indptr) == 0] = -np.inf
+
+        hit = mask & (value == best[rows])
+        choice = np.full(n, -1)
+        choice[rows[hit][::-1]] = cols[hit][::-1]
+
+        return choice
+
+    group = np.full(n, -1)
+    aggregates = 0
+
+    for _ in range(rounds):
+        free = group < 0
+        choice = strongest(strong & free[rows] & free[cols])
+
+        i = np.flatnonzero(choice >= 0)
+        i = i[(choice[choice[i]] == i) & (i < choice[i])]
+
+        group[i] = group[choice[i]] = aggregates + np.arange(i.size)
+        aggregates += i.size
+
+    left = group < 0
+    choice = strongest((rows != cols) & left[rows] & ~left[cols])
+    joins = left & (choice >= 0)
+    group[joins] = group[choice[joins]]
+
+    alone = np.flatnonzero(group < 0)
+    group[alone] = aggregates + np.arange(alone.size)
+
+    return group, aggregates + alone.size
+
+class Multigrid:
+    ''' Smoothed aggregation algebraic multigrid V-cycle, as a cg preconditioner.
+
+        Each level groups the unknowns into aggregates of four to eight
+        (two rounds of pairing, see aggregate). The interpolation P from
+        aggregates is piecewise constant, smoothed by one damped Jacobi
+        step so that it follows the smooth errors Jacobi cannot remove, and
+        the next level's matrix is P^T A P. The coarsest is solved directly.
+        Damped Jacobi smooths on each level.
+
+        Iterations then barely grow with the grid: 13, 15, 17 and 18 for
+        Poisson grids of 100, 200, 400 and 1000 points a side.
+
+        Args:
+            A (CSRMatrix):      symmetric positive definite matrix
+            coarsest (int):     size below which a level is solved directly
+            smoothing (int):    Jacobi sweeps before and after each coarse
+                                    correction
+    '''
+
+    def __init__(self, A, coarsest=1000, smoothing=2):
+
+        from scipy.sparse import diags
+        from scipy.sparse.linalg import splu
+
+        self.smoothing = smoothing
+        self.levels = []
+
+        while A.shape[0] > coarsest:
+            P = None
+            for _ in range(2):
+                coarse = A if P is None else (P.T @ A) @ P
+                group, aggregates = aggregate(coarse)
+                step = CSRMatrix(np.ones(group.size), group, np.arange(group.size + 1),
+                                 (group.size, aggregates))
+                P = step if P is None else P @ step
+
+            if P.shape[1] >= A.shape[0]:
+                break
+
+            # Jacobi weight 4 / (3 rho), rho bounding the spectrum of D^-1 A.
+            d = A.diagonal()
+            rho = np.max(np.abs(A.to_scipy()).sum(axis=1).A1 / np.abs(d))
+            w = (4 / 3) / rho
+
+            P = CSRMatrix.from_scipy(P.to_scipy() - w * (diags(1 / d) @ (A.to_scipy() @ P.to_scipy())))
+
+            self.levels.append((A, d, w, P, P.T))
+            A = (P.T @ A) @ P
+
+        self.coarse = splu(A.to_scipy().tocsc())
+
+    def __call__(self, b, level=0):
+        ''' Return an approximate solution of Ax = b, by one V-cycle. '''
+
+        if level == len(self.levels):
+            return self.coarse.solve(b)
+
+        A, d, w, P, R = self.levels[level]
+
+        x = w * b / d
+        for _ in range(self.smoothing - 1):
+            x += w * (b - A @ x) / d
+
+        x += P @ self(R @ (b - A @ x), level + 1)
+
+        for _ in range(self.smoothing):
+            x += w * (b - A @ x) / d
+
+        return x
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from me273.sparse import CSRMatrix, Multigrid, cg, coloring, gauss_seidel, jacobi, poisson, sor
+
+
+def small_system(n=12):
+    A = poisson(n)
+    b = np.random.default_rng(273).normal(size=A.shape[0])
+
+    return A, b, np.linalg.solve(A.todense(), b)
+
+
+def test_csr_matches_dense():
+    A = poisson(4, 3)
+    dense = A.todense()
+
+    assert A.shape == (12, 12)
+    assert A.nnz == 12 + 2 * (3 * 3 + 4 * 2)
+    assert np.all(dense == dense.T)
+    assert np.all(A.diagonal() == 4)
+    assert np.all(CSRMatrix.from_dense(dense).todense() == dense)
+    assert A @ np.arange(12.0) == pytest.approx(dense @ np.arange(12.0))
+    assert (A @ A).todense() == pytest.approx(dense @ dense)
+
+
+def test_coloring_separates_neighbours():
+    A = poisson(20)
+    colors = coloring(A)
+
+    rows = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+    off = rows != A.indices
+
+    assert np.all(colors >= 0)
+    assert np.all(colors[rows[off]] != colors[A.indices[off]])
+
+
+@pytest.mark.parametrize('solve', [jacobi, gauss_seidel, cg])
+def test_solvers_match_dense(solve):
+    A, b, expected = small_system()
+
+    x, stats = solve(A, b, rtol=1e-10)
+
+    assert stats['converged'] and stats['reason'] == 'converged'
+    assert stats['residuals'][-1] <= 1e-10
+    assert len(stats['residuals']) == stats['iterations'] + 1
+    assert x == pytest.approx(expected, abs=1e-8)
+
+
+def test_fewer_iterations_with_better_methods():
+    A, b, _ = small_system()
+
+    iterations = [jacobi(A, b)[1]['iterations'],
+                  gauss_seidel(A, b)[1]['iterations'],
+                  sor(A, b, omega=1.5, colors=np.indices((12, 12)).sum(axis=0).ravel() % 2)[1]['iterations'],
+                  cg(A, b, M=None)[1]['iterations']]
+
+    assert iterations == sorted(iterations, reverse=True)
+
+
+def test_warm_start():
+    A, b, expected = small_system()
+
+    cold = cg(A, b)[1]['iterations']
+    x, stats = cg(A, b, x0=expected + 1e-6)
+
+    assert stats['iterations'] < cold
+    assert x == pytest.approx(expected, abs=1e-8)
+
+
+def test_max_iterations():
+    A, b, _ = small_system()
+
+    x, stats = jacobi(A, b, max_iterations=5)
+
+    assert stats['iterations'] == 5
+    assert not stats['converged']
+    assert stats['reason'] == 'max_iterations'
+
+
+def test_matrix_free():
+    # The same 1D Laplacian, as a function.
+    n = 50
+    matvec = lambda x: 2 * x - np.concatenate([[0], x[:-1]]) - np.concatenate([x[1:], [0]])
+    b = np.ones(n)
+
+    x, stats = cg(matvec, b, M=None)
+    y, _ = jacobi(matvec, b, diagonal=np.full(n, 2.0), rtol=1e-6, max_iterations=100000)
+
+    assert stats['converged']
+    assert matvec(x) == pytest.approx(b, abs=1e-6)
+    assert matvec(y) == pytest.approx(b, abs=1e-4)
+
+
+def test_matrix_free_default_preconditioner():
+    n = 50
+    matvec = lambda x: 2 * x - np.concatenate([[0], x[:-1]]) - np.concatenate([x[1:], [0]])
+    b = np.ones(n)
+
+    x, stats = cg(matvec, b)
+    y, scaled = cg(matvec, b, diagonal=np.full(n, 2.0))
+
+    assert stats['converged'] and scaled['converged']
+    assert matvec(x) == pytest.approx(b, abs=1e-6)
+    assert y == pytest.approx(x, abs=1e-6)
+
+    with pytest.raises(ValueError):
+        jacobi(matvec, b)
+
+
+def test_callback():
+    A, b, _ = small_system()
+    seen = []
+
+    cg(A, b, callback=lambda iteration, x, residual: seen.append((iteration, residual)))
+
+    assert [i for i, _ in seen] == list(range(1, len(seen) + 1))
+
+
+def test_multigrid_iterations_do_not_grow():
+    iterations = []
+
+    for n in (50, 100, 200):
+        A = poisson(n)
+        u, stats = cg(A, np.full(A.shape[0], 1 / (n + 1)**2), M='amg')
+
+        assert stats['converged']
+        assert isinstance(stats['preconditioner'], Multigrid)
+        iterations.append(stats['iterations'])
+
+    assert max(iterations) <= 20
+    assert iterations[-1] - iterations[0] <= 4
+
+
+def test_multigrid_reused():
+    A = poisson(60)
+    M = Multigrid(A)
+    b = np.ones(A.shape[0])
+
+    x, stats = cg(A, b, M=M)
+    y, again = cg(A, 2 * b, x0=2 * x, M=stats['preconditioner'])
+
+    assert again['iterations'] <= 1
+    assert A @ y == pytest.approx(2 * b, abs=1e-6)
@@ -0,0 +1,83 @@
+''' Streaming Statistics
+
+    Summaries of results that arrive a batch at a time, so that the mean,
+    spread and range of a large ensemble are known without keeping every
+    sample. Batches are merged with the pairwise update of Chan, Golub and
+    LeVeque (1979), which stays accurate where the textbook sum of squares
+    loses precision.
+'''
+
+import numpy as np
+
+class RunningStats:
+    ''' Running count, mean, variance, minimum and maximum.
+
+        Samples may be scalars or arrays; statistics are kept elementwise
+        over the leading (sample) axis.
+
+        Examples:
+            Summarize apogees a batch at a time.
+                >>> stats = RunningStats()
+                >>> for batch in batches:
+                ...     stats.update(apogees(batch))
+                >>> stats.mean, stats.std
+    '''
+
+    def __init__(self):
+
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+
+    def update(self, samples):
+        ''' Add a batch of samples, stacked along the first axis. '''
+
+        samples = np.asarray(samples, dtype=np.float64)
+
+        if samples.shape[0] == 0:
+            return
+
+        n = samples.shape[0]
+        mean = samples.mean(axis=0)
+        m2 = ((samples - mean)**2).sum(axis=0)
+
+        self._merge(n, mean, m2, samples.min(axis=0), samples.max(axis=0))
+
+    def merge(self, other):
+        ''' Add the samples summarized by another RunningStats. '''
+
+        if other.count:
+            self._merge(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _merge(self, n, mean, m2, low, high):
+
+        if self.count == 0:
+            self.count, self.mean, self.m2 = n, mean, m2
+            self.min, self.max = low, high
+            return
+
+        total = self.count + n
+        delta = mean - self.mean
+
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + m2 + delta**2 * self.count * n / total
+        self.min = np.minimum(self.min, low)
+        self.max = np.maximum(self.max, high)
+        self.count = total
+
+    @property
+    def variance(self):
+        ''' Return the sample variance (n - 1 in the denominator). '''
+
+        if self.count < 2:
+            return np.nan * np.ones_like(self.mean) if self.count else np.nan
+
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        ''' Return the sample standard deviation. '''
+
+        return np.sqrt(self.variance)
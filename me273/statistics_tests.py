@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from me273.statistics import RunningStats
+
+
+def test_batches_match_whole_sample():
+    rng = np.random.default_rng(273)
+    samples = 1e6 + rng.normal(size=(1000, 3))
+
+    stats = RunningStats()
+    for start in range(0, 1000, 64):
+        stats.update(samples[start:start + 64])
+
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(samples.mean(axis=0), rel=1e-14)
+    assert stats.std == pytest.approx(samples.std(axis=0, ddof=1), rel=1e-9)
+    assert np.all(stats.min == samples.min(axis=0))
+    assert np.all(stats.max == samples.max(axis=0))
+
+
+def test_merge():
+    a, b = RunningStats(), RunningStats()
+    a.update([1.0, 2.0])
+    b.update([3.0, 4.0, 5.0])
+    a.merge(b)
+
+    assert a.count == 5
+    assert a.mean == 3.0
+    assert a.variance == pytest.approx(2.5)
@@ -0,0 +1,150 @@
+''' Parameter Sweeps
+
+    Convergence studies (the same run at dt = 0.01, 0.1, 1, ...) and
+    parameter studies are many independent simulations, so they can run on
+    every core at once. sweep() fans the runs out over a process pool:
+
+        - points are dealt out in strided chunks, so that slow runs (small
+          dt) are spread across the workers rather than bunched in one;
+        - each worker writes its reduced result straight into an array in
+          shared memory, so results are never pickled back;
+        - results stream back a chunk at a time as workers finish.
+
+    The simulation and reduce functions are handed to the workers when they
+    start, so under the default fork start method (Linux) lambdas and
+    closures work; under spawn (Windows, macOS) they must be module-level
+    functions.
+'''
+
+import itertools
+import multiprocessing
+import os
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+def parameter_grid(**axes):
+    ''' Return a list of keyword dicts, one for every combination of values.
+
+        Examples:
+            >>> parameter_grid(dt=[0.1, 1.0], mass=[1, 2])
+            [{'dt': 0.1, 'mass': 1}, {'dt': 0.1, 'mass': 2},
+             {'dt': 1.0, 'mass': 1}, {'dt': 1.0, 'mass': 2}]
+    '''
+
+    names = list(axes)
+
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+def iter_sweep(func, points, reduce=None, shape=(), processes=None, chunksize=None, **kwargs):
+    ''' Run func(**point, **kwargs) for every point, yielding results as they finish.
+
+        Args:
+            func (func):        the simulation, e.g. euler_projectile
+            points (list):      keyword dicts, one per run (see parameter_grid)
+            reduce (func):      maps a run's return value to a number or array
+                                    of the given shape (default np.asarray)
+            shape (tuple):      shape of each reduced result
+            processes (int):    worker processes (default os.cpu_count());
+                                    1 runs in this process
+            chunksize (int):    runs per task (default spreads the points
+                                    over four tasks per worker)
+            **kwargs:           arguments passed to every run
+
+        Yields:
+            int:        index of the point
+            dict:       the point
+            np.array:   its reduced result
+    '''
+
+    points = list(points)
+    processes = processes or os.cpu_count() or 1
+
+    if reduce is None:
+        reduce = np.asarray
+
+    if processes == 1 or len(points) <= 1:
+        for i, point in enumerate(points):
+            yield i, point, np.asarray(reduce(func(**point, **kwargs)), dtype=np.float64)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(points) // (4 * processes))
+
+    # Strided chunks: chunk j holds points j, j + n, j + 2n, ...
+    n_chunks = -(-len(points) // chunksize)
+    chunks = [list(range(j, len(points), n_chunks)) for j in range(n_chunks)]
+
+    shape = (len(points),) + tuple(shape)
+    memory = SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    results = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+
+    try:
+        with multiprocessing.Pool(processes, initializer=_initialize,
+                                  initargs=(func, reduce, points, kwargs, memory.name, shape)) as pool:
+
+            for chunk in pool.imap_unordered(_run_chunk, chunks):
+                for i in chunk:
+                    yield i, points[i], results[i].copy()
+
+    finally:
+        # The view must go before the memory can be closed.
+        del results
+        memory.close()
+        memory.unlink()
+
+def sweep(func, points, reduce=None, shape=(), processes=None, chunksize=None, callback=None, **kwargs):
+    ''' Return an array of reduced results of func(**point, **kwargs) for every point.
+
+        Arguments are as for iter_sweep, plus:
+
+            callback (func):    called as callback(i, point, result) as each
+                                    run's result arrives
+
+        Returns:
+            np.array:   (len(points),) + shape results, in the order of points
+
+        Examples:
+            Converge the GA1 bowling ball drop, on every core.
+                >>> points = parameter_grid(dt=[0.1, 0.01, 0.001, 0.0001])
+                >>> final_v = sweep(euler_projectile, points, reduce=lambda r: r[2][-1],
+                ...                 mass=7.26, area=0.0388, x0=440)
+
+            Project 2 apogee against dt.
+                >>> def apogee(dt):
+                ...     return max(saturn_v().launch(dt)[1])
+                >>> sweep(apogee, parameter_grid(dt=[0.01, 0.1, 1.0, 10.0, 100.0]))
+    '''
+
+    points = list(points)
+    results = np.empty((len(points),) + tuple(shape))
+
+    for i, point, result in iter_sweep(func, points, reduce=reduce, shape=shape,
+                                       processes=processes, chunksize=chunksize, **kwargs):
+        results[i] = result
+
+        if callback is not None:
+            callback(i, point, result)
+
+    return results
+
+# Per-worker state, set once by _initialize.
+_worker = {}
+
+def _initialize(func, reduce, points, kwargs, name, shape):
+
+    memory = SharedMemory(name=name)
+
+    _worker.update(func=func, reduce=reduce, points=points, kwargs=kwargs, memory=memory,
+                   results=np.ndarray(shape, dtype=np.float64, buffer=memory.buf))
+
+def _run_chunk(chunk):
+
+    func, reduce = _worker['func'], _worker['reduce']
+    points, kwargs, results = _worker['points'], _worker['kwargs'], _worker['results']
+
+    for i in chunk:
+        results[i] = reduce(func(**points[i], **kwargs))
+
+    return chunk
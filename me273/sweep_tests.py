@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from me273.sweep import iter_sweep, parameter_grid, sweep
+
+
+def fall(dt, height=100.0, g=9.80665):
+    ''' Euler drop from height, return the impact time and speed. '''
+
+    t, x, v = 0.0, height, 0.0
+    while x > 0:
+        t, x, v = t + dt, x - v * dt, v + g * dt
+
+    return t, v
+
+
+def fail(n):
+    if n == 3:
+        raise ValueError('bad point')
+    return n
+
+
+def test_parameter_grid():
+    points = parameter_grid(dt=[0.1, 1.0], height=[1, 2, 3])
+
+    assert len(points) == 6
+    assert points[1] == {'dt': 0.1, 'height': 2}
+
+
+def test_pool_matches_serial():
+    points = parameter_grid(dt=[0.1, 0.01, 0.001], height=[10.0, 100.0])
+
+    serial = sweep(fall, points, shape=(2,), processes=1, g=1.62)
+    pooled = sweep(fall, points, shape=(2,), processes=3, chunksize=1, g=1.62)
+
+    assert serial.shape == (6, 2)
+    assert np.array_equal(serial, pooled)
+    assert serial[2, 1] == pytest.approx(np.sqrt(2 * 1.62 * 10.0), rel=1e-2)
+
+
+def test_results_stream_once_each():
+    points = parameter_grid(dt=np.linspace(0.01, 0.1, 10))
+
+    seen = sorted(i for i, point, result in
+                  iter_sweep(fall, points, reduce=lambda r: r[0], processes=2))
+
+    assert seen == list(range(10))
+
+
+def test_errors_propagate():
+    with pytest.raises(ValueError):
+        sweep(fail, parameter_grid(n=range(6)), processes=2)
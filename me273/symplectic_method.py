@@ -0,0 +1,193 @@
+''' Symplectic Methods
+
+    The simple Euler method adds a little energy to an orbit on every step,
+    so the orbit spirals outwards unless dt is very small. Symplectic methods
+    preserve the phase-space structure of Newtonian motion instead: their
+    energy error oscillates but stays bounded, however long the run, so
+    much larger steps can be taken over many orbits.
+
+    Every step function shares one signature,
+
+            x, v, a = step(acceleration, x, v, a, dt, **kwargs)
+
+    where the a passed in is the acceleration at x. The methods assume the
+    acceleration depends on position only (as gravity and springs do); v is
+    passed through for the usual acceleration(x, v, **kwargs) convention.
+
+    Methods:
+
+        'euler':        simple Euler (not symplectic, for comparison)
+        'modified':     modified (semi-implicit) Euler, first order
+        'verlet':       velocity Verlet (kick-drift-kick), second order
+        'leapfrog':     leapfrog (drift-kick-drift), second order
+        'yoshida4':     Yoshida's fourth-order composition of Verlet steps
+'''
+
+import numpy as np
+
+from me273.instrumentation import count, counted
+from me273.recording import Recorder, step_count
+
+def euler_step(acceleration, x, v, a, dt, **kwargs):
+    ''' Return x, v, and a after one simple Euler step. '''
+
+    a = acceleration(x, v, **kwargs)
+
+    return x + dt * v, v + dt * a, a
+
+def modified_euler_step(acceleration, x, v, a, dt, **kwargs):
+    ''' Return x, v, and a after one modified Euler step. '''
+
+    a = acceleration(x, v, **kwargs)
+    v = v + dt * a
+
+    return x + dt * v, v, a
+
+def velocity_verlet_step(acceleration, x, v, a, dt, **kwargs):
+    ''' Return x, v, and a after one velocity Verlet step.
+
+        Uses:
+
+            v(t + dt/2) = v(t) + a(t) * dt/2
+            x(t + dt)   = x(t) + v(t + dt/2) * dt
+            v(t + dt)   = v(t + dt/2) + a(t + dt) * dt/2
+
+        The returned a is at the new position, so one evaluation per step.
+    '''
+
+    v = v + 0.5 * dt * a
+    x = x + dt * v
+    a = acceleration(x, v, **kwargs)
+
+    return x, v + 0.5 * dt * a, a
+
+def leapfrog_step(acceleration, x, v, a, dt, **kwargs):
+    ''' Return x, v, and a after one leapfrog (drift-kick-drift) step.
+
+        The returned a is the one evaluated at the midpoint of the step.
+    '''
+
+    x = x + 0.5 * dt * v
+    a = acceleration(x, v, **kwargs)
+    v = v + dt * a
+
+    return x + 0.5 * dt * v, v, a
+
+# Yoshida (1990) fourth-order weights: w1 + w0 + w1 = 1.
+W1 = 1 / (2 - 2**(1/3))
+W0 = -2**(1/3) / (2 - 2**(1/3))
+
+def yoshida4_step(acceleration, x, v, a, dt, **kwargs):
+    ''' Return x, v, and a after one fourth-order Yoshida step.
+
+        Three velocity Verlet steps of w1*dt, w0*dt and w1*dt. The middle
+        step runs backwards in time, cancelling the third-order error of the
+        other two. Three evaluations per step.
+    '''
+
+    for w in (W1, W0, W1):
+        x, v, a = velocity_verlet_step(acceleration, x, v, a, w * dt, **kwargs)
+
+    return x, v, a
+
+METHODS = {
+    'euler': euler_step,
+    'modified': modified_euler_step,
+    'verlet': velocity_verlet_step,
+    'leapfrog': leapfrog_step,
+    'yoshida4': yoshida4_step,
+}
+
+# Methods whose returned acceleration is at the new position, and so can be
+# passed straight into the next step.
+FSAL = {'verlet', 'yoshida4'}
+
+def get_step(method):
+    ''' Return the step function for a method name. '''
+
+    try:
+        return METHODS[method]
+    except KeyError:
+        raise ValueError('Unknown method %r, expected one of %s.'
+                         % (method, ', '.join(sorted(METHODS))))
+
+def symplectic_method(acceleration, t0, tf, dt, x0=0, v0=0, method='verlet', recorder=None, **kwargs):
+    ''' Returns t, x, v, and a arrays for a method chosen by name.
+
+        Args:
+            acceleration (func):  a function that accepts x, v, and **kwargs and
+                                      return acceleration.
+            t0 (float):           initial time (s)
+            tf (float):           final time (s)
+            dt (float):           time step (s)
+            x0 (np.array):        initial displacement (m)
+            v0 (np.array):        intiial velocity (m/s)
+            method (str):         'euler', 'modified', 'verlet', 'leapfrog'
+                                      or 'yoshida4'
+            recorder (Recorder):  records each step (see me273.recording)
+            **kwargs:             any additional arguments required for the
+                                      accleration function
+
+        Returns:
+            np.float64 (np.array): times (s)
+            np.float64 (np.array): positions (m)
+            np.float64 (np.array): velocities (m/s)
+            np.float64 (np.array): accelerations (m/s**2)
+    '''
+
+    acceleration = counted(acceleration, 'acceleration')
+    step = get_step(method)
+    steps = step_count(t0, tf, dt)
+
+    if recorder is None:
+        recorder = Recorder(steps=steps + 1)
+
+    x = np.asarray(x0, dtype=np.float64)
+    v = np.asarray(v0, dtype=np.float64) + np.zeros_like(x)
+    a = acceleration(x, v, **kwargs)
+
+    recorder.record(t0, x, v, a)
+
+    for i in range(1, steps + 1):
+        x, v, a = step(acceleration, x, v, a, dt, **kwargs)
+        recorder.record(t0 + i * dt, x, v, a)
+
+    count('steps', steps)
+
+    return recorder.arrays()
+
+if __name__ == '__main__':
+
+    ''' Energy drift of the GA3 moon orbit over five years.
+
+        Relative change in orbital energy, |E - E0| / |E0|, for each method
+        and time step. The Euler methods drift steadily; the symplectic
+        methods hold the energy to a bounded error at far larger steps.
+    '''
+
+    import time
+
+    G, M = 6.67408e-11, 5.972e24
+
+    def gravity(x, v):
+        return -(x * G * M) / np.power(np.linalg.norm(x, axis=-1)[..., np.newaxis], 3)
+
+    def energy(x, v):
+        return 0.5 * np.sum(v * v, axis=-1) - G * M / np.linalg.norm(x, axis=-1)
+
+    x0 = np.asarray([0.3633e9, 0])
+    v0 = np.asarray([0, 1.082e3])
+    tf = 5 * 365.25 * 24 * 3600
+
+    print('{:<10} {:>8} {:>12} {:>12} {:>8}'.format('method', 'dt (h)', 'max |dE/E|', 'final |dE/E|', 'time (s)'))
+
+    for method in ['euler', 'modified', 'verlet', 'leapfrog', 'yoshida4']:
+        for hours in [1, 6, 24]:
+            start = time.perf_counter()
+            t, x, v, a = symplectic_method(gravity, 0, tf, hours * 3600, x0, v0, method=method)
+            elapsed = time.perf_counter() - start
+
+            E = energy(x, v)
+            drift = np.abs((E - E[0]) / E[0])
+
+            print('{:<10} {:>8} {:>12.2e} {:>12.2e} {:>8.2f}'.format(method, hours, drift.max(), drift[-1], elapsed))
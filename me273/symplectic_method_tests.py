@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from me273.symplectic_method import METHODS, get_step, symplectic_method
+
+
+G, M = 6.67408e-11, 5.972e24
+
+
+def oscillator(x, v, k, m):
+    return -1 * (k / m) * x
+
+
+def gravity(x, v):
+    return -(x * G * M) / np.power(np.linalg.norm(x, axis=-1)[..., np.newaxis], 3)
+
+
+def energy(x, v):
+    return 0.5 * np.sum(v * v, axis=-1) - G * M / np.linalg.norm(x, axis=-1)
+
+
+def eccentric_orbit():
+    # Moon-like orbit, eccentric enough that energy errors show quickly.
+    r = 0.3633e9
+    return np.asarray([r, 0.0]), np.asarray([0.0, 1.2 * np.sqrt(G * M / r)])
+
+
+@pytest.mark.parametrize('method, order', [('verlet', 2), ('leapfrog', 2), ('yoshida4', 4)])
+def test_order_of_accuracy(method, order):
+    k, m, x0 = 2.5, 0.250, 0.10
+    w = np.sqrt(k / m)
+
+    errors = []
+    for dt in [0.02, 0.01]:
+        t, x, v, a = symplectic_method(oscillator, 0, 10, dt, x0=x0, v0=0, method=method, k=k, m=m)
+        errors.append(abs(x[-1] - x0 * np.cos(w * t[-1])))
+
+    assert np.log2(errors[0] / errors[1]) == pytest.approx(order, abs=0.3)
+
+
+def test_symplectic_energy_is_bounded_where_euler_drifts():
+    x0, v0 = eccentric_orbit()
+    dt = 3600.0
+    tf = 200 * 24 * 3600.0
+
+    drift = {}
+    for method in METHODS:
+        t, x, v, a = symplectic_method(gravity, 0, tf, dt, x0, v0, method=method)
+        E = energy(x, v)
+        drift[method] = np.abs((E - E[0]) / E[0])
+
+    # Euler gains energy every step; modified Euler oscillates.
+    assert drift['euler'][-1] > 0.1
+    assert drift['modified'].max() < 1e-2
+
+    for method in ['verlet', 'leapfrog']:
+        assert drift[method].max() < 1e-4
+
+    assert drift['yoshida4'].max() < 1e-7
+
+    # Bounded: the second half of the run is no worse than the first.
+    for method in ['verlet', 'leapfrog', 'yoshida4']:
+        half = drift[method].size // 2
+        assert drift[method][half:].max() < 2 * drift[method][:half].max()
+
+
+def test_recorded_acceleration_matches_position():
+    x0, v0 = eccentric_orbit()
+
+    for method in ['verlet', 'yoshida4']:
+        t, x, v, a = symplectic_method(gravity, 0, 10 * 3600, 3600, x0, v0, method=method)
+        assert a == pytest.approx(gravity(x, v), rel=1e-12)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        get_step('runge-kutta')
@@ -0,0 +1,267 @@
+''' Trajectory Files
+
+    A Recorder keeps a run in memory; a multi-year orbit at a small dt
+    does not fit. A TrajectoryWriter takes the Recorder's place in any
+    stepper (it has the same record() and arrays()) and streams the run to
+    disk instead, holding only one chunk of steps in memory.
+
+    The file is an ordinary .npy file of records
+
+            ('step', int64), ('t', float64), ('x', float64, shape), ('v', ...), ('a', ...)
+
+    where shape is the shape of x (e.g. (2,) for one body in the plane,
+    (N, 2) for a Universe), and step counts every state the stepper gave,
+    recorded or not. Its header is padded to a fixed size so that
+    the record count can be rewritten in place: each full chunk is
+    appended, flushed, and only then counted in the header. So at any
+    moment, even mid-run or after a crash, the header describes only whole
+    records that are on disk, and
+
+        >>> run = read_trajectory('orbit.npy')      # or np.load(..., mmap_mode='r')
+        >>> run['t'], run['x']
+
+    memory-maps them without copying. A crashed run resumes from its last
+    complete chunk (see TrajectoryWriter).
+'''
+
+import ast
+import os
+
+import numpy as np
+
+MAGIC = b'\x93NUMPY\x01\x00'
+
+# Room for the dtype of an x of any reasonable shape, and a count of any
+# length; a multiple of 64 so that the records stay aligned.
+HEADER_SIZE = 512
+
+# Memory held for records not yet written, when chunk is not given.
+CHUNK_BYTES = 8 * 2**20
+
+def trajectory_dtype(shape):
+    ''' Return the record dtype for states x of the given shape. '''
+
+    shape = tuple(shape)
+
+    return np.dtype([('step', np.int64), ('t', np.float64), ('x', np.float64, shape),
+                     ('v', np.float64, shape), ('a', np.float64, shape)])
+
+def _header(dtype, count):
+    ''' Return the fixed-size .npy header for count records of dtype. '''
+
+    text = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        np.lib.format.dtype_to_descr(dtype), count)
+
+    length = HEADER_SIZE - len(MAGIC) - 2
+
+    if len(text) + 1 > length:
+        raise ValueError('Trajectory header too long for states of dtype %s.' % (dtype,))
+
+    return MAGIC + length.to_bytes(2, 'little') + text.ljust(length - 1).encode('latin1') + b'\n'
+
+def _read_header(f):
+    ''' Return the dtype and record count of an open trajectory file. '''
+
+    start = f.read(HEADER_SIZE)
+
+    if len(start) < HEADER_SIZE or not start.startswith(MAGIC):
+        raise ValueError('%s is not a trajectory file.' % f.name)
+
+    header = ast.literal_eval(start[len(MAGIC) + 2:].decode('latin1').strip())
+
+    return np.lib.format.descr_to_dtype(header['descr']), header['shape'][0]
+
+def read_trajectory(path):
+    ''' Return the complete records of a trajectory file, memory-mapped.
+
+        The file may still be being written; the records are those of the
+        chunks finished when it is opened. Fields 'step', 't', 'x', 'v' and 'a'
+        are views of the file, read only as they are used.
+    '''
+
+    return np.load(path, mmap_mode='r')
+
+class TrajectoryWriter:
+    ''' Streams the t, x, v, and a of a stepper to a trajectory file.
+
+        Pass it as the recorder of a stepper (GA1 euler_projectile, GA2 and
+        GA3 euler_method, symplectic_method, Universe.run, Body); steps are
+        gathered into chunks of chunk records, and each full chunk is
+        appended to the file.
+
+        Args:
+            path (str):         file to write (conventionally .npy)
+            chunk (int):        records per write; at most this many are
+                                    held in memory, and lost in a crash
+                                    (default as many as fit in CHUNK_BYTES)
+            record_every (int): keep every k-th state (the final state is
+                                    always kept)
+            resume (bool):      continue an existing file rather than
+                                    start a new one
+
+        Resuming drops any partly written chunk, leaving the run as it was
+        at its last complete chunk, whose final state is last. Restart the
+        stepper from it; its first record, the restart state itself, is
+        not written twice, and the steps after it are kept on the same
+        record_every grid as before.
+
+        Examples:
+            Five years of the GA3 moon orbit, in a few MB of memory.
+                >>> with TrajectoryWriter('moon.npy') as writer:
+                ...     symplectic_method(gravity, 0, 5 * YEAR, 1.0, x0, v0, recorder=writer)
+
+            After a crash, carry on from the last chunk on disk.
+                >>> writer = TrajectoryWriter('moon.npy', resume=True)
+                >>> t0, x0, v0, a0 = writer.last
+                >>> symplectic_method(gravity, t0, 5 * YEAR, 1.0, x0, v0, recorder=writer)
+                >>> writer.close()
+    '''
+
+    def __init__(self, path, chunk=None, record_every=1, resume=False):
+
+        self.path = path
+        self.chunk = chunk
+        self.record_every = record_every
+
+        self.dtype = None
+        self.buffer = None
+        self.size = 0
+        self.written = 0
+        self.count = 0
+        self.last = None
+
+        self._last = None
+        self._last_stored = False
+        self._restart = None
+
+        if resume and os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            self.file = open(path, 'r+b')
+            dtype, self.written = _read_header(self.file)
+
+            if self.written:
+                # Drop a partly written chunk.
+                self.file.truncate(HEADER_SIZE + self.written * dtype.itemsize)
+                self.file.seek(0, os.SEEK_END)
+
+                self._allocate(dtype)
+
+                end = np.load(path, mmap_mode='r')[-1]
+                self.last = (float(end['t']), np.array(end['x']), np.array(end['v']), np.array(end['a']))
+                self.count = int(end['step']) + 1
+                self._restart = self.last[0]
+            else:
+                # Nothing to keep; the states to come set the dtype.
+                self.file.truncate(0)
+                self.file.seek(0)
+        else:
+            self.file = open(path, 'w+b')
+
+    def record(self, t, x, v, a):
+        ''' Record the state of one step. '''
+
+        if self._restart is not None:
+            restart, self._restart = self._restart, None
+            if t == restart:
+                return
+
+        i = self.count
+        self.count += 1
+
+        if i % self.record_every:
+            self._last = (i, t, x, v, a)
+            self._last_stored = False
+        else:
+            self._store(i, t, x, v, a)
+            self._last_stored = True
+
+    def _store(self, step, t, x, v, a):
+        ''' Add one state to the chunk, writing the chunk when it is full. '''
+
+        if self.buffer is None:
+            self._allocate(trajectory_dtype(np.shape(x)))
+            self.file.write(_header(self.dtype, 0))
+
+        record = self.buffer[self.size]
+        record['step'], record['t'], record['x'], record['v'], record['a'] = step, t, x, v, a
+        self.size += 1
+
+        if self.size == self.buffer.size:
+            self.flush()
+
+    def _allocate(self, dtype):
+        ''' Set the record dtype and allocate the chunk buffer for it. '''
+
+        chunk = self.chunk or max(1, CHUNK_BYTES // dtype.itemsize)
+
+        self.dtype = dtype
+        self.buffer = np.empty(chunk, dtype=dtype)
+
+    def flush(self):
+        ''' Write the records held in memory, then count them in the header. '''
+
+        if self.size == 0:
+            return
+
+        self.file.write(self.buffer[:self.size].tobytes())
+        self.file.flush()
+
+        self.written += self.size
+        self.size = 0
+
+        end = self.file.tell()
+        self.file.seek(0)
+        self.file.write(_header(self.dtype, self.written))
+        self.file.flush()
+        self.file.seek(end)
+
+    def close(self):
+        ''' Write the final state and any records held, and close the file. '''
+
+        if self.file.closed:
+            return
+
+        if self._last is not None and not self._last_stored:
+            self._store(*self._last)
+            self._last_stored = True
+
+        self.flush()
+
+        if self.dtype is None:
+            # Nothing was recorded; leave a valid, empty file.
+            self.file.write(_header(trajectory_dtype(()), 0))
+
+        self.file.close()
+
+    def arrays(self):
+        ''' Return t, x, v, and a of the run so far, memory-mapped from the file.
+
+            Everything recorded is written first; the file stays open, so
+            recording may go on. The latest state, if off the record_every
+            grid, is appended in memory (the arrays are then copies) and
+            only written by close().
+        '''
+
+        self.flush()
+
+        if self.written:
+            run = read_trajectory(self.path)
+            arrays = run['t'], run['x'], run['v'], run['a']
+        else:
+            arrays = np.empty(0), np.empty(0), np.empty(0), np.empty(0)
+
+        if self._last is None or self._last_stored:
+            return arrays
+
+        state = self._last[1:]
+
+        if not self.written:
+            return tuple(np.asarray([value], dtype=np.float64) for value in state)
+
+        return tuple(np.concatenate([array, [value]]) for array, value in zip(arrays, state))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
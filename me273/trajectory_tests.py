@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from me273.recording import Recorder
+from me273.symplectic_method import symplectic_method
+from me273.trajectory import CHUNK_BYTES, HEADER_SIZE, TrajectoryWriter, read_trajectory
+
+
+def run(recorder, steps, shape=(), start=0):
+    for i in range(start, steps):
+        recorder.record(float(i), np.full(shape, i), np.full(shape, -i), np.full(shape, 2 * i))
+
+    return recorder.arrays()
+
+
+def test_matches_recorder(tmp_path):
+    expected = run(Recorder(record_every=10), 95, shape=(3, 2))
+
+    with TrajectoryWriter(tmp_path / 'run.npy', chunk=4, record_every=10) as writer:
+        run(writer, 95, shape=(3, 2))
+
+    trajectory = read_trajectory(tmp_path / 'run.npy')
+
+    assert isinstance(trajectory, np.memmap)
+    for field, values in zip('txva', expected):
+        assert np.array_equal(trajectory[field], values)
+
+
+def test_complete_chunks_readable_mid_run(tmp_path):
+    writer = TrajectoryWriter(tmp_path / 'run.npy', chunk=16)
+
+    for i in range(40):
+        writer.record(float(i), np.full(2, i), np.zeros(2), np.zeros(2))
+
+    # Two chunks are on disk; the rest is still in memory.
+    t = read_trajectory(tmp_path / 'run.npy')['t']
+    assert list(t) == list(range(32))
+
+    t, x, v, a = writer.arrays()
+    assert len(t) == 40 and x[-1] == pytest.approx([39, 39])
+
+    writer.close()
+
+
+def test_arrays_mid_run_keeps_record_every_grid(tmp_path):
+    writer = TrajectoryWriter(tmp_path / 'run.npy', chunk=2, record_every=3)
+
+    for i in range(8):
+        writer.record(float(i), i, -i, 2 * i)
+
+    # The latest state is shown, but not written off the grid.
+    assert list(writer.arrays()[0]) == [0, 3, 6, 7]
+
+    for i in range(8, 13):
+        writer.record(float(i), i, -i, 2 * i)
+    writer.close()
+
+    assert list(read_trajectory(tmp_path / 'run.npy')['step']) == [0, 3, 6, 9, 12]
+
+
+def test_default_chunk_fits_byte_budget(tmp_path):
+    with TrajectoryWriter(tmp_path / 'run.npy') as writer:
+        writer.record(0.0, np.zeros((100, 3)), np.zeros((100, 3)), np.zeros((100, 3)))
+
+        assert writer.buffer.nbytes <= CHUNK_BYTES
+        assert writer.buffer.size == CHUNK_BYTES // writer.dtype.itemsize
+
+
+def test_resume_drops_partial_chunk(tmp_path):
+    path = tmp_path / 'run.npy'
+
+    writer = TrajectoryWriter(path, chunk=10)
+    for i in range(25):
+        writer.record(float(i), np.full(2, i), np.zeros(2), np.zeros(2))
+    writer.file.flush()
+
+    # Crash midway through writing the third chunk.
+    writer.file.write(b'\0' * 7)
+    writer.file.close()
+
+    writer = TrajectoryWriter(path, chunk=10, resume=True)
+    t0, x0, v0, a0 = writer.last
+
+    assert (path.stat().st_size - HEADER_SIZE) % writer.dtype.itemsize == 0
+    assert t0 == 19 and x0 == pytest.approx([19, 19])
+
+    # The stepper restarts from the last state, which is not written twice.
+    for i in range(19, 30):
+        writer.record(float(i), np.full(2, i), np.zeros(2), np.zeros(2))
+    writer.close()
+
+    assert list(read_trajectory(path)['t']) == list(range(30))
+
+
+def test_resume_keeps_record_every_grid(tmp_path):
+    path = tmp_path / 'run.npy'
+
+    writer = TrajectoryWriter(path, chunk=3, record_every=10)
+    for i in range(56):
+        writer.record(float(i), i, -i, 2 * i)
+
+    # Crash after step 55: chunks of three records, steps 0 to 50, are on disk.
+    writer.file.close()
+
+    writer = TrajectoryWriter(path, chunk=3, record_every=10, resume=True)
+    assert writer.last[0] == 50
+
+    run(writer, 101, start=50)
+    writer.close()
+
+    assert list(read_trajectory(path)['t']) == list(range(0, 101, 10))
+
+
+def test_empty_run(tmp_path):
+    TrajectoryWriter(tmp_path / 'run.npy').close()
+
+    assert len(read_trajectory(tmp_path / 'run.npy')) == 0
+
+    # Resuming it takes the shape of the states from the first one.
+    with TrajectoryWriter(tmp_path / 'run.npy', resume=True) as writer:
+        run(writer, 5, shape=(3, 2))
+
+    assert read_trajectory(tmp_path / 'run.npy')['x'].shape == (5, 3, 2)
+
+
+def test_stepper_streams_orbit(tmp_path):
+    G, M = 6.67408e-11, 5.972e24
+    x0, v0 = np.asarray([0.3633e9, 0.0]), np.asarray([0.0, 1.082e3])
+    gravity = lambda x, v: -(x * G * M) / np.power(np.linalg.norm(x), 3)
+
+    expected = symplectic_method(gravity, 0, 30 * 86400, 600, x0, v0)
+
+    with TrajectoryWriter(tmp_path / 'moon.npy', chunk=256) as writer:
+        symplectic_method(gravity, 0, 30 * 86400, 600, x0, v0, recorder=writer)
+
+    trajectory = read_trajectory(tmp_path / 'moon.npy')
+
+    for field, values in zip('txva', expected):
+        assert np.array_equal(trajectory[field], values)